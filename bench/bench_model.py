@@ -0,0 +1,84 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+benchmark of the memory of the parsed device files
+
+decodes a synthetic device list and lbnl device list (-devices x -resources) as dicts (json.loads) and as the
+compact model (ocfdoc.model) and reports, traced with tracemalloc:
+    retained    memory of the result
+    peak        peak memory during the decoding
+    time        decode time (without tracing)
+
+usage: python3 bench_model.py [-devices 20000] [-resources 10]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import synthetic
+from ocfdoc.model import ModelBuilder
+
+
+def measure(decode, text):
+    """
+    :param decode: function decoding the json text
+    :param text: json text
+    :return: (retained bytes, peak bytes, seconds)
+    """
+    start = time.perf_counter()
+    decode(text)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = decode(text)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-devices", "--devices", default=20000, type=int, help="number of (lbnl) devices")
+    parser.add_argument("-resources", "--resources", default=10, type=int, help="resources per device")
+    args = parser.parse_args()
+
+    inputs = [("device", json.dumps(synthetic.device_list(args.devices, args.resources))),
+              ("lbnldevice", json.dumps(synthetic.lbnl_tree(args.devices, args.resources, 20)))]
+    print("%-12s %-8s %14s %12s %10s" % ("input", "decode", "retained [MB]", "peak [MB]", "time [s]"))
+    for name, text in inputs:
+        for decode_name, decode in (("dicts", json.loads), ("model", lambda text: ModelBuilder().loads(text))):
+            retained, peak, seconds = measure(decode, text)
+            print("%-12s %-8s %14.1f %12.1f %10.3f" % (name, decode_name, retained / 1e6, peak / 1e6, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+benchmark of the document save
+
+generates the lbnl device table for a synthetic input (-devices x 3 resources x 10 categories) once and saves it:
+    document.save   python-docx, all parts serialised and deflated
+    level N         docxsave.save_document: the template parts copied, the other parts deflated with level N
+                    (0 stores them)
+each save goes to an io.BytesIO, the median of -repeat saves and the size are reported.
+
+usage: python3 bench_save.py [-devices 3000] [-repeat 5]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import synthetic
+from ocfdoc import device
+from ocfdoc.docxsave import save_document
+from ocfdoc.templatecache import template_cache
+
+DOCX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "ResourceTemplate.docx")
+
+
+def timed_save(save, repeat):
+    """
+    :param save: function saving to the given stream
+    :param repeat: number of saves
+    :return: (median seconds, bytes)
+    """
+    times = []
+    for _ in range(repeat):
+        stream = io.BytesIO()
+        start = time.perf_counter()
+        save(stream)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(stream.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-devices", "--devices", default=3000, type=int, help="number of lbnl devices")
+    parser.add_argument("-repeat", "--repeat", default=5, type=int, help="saves per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_name = os.path.join(directory, "lbnl.json")
+        synthetic.write_json(synthetic.lbnl_tree(args.devices, 3, 10), input_name)
+        worddoc = device.CreateWordDoc(lbnldevice=input_name, docx_name_in=DOCX, backend="xml")
+        worddoc.convert()
+    source, template = template_cache.source(DOCX)
+
+    print("%-14s %10s %12s" % ("save", "time [s]", "size [kB]"))
+    seconds, size = timed_save(worddoc.document.save, args.repeat)
+    print("%-14s %10.3f %12.1f" % ("document.save", seconds, size / 1024.0))
+    for level in (0, 1, 6, 9):
+        seconds, size = timed_save(lambda stream: save_document(worddoc.document, stream, level, source, template),
+                                   args.repeat)
+        print("%-14s %10.3f %12.1f" % ("level %d" % level, seconds, size / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+benchmark of the resolved schema cache
+
+writes -schemas synthetic resource type schemas that refer to each other (see synthetic.resource_schemas)
+and builds the resource catalog:
+    cold        resolve all schemas with jsonref (empty cache directory)
+    disk        next run: a new process reads the resolved schemas from the cache directory
+    memory      same process again: the schemas come from the in memory LRU
+    one changed one schema changed: that schema and the schemas referring to it are resolved again
+
+usage: python3 bench_schemacache.py [-schemas 300]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import synthetic
+from ocfdoc.schemacache import ResourceCatalog
+
+
+def timed(function):
+    """
+    :return: (seconds, result)
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-schemas", "--schemas", default=300, type=int, help="number of resource type schemas")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        schema_dir = os.path.join(directory, "schemas")
+        cache_dir = os.path.join(directory, "cache")
+        os.makedirs(schema_dir)
+        synthetic.resource_schemas(args.schemas, schema_dir)
+
+        print("%-12s %10s %8s %8s %9s %7s" % ("run", "time [s]", "memory", "disk", "resolved", "titles"))
+
+        def report(name, seconds, catalog):
+            counts = catalog.cache.counts
+            print("%-12s %10.3f %8d %8d %9d %7d" % (name, seconds, counts["memory"], counts["disk"],
+                                                     counts["resolved"], len(catalog.titles)))
+
+        seconds, catalog = timed(lambda: ResourceCatalog(schema_dir))
+        report("no cache", seconds, catalog)
+        seconds, catalog = timed(lambda: ResourceCatalog(schema_dir, cache_dir))
+        report("cold", seconds, catalog)
+        seconds, catalog = timed(lambda: ResourceCatalog(schema_dir, cache_dir))
+        report("disk", seconds, catalog)
+        seconds, _ = timed(catalog.load)
+        report("memory", seconds, catalog)
+
+        # change the schema in the middle, the next schema refers to it
+        changed = os.path.join(schema_dir, "oic.r.synthetic%d.json" % (args.schemas // 2))
+        with open(changed, 'r', encoding='UTF8') as schema_file:
+            schema = json.load(schema_file)
+        schema["description"] = "changed"
+        with open(changed, 'w', encoding='UTF8') as schema_file:
+            json.dump(schema, schema_file)
+        seconds, catalog = timed(lambda: ResourceCatalog(schema_dir, cache_dir))
+        report("one changed", seconds, catalog)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+benchmark of the schema index against the recursive find_key / find_key_link
+
+a synthetic schema set is generated (resource definitions with properties, allOf/oneOf and $ref
+to shared definitions, resolved with jsonref) and the same lookups are done with
+find_key, find_key_link and SchemaIndex (including the time to build the index).
+
+usage: python3 bench_schemaindex.py [-resources 200] [-lookups 1000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import jsonref
+
+from ocfdoc.core import find_key, find_key_link
+from ocfdoc.schemaindex import SchemaIndex
+
+
+def synthetic_schema(resources, properties=8):
+    """
+    schema with resource definitions in the style of the OCF resource schemas
+    :param resources: number of resource definitions
+    :param properties: properties per resource
+    :return: jsonref resolved schema
+    """
+    definitions = {
+        "oic.core": {"type": "object", "properties": {
+            "rt": {"type": "array", "items": {"type": "string"}, "readOnly": True},
+            "if": {"type": "array", "items": {"type": "string", "enum": ["oic.if.baseline", "oic.if.a"]}},
+            "n": {"type": "string", "readOnly": True}}},
+    }
+    for index in range(resources):
+        name = "Resource%d" % index
+        definitions[name] = {
+            "allOf": [
+                {"$ref": "#/definitions/oic.core"},
+                {"properties": dict(("prop%d_%d" % (index, p), {"type": "integer", "description": "property %d" % p})
+                                    for p in range(properties))},
+            ],
+            "oneOf": [{"required": ["prop%d_0" % index]}, {"title_%d" % index: "variant %d" % index}],
+            "properties": {"rt": {"default": ["oic.r.synthetic%d" % index]}},
+            "title_%d" % index: "Synthetic resource %d" % index,
+        }
+    schema = {"definitions": definitions, "type": "object",
+              "allOf": [{"$ref": "#/definitions/Resource%d" % index} for index in range(resources)]}
+    return jsonref.loads(json.dumps(schema))
+
+
+def time_lookups(function, keys):
+    """
+    :return: (seconds, number of keys found)
+    """
+    start = time.perf_counter()
+    found = 0
+    for key in keys:
+        if function(key) is not None:
+            found += 1
+    return time.perf_counter() - start, found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-resources", "--resources", default=200, type=int, help="resource definitions in the schema")
+    parser.add_argument("-lookups", "--lookups", default=1000, type=int, help="number of lookups")
+    args = parser.parse_args()
+
+    schema = synthetic_schema(args.resources)
+    # the lookups: titles of the resources and properties, spread over the schema
+    keys = []
+    for index in range(args.lookups):
+        resource = (index * 7919) % args.resources
+        keys.append("title_%d" % resource if index % 2 == 0 else "prop%d_%d" % (resource, index % 8))
+
+    start = time.perf_counter()
+    index = SchemaIndex(schema)
+    build = time.perf_counter() - start
+
+    seconds_find_key, found_find_key = time_lookups(lambda key: find_key(schema, key), keys)
+    seconds_link, found_link = time_lookups(lambda key: find_key_link(schema, key), keys)
+    seconds_index, found_index = time_lookups(index.first, keys)
+
+    print("schema: %d resources, %d indexed containers, %d keys" % (args.resources, index.node_count, len(index)))
+    print("%-16s %12s %14s %8s" % ("", "total [s]", "per lookup [us]", "found"))
+    print("%-16s %12.4f %14.1f %8d" % ("find_key", seconds_find_key, seconds_find_key * 1e6 / len(keys),
+                                        found_find_key))
+    print("%-16s %12.4f %14.1f %8d" % ("find_key_link", seconds_link, seconds_link * 1e6 / len(keys), found_link))
+    print("%-16s %12.4f %14.1f %8d" % ("index build", build, 0.0, 0))
+    print("%-16s %12.4f %14.1f %8d" % ("index lookup", seconds_index, seconds_index * 1e6 / len(keys), found_index))
+
+
+if __name__ == '__main__':
+    main()
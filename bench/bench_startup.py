@@ -0,0 +1,125 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+benchmark of the start up time of the command line tools
+
+every command is started -runs times in a fresh interpreter and the median wall time is reported,
+next to the import time of one extra run with python -X importtime:
+the total import time, the number of imported modules and whether python-docx was imported.
+the commands are "-h" (argument parsing only) and a real conversion of the test input.
+
+with -src the tools of another checkout are measured, e.g. to compare with an older version:
+    git worktree add /tmp/old <commit>
+    python3 bench_startup.py -src /tmp/old/src
+
+usage: python3 bench_startup.py [-src ../src] [-runs 11]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def commands(src_dir, out_dir):
+    """
+    the measured commands
+    :param src_dir: directory with device2doc.py and enum2doc.py
+    :param out_dir: directory for the generated documents
+    :return: list of (name, argument list)
+    """
+    docx = os.path.join(ROOT, "input", "ResourceTemplate.docx")
+    lbnl = os.path.join(ROOT, "test", "in", "test_2", "device.json")
+    device2doc = os.path.join(src_dir, "device2doc.py")
+    enum2doc = os.path.join(src_dir, "enum2doc.py")
+    return [
+        ("device2doc -h", [device2doc, "-h"]),
+        ("enum2doc -h", [enum2doc, "-h"]),
+        ("device2doc lbnl", [device2doc, "-lbnldevice", lbnl, "-docx", docx,
+                             "-word_out", os.path.join(out_dir, "lbnl.docx")]),
+    ]
+
+
+def wall_time(args, runs):
+    """
+    median wall time of the command
+    :param args: arguments after the python executable
+    :param runs: number of runs
+    :return: seconds
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def import_time(args):
+    """
+    import time of the command, from the python -X importtime report
+    :param args: arguments after the python executable
+    :return: (total import seconds, number of modules, python-docx imported)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=False)
+    total_us = 0
+    modules = 0
+    docx_imported = False
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        total_us += int(fields[0])
+        modules += 1
+        if fields[2].strip() == "docx":
+            docx_imported = True
+    return total_us / 1e6, modules, docx_imported
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-src", "--src", default=os.path.join(ROOT, "src"),
+                        help="directory with the command line tools")
+    parser.add_argument("-runs", "--runs", default=11, type=int, help="runs per command")
+    args = parser.parse_args()
+
+    baseline = wall_time(["-c", "pass"], args.runs)
+    print("python start up : %.3f s" % baseline)
+    print("%-18s %10s %12s %8s %6s" % ("command", "wall [s]", "imports [s]", "modules", "docx"))
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, command in commands(os.path.abspath(args.src), out_dir):
+            seconds = wall_time(command, args.runs)
+            import_seconds, modules, docx_imported = import_time(command)
+            print("%-18s %10.3f %12.3f %8d %6s" % (name, seconds, import_seconds, modules,
+                                                   "yes" if docx_imported else "no"))
+
+
+if __name__ == '__main__':
+    main()
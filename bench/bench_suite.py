@@ -0,0 +1,226 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+benchmark suite of device2doc and enum2doc on synthetic catalogs
+
+for every scale (devices x resources per device x categories) synthetic device, lbnl and enumeration
+files are generated (the enumeration file has one enumeration per device) and converted, and every stage of the conversion is measured:
+    json_load       parse of the input json (CreateWordDoc constructor)
+    template_load   parse of the word template (no template cache)
+    table_build     generation of the tables
+    save            save (zip) of the document
+the time of a stage is the best of -repeat runs, the memory is the tracemalloc peak of the stage
+(measured in a separate run, tracemalloc slows python down). tracemalloc sees the python allocations
+only, the lxml element tree of the document is allocated in C and is not included.
+
+the results are written as json (-out, default stdout), with the tool version, so that the
+results of different versions can be compared. progress is reported on stderr.
+
+usage: python3 bench_suite.py [-scales 100x3x5 1000x3x10] [-kinds device lbnldevice enum] [-backend xml]
+                              [-out results.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import synthetic
+from ocfdoc import device, enumeration
+from ocfdoc.templatecache import TemplateCache
+from ocfdoc.version import VERSION
+
+SCALES = ["100x3x5", "1000x3x10", "3000x3x20"]
+KINDS = ["device", "lbnldevice", "enum"]
+STAGES = ["json_load", "template_load", "table_build", "save"]
+
+
+def parse_scale(text):
+    """
+    parse a scale
+    :param text: "<devices>x<resources per device>x<categories>", e.g. 1000x3x10
+    :return: (devices, resources, categories)
+    """
+    parts = [int(x) for x in text.lower().split("x")]
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("scale should be <devices>x<resources>x<categories>: %s" % text)
+    return tuple(parts)
+
+
+def write_input(kind, scale, directory):
+    """
+    write the synthetic input file of the kind
+    :param kind: "device", "lbnldevice" or "enum"
+    :param scale: (devices, resources, categories)
+    :param directory: output directory
+    :return: (file name, size in bytes)
+    """
+    devices, resources, categories = scale
+    if kind == "device":
+        data = synthetic.device_list(devices, resources)
+    elif kind == "lbnldevice":
+        data = synthetic.lbnl_tree(devices, resources, categories)
+    else:
+        data = synthetic.enumerations(devices)
+    filename = os.path.join(directory, "%s_%dx%dx%d.json" % ((kind,) + scale))
+    return filename, synthetic.write_json(data, filename)
+
+
+def stage_functions(kind, input_name, docx_name, word_out, backend):
+    """
+    the stages of one conversion, each stage uses the result of the previous stages
+    :return: list of (stage name, function)
+    """
+    state = {}
+
+    def json_load():
+        if kind == "enum":
+            state["worddoc"] = enumeration.CreateWordDoc(enum=input_name)
+        else:
+            state["worddoc"] = device.CreateWordDoc(backend=backend, **{kind: input_name})
+
+    def template_load():
+        state["worddoc"].document = TemplateCache().document(docx_name)
+        state["worddoc"].resolve_styles()
+
+    def table_build():
+        state["worddoc"].generate()
+
+    def save():
+        state["worddoc"].document.save(word_out)
+
+    return [("json_load", json_load), ("template_load", template_load),
+            ("table_build", table_build), ("save", save)], state
+
+
+def run_stages(kind, input_name, docx_name, word_out, backend, memory):
+    """
+    run one conversion stage by stage
+    :param backend: table writer of device2doc
+    :param memory: measure the tracemalloc peak instead of the time
+    :return: (dict stage -> seconds or peak bytes, created table)
+    """
+    stages, state = stage_functions(kind, input_name, docx_name, word_out, backend)
+    results = {}
+    for name, function in stages:
+        if memory:
+            tracemalloc.start()
+            function()
+            results[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            function()
+            results[name] = time.perf_counter() - start
+    return results, state["worddoc"].tableAttribute
+
+
+def bench(kind, scale, directory, docx_name, backend, repeat, memory):
+    """
+    benchmark one kind at one scale
+    :return: result dict
+    """
+    input_name, input_bytes = write_input(kind, scale, directory)
+    word_out = os.path.splitext(input_name)[0] + ".docx"
+    seconds = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            times, table = run_stages(kind, input_name, docx_name, word_out, backend, False)
+            for name, value in times.items():
+                seconds[name] = min(value, seconds.get(name, value))
+        peaks = run_stages(kind, input_name, docx_name, word_out, backend, True)[0] if memory else {}
+    tbl = table._tbl
+    result = {
+        "kind": kind,
+        "backend": backend if kind != "enum" else None,
+        "devices": scale[0],
+        "resources": scale[1],
+        "categories": scale[2],
+        "input_bytes": input_bytes,
+        "output_bytes": os.path.getsize(word_out),
+        "rows": len(tbl.tr_lst),
+        "cells": sum(len(tr.tc_lst) for tr in tbl.tr_lst),
+        "stages": {},
+    }
+    for name in STAGES:
+        result["stages"][name] = {"seconds": round(seconds[name], 6)}
+        if name in peaks:
+            result["stages"][name]["peak_bytes"] = peaks[name]
+    result["total_seconds"] = round(sum(seconds.values()), 6)
+    return result
+
+
+def main():
+    default_docx = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "ResourceTemplate.docx")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-docx", "--docx", default=default_docx, help="word file in")
+    parser.add_argument("-scales", "--scales", default=SCALES, nargs="+",
+                        help="scales as <devices>x<resources per device>x<categories>")
+    parser.add_argument("-kinds", "--kinds", default=KINDS, nargs="+", choices=KINDS, help="tools to measure")
+    parser.add_argument("-backend", "--backend", default="docx", choices=["docx", "xml"],
+                        help="table writer of device2doc")
+    parser.add_argument("-repeat", "--repeat", default=3, type=int, help="runs per scale, the best time is reported")
+    parser.add_argument("-no_memory", "--no_memory", help="skip the tracemalloc run", action='store_true')
+    parser.add_argument("-out", "--out", default=None, help="json result file (default stdout)")
+    args = parser.parse_args()
+
+    scales = [parse_scale(text) for text in args.scales]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            for kind in args.kinds:
+                result = bench(kind, scale, directory, args.docx, args.backend, args.repeat,
+                               not args.no_memory)
+                results.append(result)
+                stages = result["stages"]
+                print("%-10s %6dx%dx%-3d rows %7d  json %7.3f  template %6.3f  tables %7.3f  save %7.3f s"
+                      % (kind, scale[0], scale[1], scale[2], result["rows"],
+                         stages["json_load"]["seconds"], stages["template_load"]["seconds"],
+                         stages["table_build"]["seconds"], stages["save"]["seconds"]), file=sys.stderr)
+
+    report = {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.out is None:
+        json.dump(report, sys.stdout, indent=1)
+        print ("")
+    else:
+        with open(args.out, 'w') as out_file:
+            json.dump(report, out_file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+benchmark of the table population of the device table
+
+builds the device table for 100 .. 50k rows with the table layout engine and reports
+the time per row, which should stay flat when the engine is linear.
+both table writers are timed: python-docx elements (-backend docx) and the serialised w:tbl (-backend xml).
+with -legacy the old add_row()/.cells/merge() population is timed as well (up to -legacy_max rows).
+
+usage: python3 bench_table.py [-docx ../input/ResourceTemplate.docx] [-legacy]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from docx import Document
+
+from ocfdoc.ooxmlwriter import write_table_xml
+from ocfdoc.tablelayout import TableLayout, write_table
+
+ROWS = [100, 1000, 5000, 10000, 50000]
+
+
+def synthetic_devices(row_count, resources_per_device=3):
+    """
+    synthetic device list that results in row_count table rows
+    :param row_count: number of table rows (excluding the header)
+    :param resources_per_device: resources per device, each resource is a row
+    :return: device list in the format of test/in/test_1/device.json
+    """
+    devices = []
+    rows = 0
+    while rows < row_count:
+        index = len(devices)
+        count = min(resources_per_device, row_count - rows)
+        resources = [{"resourcetypetitle": "Resource %d" % r, "resourcetypeid": "oic.r.synthetic%d" % r}
+                     for r in range(count)]
+        devices.append({"devicename": "Device %d" % index,
+                        "devicetype": "oic.d.synthetic%d" % index,
+                        "resources": resources})
+        rows += count
+    return devices
+
+
+def layout_devices(devices):
+    """
+    the table layout of the devices (same layout as CreateWordDoc.resources_per_device)
+    """
+    layout = TableLayout(4, style='TABLE-A')
+    layout.add_row('Device Name', 'Device Type', 'Required Resource Name', 'Required Resoure Type')
+    for device_data in devices:
+        row = layout.add_row(device_data["devicename"], device_data["devicetype"])
+        first = True
+        for resource in device_data["resources"]:
+            if first is True:
+                first = False
+            else:
+                row = layout.add_row()
+                layout.merge(row, 0, 1)
+            layout.set_text(row, 2, resource["resourcetypetitle"])
+            layout.set_text(row, 3, resource["resourcetypeid"])
+    return layout
+
+
+def populate_layout(document, devices):
+    """
+    table population with the layout engine, written with python-docx elements
+    """
+    write_table(document, layout_devices(devices))
+
+
+def populate_xml(document, devices):
+    """
+    table population with the layout engine, written as one serialised w:tbl
+    """
+    write_table_xml(document, layout_devices(devices))
+
+
+def populate_legacy(document, devices):
+    """
+    table population through the python-docx proxies, as it was done before the layout engine
+    """
+    table = document.add_table(rows=1, cols=4, style='TABLE-A')
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = 'Device Name'
+    hdr_cells[1].text = 'Device Type'
+    hdr_cells[2].text = 'Required Resource Name'
+    hdr_cells[3].text = 'Required Resoure Type'
+    for device_data in devices:
+        row_cells = table.add_row().cells
+        row_cells[0].text = device_data["devicename"]
+        row_cells[1].text = device_data["devicetype"]
+        first = True
+        for resource in device_data["resources"]:
+            if first is True:
+                first = False
+            else:
+                row_cells = table.add_row().cells
+                a, b = row_cells[:2]
+                a.merge(b)
+            row_cells[2].text = resource["resourcetypetitle"]
+            row_cells[3].text = resource["resourcetypeid"]
+
+
+def time_population(docx_name, populate, row_count):
+    """
+    time one table population on a fresh document
+    :return: seconds
+    """
+    devices = synthetic_devices(row_count)
+    document = Document(docx=docx_name)
+    start = time.perf_counter()
+    populate(document, devices)
+    return time.perf_counter() - start
+
+
+def main():
+    default_docx = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "ResourceTemplate.docx")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-docx", "--docx", default=default_docx, help="word file in")
+    parser.add_argument("-legacy", "--legacy", help="also time the python-docx proxy population", action='store_true')
+    parser.add_argument("-legacy_max", "--legacy_max", default=10000, type=int,
+                        help="largest row count for the legacy population")
+    args = parser.parse_args()
+
+    print("%10s %12s %12s %12s %12s" % ("rows", "docx [s]", "docx us/row", "xml [s]", "xml us/row"))
+    for row_count in ROWS:
+        seconds = time_population(args.docx, populate_layout, row_count)
+        seconds_xml = time_population(args.docx, populate_xml, row_count)
+        print("%10d %12.3f %12.1f %12.3f %12.1f" % (row_count, seconds, seconds * 1e6 / row_count,
+                                                   seconds_xml, seconds_xml * 1e6 / row_count))
+    if args.legacy:
+        print("legacy (python-docx proxies):")
+        for row_count in ROWS:
+            if row_count > args.legacy_max:
+                break
+            seconds = time_population(args.docx, populate_legacy, row_count)
+            print("%10d %12.3f %12.1f" % (row_count, seconds, seconds * 1e6 / row_count))
+
+
+if __name__ == '__main__':
+    main()
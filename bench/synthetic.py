@@ -0,0 +1,156 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+synthetic input files for the benchmarks
+
+generates device lists, lbnl category trees and supportedenumerations files of any size,
+in the formats of test/in/test_1/device.json, test/in/test_2/device.json and the enum2doc input,
+and directories of OCF style resource type schemas that refer to each other.
+the content is deterministic: the same scale gives the same file.
+"""
+
+import json
+import os
+
+
+def resources(index, resources_per_device):
+    """
+    the resources of one device
+    :param index: device index
+    :param resources_per_device: number of resources
+    :return: list of resource dicts
+    """
+    return [{"resourcetypetitle": "Resource %d" % ((index + r) % 97),
+             "resourcetypeid": "oic.r.synthetic%d" % ((index + r) % 97)}
+            for r in range(resources_per_device)]
+
+
+def device(index, resources_per_device):
+    """
+    one device of the device list
+    :param index: device index
+    :param resources_per_device: number of resources
+    :return: device dict
+    """
+    return {"devicename": "Device %d" % index,
+            "devicetype": "oic.d.synthetic%d" % index,
+            "resources": resources(index, resources_per_device)}
+
+
+def device_list(devices, resources_per_device):
+    """
+    device list (-device input)
+    :param devices: number of devices
+    :param resources_per_device: number of resources per device
+    :return: list of device dicts
+    """
+    return [device(index, resources_per_device) for index in range(devices)]
+
+
+def lbnl_tree(devices, resources_per_device, categories):
+    """
+    lbnl category tree (-lbnldevice input)
+    the devices are spread over the categories, each lbnl device lists one existing device.
+    :param devices: number of lbnl devices
+    :param resources_per_device: number of resources per existing device
+    :param categories: number of categories
+    :return: list of category dicts
+    """
+    tree = [{"category": "Category %d" % c, "devices": []} for c in range(max(categories, 1))]
+    for index in range(devices):
+        tree[index % len(tree)]["devices"].append({
+            "name": "LBNL device %d" % index,
+            "rt": "oic.d.synthetic%d" % index,
+            "comment": "synthetic device %d" % index,
+            "exising": [device(index, resources_per_device)]})
+    return tree
+
+
+def enumerations(count):
+    """
+    enumeration set (-enum input)
+    :param count: number of enumerations
+    :return: dict with the supportedenumerations list
+    """
+    return {"supportedenumerations": [
+        {"enumeration%d" % index: "description of the synthetic enumeration %d" % index}
+        for index in range(count)]}
+
+
+def write_json(data, filename):
+    """
+    write the data as json file
+    :param data: json data
+    :param filename: file name
+    :return: size of the file in bytes
+    """
+    with open(filename, 'w', encoding='UTF8') as json_file:
+        json.dump(data, json_file, indent=1)
+        return json_file.tell()
+
+
+def resource_schemas(count, directory, properties=6):
+    """
+    write OCF style resource type schemas that refer to each other
+    every schema refers to oic.core.json, oic.baseResource.json and to a property of the previous schema.
+    :param count: number of resource type schemas
+    :param directory: output directory
+    :param properties: properties per resource type
+    :return: list of (rt, title) of the written schemas
+    """
+    base_id = "https://openconnectivityfoundation.github.io/core/schemas/"
+    write_json({"id": base_id + "oic.core.json#", "title": "Core",
+                "definitions": {"oic.core": {"type": "object", "properties": {
+                    "rt": {"type": "array", "items": {"type": "string", "maxLength": 64}, "readOnly": True},
+                    "if": {"type": "array", "items": {"type": "string",
+                                                      "enum": ["oic.if.baseline", "oic.if.a", "oic.if.s"]}},
+                    "n": {"type": "string", "maxLength": 64, "readOnly": True},
+                    "id": {"type": "string", "readOnly": True}}}}},
+               os.path.join(directory, "oic.core.json"))
+    write_json({"id": base_id + "oic.baseResource.json#", "title": "Base Resource",
+                "definitions": {"oic.r.baseresource": {"properties": {
+                    "range": {"type": "array", "items": {"type": "number"}},
+                    "step": {"type": "number"},
+                    "precision": {"type": "number", "readOnly": True}}}}},
+               os.path.join(directory, "oic.baseResource.json"))
+    written = []
+    for index in range(count):
+        rt = "oic.r.synthetic%d" % index
+        title = "Synthetic Resource %d" % index
+        definition = "Synthetic%d" % index
+        props = dict(("value%d" % p, {"type": "integer", "description": "value %d of %s" % (p, title)})
+                     for p in range(properties))
+        props["rt"] = {"type": "array", "items": {"type": "string", "enum": [rt]}, "default": [rt], "readOnly": True}
+        if index > 0:
+            props["previous"] = {"$ref": "oic.r.synthetic%d.json#/definitions/Synthetic%d/properties/value0"
+                                         % (index - 1, index - 1)}
+        write_json({"id": base_id + rt + ".json#", "title": title,
+                    "definitions": {definition: {"type": "object", "properties": props}},
+                    "type": "object",
+                    "allOf": [{"$ref": "oic.core.json#/definitions/oic.core"},
+                              {"$ref": "oic.baseResource.json#/definitions/oic.r.baseresource"},
+                              {"$ref": "#/definitions/" + definition}],
+                    "required": ["value0"]},
+                   os.path.join(directory, rt + ".json"))
+        written.append((rt, title))
+    return written
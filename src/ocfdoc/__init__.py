@@ -0,0 +1,44 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+ocfdoc: generation of word documents (tables) from the OCF device and enumeration json files
+
+modules:
+  core          shared json helpers and the conversion flow (CreateWordDocBase)
+  device        device2doc, device and lbnl device tables
+  enumeration   enum2doc, enumeration table
+  batch         batch conversion in a pool of worker processes
+  watch         long running mode: watch the inputs and convert over http
+  docxcompare   docxcompare, semantic comparison of generated documents
+  version       the tool version, recorded in the build manifests
+
+  tables:       tablelayout (layout and python-docx writer), ooxmlwriter (serialised tables),
+                fragments (recurring xml fragments), styles (style registry), update (patch tables in place)
+  input:        jsonstream (streaming reader), model (compact device records), rtindex (resource type index),
+                schemaindex, schemacache (resolved resource type schemas)
+  build:        templatecache (parsed templates), docxsave (fast save), buildmanifest (incremental builds),
+                stats (phase timings and counters)
+
+python-docx is imported when a document is generated, importing the package is cheap.
+"""
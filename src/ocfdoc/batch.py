@@ -0,0 +1,311 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+batch conversion of device, lbnl device and enumeration files
+
+runs the CreateWordDoc conversions of device2doc and enum2doc in a pool of worker processes.
+each worker loads the template once and reuses it for all its conversions.
+
+the jobs are given as a manifest (json):
+    {
+      "docx": "../input/ResourceTemplate.docx",
+      "jobs": [
+        {"device": "device.json", "word_out": "device.docx"},
+        {"lbnldevice": "lbnl.json", "word_out": "lbnl.docx", "backend": "xml"},
+        {"enum": "enumerations.json", "word_out": "enumerations.docx", "annex": true, "save_level": 1}
+      ]
+    }
+relative paths in the manifest are relative to the directory of the manifest.
+"docx" can also be given per job, the -docx option is used when not in the manifest.
+"save_level" selects the fast save (see docxsave) with that deflate level.
+"update" updates the table rows of the existing word_out instead of writing a new document (see update).
+"chunk_rows", "chunk_bytes" and "chunk_documents" split the large tables (see CreateWordDocBase.write_chunks).
+"rt_table" and "rt_json" add the resource type index of the device files (see rtindex).
+
+or as a glob of input files of one kind, the output is <out_dir>/<input name>.docx:
+    batch2doc.py -glob "in/*.json" -kind device -out_dir out -docx ../input/ResourceTemplate.docx
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+from ocfdoc import device, enumeration
+from ocfdoc.templatecache import template_cache
+
+KINDS = ["device", "lbnldevice", "enum"]
+
+
+def job_kind(job):
+    """
+    the kind of conversion of a job
+    :param job: job dict
+    :return: "device", "lbnldevice" or "enum"
+    """
+    for kind in KINDS:
+        if job.get(kind) is not None:
+            return kind
+    raise ValueError("job has none of %s: %s" % (KINDS, job))
+
+
+def load_manifest(manifest_name, docx_name=None):
+    """
+    read the jobs of a manifest
+    :param manifest_name: manifest file name (json)
+    :param docx_name: template for the jobs without docx
+    :return: list of job dicts
+    """
+    with open(manifest_name, 'r', encoding='UTF8') as manifest_file:
+        manifest = json.load(manifest_file)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    base_dir = os.path.dirname(os.path.abspath(manifest_name))
+    default_docx = manifest.get("docx")
+    if default_docx is not None:
+        default_docx = os.path.join(base_dir, default_docx)
+    else:
+        default_docx = docx_name
+
+    jobs = []
+    for entry in manifest["jobs"]:
+        job = dict(entry)
+        kind = job_kind(job)
+        job[kind] = os.path.join(base_dir, job[kind])
+        job["word_out"] = os.path.join(base_dir, job["word_out"])
+        if job.get("rt_json") is not None:
+            job["rt_json"] = os.path.join(base_dir, job["rt_json"])
+        if job.get("docx") is not None:
+            job["docx"] = os.path.join(base_dir, job["docx"])
+        else:
+            job["docx"] = default_docx
+        jobs.append(job)
+    return jobs
+
+
+def glob_jobs(pattern, kind, out_dir, docx_name):
+    """
+    jobs for all input files matching a glob pattern
+    :param pattern: glob pattern of the input files
+    :param kind: "device", "lbnldevice" or "enum"
+    :param out_dir: directory of the word files out
+    :param docx_name: template
+    :return: list of job dicts
+    """
+    jobs = []
+    for input_name in sorted(glob.glob(pattern)):
+        base_name = os.path.splitext(os.path.basename(input_name))[0]
+        jobs.append({kind: input_name,
+                     "word_out": os.path.join(out_dir, base_name + ".docx"),
+                     "docx": docx_name})
+    return jobs
+
+
+def create_worddoc(job, template_cache_dir=None, incremental=False, force=False):
+    """
+    the conversion of a job, the input is parsed (unless streamed) but not converted yet
+    :param job: job dict
+    :param template_cache_dir: directory for the stored templates
+    :param incremental: skip the conversion when nothing changed since the last run
+    :param force: convert also when nothing changed
+    :return: CreateWordDoc of device2doc or enum2doc
+    """
+    kind = job_kind(job)
+    if kind == "enum":
+        worddoc = enumeration.CreateWordDoc(enum=job["enum"], backend=job.get("backend", "docx"))
+        worddoc.annex_switch = bool(job.get("annex", False))
+    elif kind == "lbnldevice":
+        worddoc = device.CreateWordDoc(lbnldevice=job["lbnldevice"], backend=job.get("backend", "docx"))
+    else:
+        worddoc = device.CreateWordDoc(device=job["device"], backend=job.get("backend", "docx"))
+    if kind != "enum":
+        worddoc.rt_table = job.get("rt_table", False) is True
+        worddoc.rt_json = job.get("rt_json")
+    worddoc.docx_name_in = job["docx"]
+    worddoc.docx_name_out = job["word_out"]
+    worddoc.template_cache_dir = template_cache_dir
+    worddoc.incremental = incremental
+    worddoc.force = force
+    worddoc.save_level = job.get("save_level")
+    worddoc.update = job.get("update", False) is True
+    worddoc.chunk_rows = job.get("chunk_rows")
+    worddoc.chunk_bytes = job.get("chunk_bytes")
+    worddoc.chunk_documents = job.get("chunk_documents", False) is True
+    out_dir = os.path.dirname(job["word_out"])
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    return worddoc
+
+
+def run_job(job, template_cache_dir=None, incremental=False, force=False):
+    """
+    run the conversion of one job in this process
+    :param job: job dict
+    :param template_cache_dir: directory for the stored templates
+    :param incremental: skip the conversion when nothing changed since the last run
+    :param force: convert also when nothing changed
+    :return: "ok", "skipped" or "failed"
+    """
+    worddoc = create_worddoc(job, template_cache_dir, incremental, force)
+    if worddoc.convert() is not True:
+        return "failed"
+    return "skipped" if worddoc.skipped else "ok"
+
+
+def convert_job(job, template_cache_dir=None, incremental=False, force=False):
+    """
+    run one job, the console output of the conversion is captured
+    :param job: job dict
+    :param template_cache_dir: directory for the stored templates
+    :param incremental: skip the conversion when nothing changed since the last run
+    :param force: convert also when nothing changed
+    :return: (job, status, seconds, console output), status is "ok", "skipped", "failed" or "error"
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            status = run_job(job, template_cache_dir, incremental, force)
+    except Exception:
+        status = "error"
+        log.write(traceback.format_exc())
+    return job, status, time.perf_counter() - start, log.getvalue()
+
+
+def init_worker(docx_names, template_cache_dir):
+    """
+    initializer of the worker processes: load the templates once per worker
+    :param docx_names: templates used by the jobs
+    :param template_cache_dir: directory for the stored templates
+    """
+    template_cache.cache_dir = template_cache_dir
+    for docx_name in docx_names:
+        try:
+            template_cache.load(docx_name)
+        except Exception:
+            # reported by the job itself
+            pass
+
+
+def run_batch(jobs, workers=None, template_cache_dir=None, incremental=False, force=False, report=print):
+    """
+    run all jobs in a process pool
+    :param jobs: list of job dicts
+    :param workers: number of worker processes, None is the number of cpus, 1 runs in this process
+    :param template_cache_dir: directory for the stored templates
+    :param incremental: skip the conversions when nothing changed since the last run
+    :param force: convert also when nothing changed
+    :param report: function called with a text line per finished job
+    :return: list of (job, status, seconds, console output) in the order of the jobs
+    """
+    docx_names = sorted(set(job["docx"] for job in jobs if job.get("docx") is not None))
+    results = [None] * len(jobs)
+
+    def done(index, result):
+        results[index] = result
+        job, status, seconds, log = result
+        report("%-7s %8.3fs  %s -> %s" % (status, seconds, job[job_kind(job)], job["word_out"]))
+        if status not in ("ok", "skipped"):
+            report(log)
+
+    if workers == 1:
+        init_worker(docx_names, template_cache_dir)
+        for index, job in enumerate(jobs):
+            done(index, convert_job(job, template_cache_dir, incremental, force))
+        return results
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                                initargs=(docx_names, template_cache_dir)) as executor:
+        futures = {}
+        for index, job in enumerate(jobs):
+            futures[executor.submit(convert_job, job, template_cache_dir, incremental, force)] = index
+        for future in concurrent.futures.as_completed(futures):
+            done(futures[future], future.result())
+    return results
+
+
+#
+#   main of script
+#
+def main():
+    """
+    command line interface
+    """
+    print ("************************")
+    print ("*** batch2doc (v1) ***")
+    print ("************************")
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("-manifest", "--manifest", default=None, help="manifest file name (json) with the jobs")
+    parser.add_argument("-glob", "--glob", default=None, help="glob pattern of the input files (json)")
+    parser.add_argument("-kind", "--kind", default="device", choices=KINDS, help="kind of the -glob input files")
+    parser.add_argument("-out_dir", "--out_dir", default=".", help="directory of the word files out for -glob")
+    parser.add_argument("-docx", "--docx", default=None, help="word file in (template)")
+    parser.add_argument("-jobs", "--jobs", default=None, type=int,
+                        help="number of worker processes (default number of cpus, 1 runs without pool)")
+    parser.add_argument("-template_cache", "--template_cache", default=None,
+                        help="directory to keep the (uncompressed) template for next runs")
+    parser.add_argument("-incremental", "--incremental", help="skip the files that did not change since the last run",
+                        action='store_true')
+    parser.add_argument("-force", "--force", help="convert also when nothing changed (with -incremental)",
+                        action='store_true')
+
+    args = parser.parse_args()
+
+    print("manifest        : " + str(args.manifest))
+    print("glob            : " + str(args.glob))
+    print("docx            : " + str(args.docx))
+    print("jobs            : " + str(args.jobs))
+    print("")
+
+    jobs = []
+    if args.manifest is not None:
+        jobs.extend(load_manifest(args.manifest, args.docx))
+    if args.glob is not None:
+        jobs.extend(glob_jobs(args.glob, args.kind, args.out_dir, args.docx))
+    if len(jobs) == 0:
+        print ("no jobs, use -manifest or -glob")
+        return
+
+    start = time.perf_counter()
+    results = run_batch(jobs, args.jobs, args.template_cache, args.incremental, args.force)
+    seconds = time.perf_counter() - start
+
+    failures = len([result for result in results if result[1] not in ("ok", "skipped")])
+    skipped = len([result for result in results if result[1] == "skipped"])
+    print("")
+    print("documents       : %d (%d skipped, %d failed)" % (len(results), skipped, failures))
+    print("time            : %.3f s" % seconds)
+    print("throughput      : %.2f documents/s" % (len(results) / seconds))
+    if failures > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+build manifest for incremental rebuilds
+
+next to each generated word file a manifest (<word_out>.build.json) records what the document was
+generated from: the hash of the input json, the hash of the template, the tool VERSION and the options,
+and the other files the conversion wrote (e.g. the documents of the chunks).
+when all of these are unchanged and the word file and the other files still exist, the conversion can be skipped.
+"""
+
+import hashlib
+import json
+import os
+
+from ocfdoc.version import VERSION
+
+MANIFEST_EXT = ".build.json"
+
+
+def file_hash(filename):
+    """
+    content hash of a file
+    :param filename: file name
+    :return: sha256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as in_file:
+        for block in iter(lambda: in_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_name(word_out):
+    """
+    file name of the manifest of a word file
+    :param word_out: word file name
+    :return: manifest file name
+    """
+    return word_out + MANIFEST_EXT
+
+
+def build_record(input_name, docx_name, options):
+    """
+    the record of everything a document depends on
+    :param input_name: input json file name
+    :param docx_name: template file name
+    :param options: dict of the options that change the output
+    :return: dict
+    """
+    return {"input": file_hash(input_name),
+            "template": file_hash(docx_name),
+            "version": VERSION,
+            "options": options}
+
+
+def read_record(word_out):
+    """
+    the record of the last generation of a word file
+    :param word_out: word file name
+    :return: dict or None when there is no (readable) manifest
+    """
+    try:
+        with open(manifest_name(word_out), 'r', encoding='UTF8') as in_file:
+            return json.load(in_file)
+    except (OSError, ValueError):
+        return None
+
+
+def recorded_outputs(record):
+    """
+    the other files written by the conversion of a record
+    :param record: dict from read_record, or None
+    :return: list of file names
+    """
+    if not isinstance(record, dict):
+        return []
+    return list(record.get("outputs", []))
+
+
+def write_record(word_out, record, outputs=None):
+    """
+    write the manifest of a generated word file
+    :param word_out: word file name
+    :param record: dict from build_record
+    :param outputs: the other files written by the conversion, checked by is_up_to_date
+    """
+    name = manifest_name(word_out)
+    temp_name = "%s.%d.tmp" % (name, os.getpid())
+    if outputs:
+        record = dict(record, outputs=[os.path.abspath(output) for output in outputs])
+    with open(temp_name, 'w', encoding='UTF8') as out_file:
+        json.dump(record, out_file, indent=2, sort_keys=True)
+    os.replace(temp_name, name)
+
+
+def is_up_to_date(word_out, record):
+    """
+    check if a word file was generated from the same input, template, version and options
+    :param word_out: word file name
+    :param record: dict from build_record
+    :return: True when the conversion can be skipped
+    """
+    if not os.path.isfile(word_out):
+        return False
+    stored = read_record(word_out)
+    if not isinstance(stored, dict):
+        return False
+    outputs = recorded_outputs(stored)
+    stored.pop("outputs", None)
+    return stored == record and all(os.path.isfile(output) for output in outputs)
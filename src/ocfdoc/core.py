@@ -0,0 +1,694 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+shared core of the device2doc and enum2doc tools
+
+the generic json helpers and the conversion flow shared by the generators:
+incremental check, template load, generation of the content and save.
+python-docx is only imported when a document is generated.
+"""
+
+import json
+import os
+import sys
+import traceback
+
+from ocfdoc.buildmanifest import build_record, is_up_to_date, read_record, recorded_outputs, write_record
+from ocfdoc.stats import ConversionStats
+from ocfdoc.styles import StyleError, StyleRegistry
+from ocfdoc.tablelayout import write_table
+
+if sys.version_info < (3, 5):
+    raise Exception("ERROR: Python 3.5 or more is required, you are currently running Python %d.%d!" %
+                    (sys.version_info[0], sys.version_info[1]))
+
+
+def load_json_schema(filename, my_dir):
+    """
+    load the JSON schema file
+    :param filename: filename (with extension)
+    :param my_dir: path to the file
+    :return: json_dict
+    """
+    full_path = os.path.join(my_dir, filename)
+    if os.path.isfile(full_path) is False:
+        print ("json file does not exist:", full_path)
+
+    with open(full_path, 'r') as json_file:
+        json_dict = json.load(json_file)
+
+    return json_dict
+
+
+def get_dir_list(dir, ext=None):
+    """
+    get all files (none recursive) in the specified dir
+    :param dir: path to the directory
+    :param ext: filter on extension
+    :return: list of files (only base_name)
+    """
+    only_files = [f for f in os.listdir(dir) if os.path.isfile(os.path.join(dir, f))]
+    # remove .bak files
+    new_list = [x for x in only_files if not x.endswith(".bak")]
+    if ext is not None:
+        cur_list = new_list
+        new_list = [x for x in cur_list if x.endswith(ext)]
+    return new_list
+
+
+def find_key(rec_dict, target, depth=0):
+    """
+    find key "target" in recursive dict
+    :param rec_dict: dict to search in, json schema dict, so it is combination of dict and arrays
+    :param target: target key to search for
+    :param depth: depth of the search (recursion)
+    :return:
+    """
+    try:
+        if isinstance(rec_dict, dict):
+            for key, value in rec_dict.items():
+                if key == target:
+                    return rec_dict[key]
+            for key, value in rec_dict.items():
+                r = find_key(value, target, depth+1)
+                if r is not None:
+                        return r
+        #else:
+        #    print ("no dict:", rec_dict)
+    except:
+        traceback.print_exc()
+
+
+def find_key_link(rec_dict, target, depth=0):
+    """
+    find the first key recursively
+    also traverse lists (arrays, oneOf,..) but only returns the first occurance
+    :param rec_dict: dict to search in, json schema dict, so it is combination of dict and arrays
+    :param target: target key to search for
+    :param depth: depth of the search (recursion)
+    :return:
+    """
+    if isinstance(rec_dict, dict):
+        # direct key
+        for key, value in rec_dict.items():
+            if key == target:
+                return rec_dict[key]
+        # key is in array
+        rvalues = []
+        found = False
+        for key, value in rec_dict.items():
+            if key in ["oneOf", "allOf", "anyOf"]:
+                for val in value:
+                    if val == target:
+                        return val
+                    if isinstance(val, dict):
+                        r = find_key_link(val, target, depth+1)
+                        if r is not None:
+                            found = True
+                            # TODO: this should return an array, now it only returns the last found item
+                            rvalues = r
+        if found:
+            return rvalues
+        # key is an dict
+        for key, value in rec_dict.items():
+            r = find_key_link(value, target, depth+1)
+            if r is not None:
+                return r #[list(r.items())]
+
+
+def check_docx():
+    """
+    check that python-docx is installed
+    :return: True when docx can be imported
+    """
+    try:
+        import docx
+    except ImportError:
+        print("missing docx:")
+        print("install the required module: python3 -m pip install python-docx")
+        return False
+    return True
+
+
+def add_stats_arguments(parser):
+    """
+    add the instrumentation options to the command line parser
+    :param parser: argparse parser
+    """
+    parser.add_argument( "-stats_json" , "--stats_json" , default=None,
+                         help="write the phase timings and counters as json to this file (- is stdout)", required=False)
+    parser.add_argument( "-profile"    , "--profile"    , default=None,
+                         help="profile the conversion with cProfile, pstats file name", required=False)
+    parser.add_argument( "-tracemalloc", "--tracemalloc", help="trace the python memory per phase (slow)",
+                         action='store_true')
+
+
+def add_save_arguments(parser):
+    """
+    add the save options to the command line parser
+    :param parser: argparse parser
+    """
+    parser.add_argument( "-save_level" , "--save_level" , default=None, type=int, choices=range(10),
+                         help="fast save: copy the unchanged template parts, deflate the other parts with "
+                              "this level (0 is no compression)", required=False)
+
+
+def add_chunk_arguments(parser):
+    """
+    add the options of the chunked output of large tables to the command line parser
+    :param parser: argparse parser
+    """
+    parser.add_argument( "-chunk_rows" , "--chunk_rows" , default=None, type=int,
+                         help="split the tables in tables of at most this many rows, the header rows repeated",
+                         required=False)
+    parser.add_argument( "-chunk_bytes", "--chunk_bytes", default=None, type=int,
+                         help="split the tables in tables of at most this many bytes of xml", required=False)
+    parser.add_argument( "-chunk_documents", "--chunk_documents",
+                         help="write the chunks after the first to word files of their own (<word_out>-2.docx, ..)",
+                         action='store_true')
+
+
+def add_resident_arguments(parser):
+    """
+    add the options of the long running mode (see watch) to the command line parser
+    :param parser: argparse parser
+    """
+    parser.add_argument( "-watch"      , "--watch"      , help="keep running and convert again when the input or the "
+                                                               "template changes", action='store_true')
+    parser.add_argument( "-serve"      , "--serve"      , default=None, type=int,
+                         help="keep running and convert json posted to http://127.0.0.1:<port>/device|lbnldevice|enum",
+                         required=False)
+    parser.add_argument( "-poll"       , "--poll"       , default=0.5, type=float,
+                         help="seconds between the checks of the watched files (with -watch)", required=False)
+    parser.add_argument( "-debounce"   , "--debounce"   , default=0.3, type=float,
+                         help="seconds a changed file should stay unchanged before converting (with -watch)",
+                         required=False)
+
+
+def run_resident(args, conversions):
+    """
+    run the long running mode, until interrupted (ctrl-c)
+    :param args: parsed arguments (see add_resident_arguments), -docx is the template
+    :param conversions: list of (input file name, function running the conversion of that input)
+    """
+    from ocfdoc.watch import Watcher, make_server, run_forever
+
+    watcher = None
+    if args.watch is True:
+        watcher = Watcher(args.poll, args.debounce)
+        for input_name, function in conversions:
+            watcher.add(input_name, [input_name, args.docx], function)
+        print ("watching:", ", ".join(input_name for input_name, _ in conversions))
+    server = None
+    if args.serve is not None:
+        server = make_server(args.serve, args.docx)
+        print ("serving: http://%s:%d/ (POST /device, /lbnldevice or /enum)" % server.server_address[:2])
+    run_forever(watcher, server, args.poll)
+
+
+def document_output(word_out):
+    """
+    the output of the document, - is stdout: the messages are printed on stderr from then on
+    :param word_out: word file out of the command line
+    :return: file name or binary file object
+    """
+    if word_out != "-":
+        return word_out
+    output = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    return output
+
+
+def start_stats(args):
+    """
+    create the statistics of a conversion and start the tracing requested on the command line
+    :param args: parsed arguments (see add_stats_arguments)
+    :return: ConversionStats
+    """
+    stats = ConversionStats()
+    stats.start_tracing(profile_name=args.profile, trace_memory=args.tracemalloc)
+    return stats
+
+
+def report_stats(stats, args):
+    """
+    stop the tracing and report the statistics: as text with -ver, as json with -stats_json
+    :param stats: ConversionStats
+    :param args: parsed arguments (see add_stats_arguments)
+    """
+    stats.stop_tracing()
+    if args.verbose:
+        print ("")
+        print (stats.text())
+    if args.stats_json == "-":
+        print (stats.json())
+    elif args.stats_json is not None:
+        with open(args.stats_json, 'w') as stats_file:
+            stats_file.write(stats.json())
+
+
+class CreateWordDocBase(object):
+    # encoding of the input json file, None is the platform default
+    input_encoding = None
+
+    def __init__(self, input_filename, docx_name_in=None, docx_name_out=None, stream=False, stats=None,
+                 backend="docx"):
+        """
+        initialize the class
+        :param input_filename: input json file
+        :param docx_name_in: word template
+        :param docx_name_out: word file out, a file name or a binary file object (e.g. io.BytesIO)
+        :param stream: read the input file record by record during the conversion,
+                       instead of parsing the whole file here
+        :param stats: ConversionStats that records the phases, None creates one
+        :param backend: table writer, "docx" (python-docx elements) or "xml" (serialised w:tbl)
+        """
+        # input arguments
+        self.docx_name_in = docx_name_in
+        self.docx_name_out = docx_name_out
+        self.backend = backend
+        # column widths of the generated tables (see tablelayout.parse_width), None keeps the default widths
+        self.col_widths = None
+        # directory for the stored (uncompressed) template, None is in memory only
+        self.template_cache_dir = None
+        # deflate level of the fast save (docxsave), None saves with python-docx
+        self.save_level = None
+        # incremental: skip the conversion when input, template, version and options are unchanged
+        self.incremental = False
+        self.force = False
+        self.skipped = False
+        # update: patch the tables of an existing word file out (see update), instead of a new document
+        self.update = False
+        # the layouts of the tables to update, None when writing a new document
+        self.layouts = None
+        # build record of an incremental build, written with the document
+        self.record = None
+        # chunked output (see write_chunks): maximum rows / bytes of xml of a table, None is no limit,
+        # chunk_documents writes the chunks after the first to word files of their own
+        self.chunk_rows = None
+        self.chunk_bytes = None
+        self.chunk_documents = False
+        # the word files written by chunk_documents, after word_out
+        self.chunk_names = []
+        self.stats = stats if stats is not None else ConversionStats()
+        # StyleRegistry of the loaded template
+        self.styles = None
+
+        self.input_filename = input_filename
+        self.stream = stream
+        self.json_parse_tree = None
+        if stream is False:
+            with self.stats.phase("parse input"):
+                schema_string = open(self.input_filename, 'r', encoding=self.input_encoding).read()
+                self.json_parse_tree = self.load_input(schema_string)
+
+    def load_input(self, text):
+        """
+        decode the input file
+        :param text: content of the input json file
+        :return: parse tree (see input_records)
+        """
+        return json.loads(text)
+
+    def read_records(self, input_file):
+        """
+        the records of the opened input file, used when streaming
+        :param input_file: file object opened in text mode
+        :return: generator of records (see jsonstream)
+        """
+        raise NotImplementedError
+
+    def input_records(self):
+        """
+        the input: the parse tree, or a generator reading the file when streaming
+        :return: parse tree or generator of records
+        """
+        if self.json_parse_tree is not None:
+            return self.json_parse_tree
+
+        def records():
+            with open(self.input_filename, 'r', encoding=self.input_encoding) as input_file:
+                for record in self.read_records(input_file):
+                    yield record
+        return records()
+
+    def swag_sanitize_description(self, description):
+        """
+        removes line breaks, quotes  etc
+        :param description: input string
+        :return: text string
+        """
+        text = description.replace("\n", "@cr").replace("'", "<COMMA>").replace('"', "<COMMA>")
+        return text
+
+    def swag_unsanitize_description(self, description):
+        """
+        removes line breaks, quotes  etc
+        :param description: input string
+        :return: text string
+        """
+        text = description.replace("@cr", "\n").replace("<COMMA>", "'")
+        return text
+
+    def build_options(self):
+        """
+        the options that change the generated document, recorded for incremental builds
+        :return: dict
+        """
+        return {}
+
+    def output_files(self):
+        """
+        the files the conversion writes next to the word file out (e.g. json sidecars, the documents of the chunks),
+        recorded in the build record: an incremental build is out of date when one of them is missing
+        :return: list of file names
+        """
+        return list(self.chunk_names)
+
+    def required_styles(self):
+        """
+        the styles the generator uses, validated when the template is loaded
+        :return: dict style name -> styles.PARAGRAPH or styles.TABLE
+        """
+        return {}
+
+    def resolve_styles(self):
+        """
+        resolve the styles of the loaded template (self.document) into self.styles
+        :raises StyleError: when the template misses styles
+        """
+        self.styles = StyleRegistry(self.document, self.required_styles())
+
+    def add_fragment(self, p):
+        """
+        add a stamped paragraph (see fragments) at the end of the document
+        :param p: w:p element
+        :return: python-docx paragraph
+        """
+        from docx.text.paragraph import Paragraph
+
+        self.document.element.body._insert_p(p)
+        return Paragraph(p, self.document._body)
+
+    def chunked(self):
+        """
+        :return: True when the tables are written in chunks (chunk_rows or chunk_bytes)
+        """
+        return self.chunk_rows is not None or self.chunk_bytes is not None
+
+    def apply_col_widths(self, layout):
+        """
+        set the column widths (self.col_widths) of a table, with a fixed table layout so Word keeps them
+        :param layout: TableLayout
+        :raises ValueError: when the number of widths is not the number of columns of the table
+        """
+        if self.col_widths is None:
+            return
+        if len(self.col_widths) != layout.cols:
+            raise ValueError("-col_widths gives %d widths, the table has %d columns" %
+                             (len(self.col_widths), layout.cols))
+        layout.set_widths(self.col_widths, autofit=False)
+
+    def write_table(self, layout, caption=None, col_widths=True):
+        """
+        write the table layout at the end of the document with the selected backend
+        when updating, the layout is only collected, the table is updated in the existing document.
+        :param layout: TableLayout
+        :param caption: (label, title, field instruction, style name) of the caption of the table (see write_chunks)
+        :param col_widths: apply the column widths (see apply_col_widths), False for a table of another shape
+                           than the main table of the generator (e.g. the resource type table)
+        :return: the created table (the first chunk), None when updating
+        """
+        if col_widths is True:
+            self.apply_col_widths(layout)
+        self.stats.count_layout(layout)
+        if self.layouts is not None:
+            self.layouts.append(layout)
+            return None
+        if self.chunked():
+            return self.write_chunks(layout, caption)
+        return self.write_layout(self.document, layout, self.styles)
+
+    def write_layout(self, document, layout, styles):
+        """
+        write a table layout at the end of a document with the selected backend
+        :param document: python-docx document
+        :param layout: TableLayout
+        :param styles: StyleRegistry of the document
+        :return: the created table
+        """
+        with self.stats.phase("write table"):
+            if self.backend == "xml":
+                from ocfdoc.ooxmlwriter import write_table_xml
+                return write_table_xml(document, layout, styles)
+            return write_table(document, layout, styles)
+
+    def write_chunks(self, layout, caption=None):
+        """
+        write a large table as tables of at most chunk_rows rows / chunk_bytes bytes of xml, each with the header
+        rows of the layout. the tables are split between groups of rows (see TableLayout.start_group),
+        so a device stays together with its resources.
+        the tables after the first start with the caption of the table: its SEQ field numbers them as tables of
+        their own. without caption an empty paragraph keeps Word from joining the tables.
+        with chunk_documents the tables after the first are written to word files of their own (see chunk_name),
+        each saved before the next is built, their captions continue the numbering of the first document.
+        :param layout: TableLayout
+        :param caption: (label, title, field instruction, style name) of the caption of the table, None is no caption
+        :return: the table of the first chunk
+        """
+        from ocfdoc.fragments import count_seq_fields, fragments, reset_instruction
+        from ocfdoc.templatecache import open_template
+
+        row_bytes = None
+        if self.chunk_bytes is not None:
+            from ocfdoc.ooxmlwriter import column_twips, rows_xml_parts
+            from ocfdoc.tablelayout import block_width, style_ids
+
+            # the size of each row as serialised in document.xml
+            paragraph_ids = style_ids(self.document, layout, self.styles)[1]
+            row_bytes = [len(part.encode("utf-8")) for part in
+                         rows_xml_parts(layout, column_twips(layout, block_width(self.document)), paragraph_ids)]
+            row_bytes = row_bytes.__getitem__
+        ranges = layout.chunk_ranges(self.chunk_rows, self.chunk_bytes, row_bytes)
+        self.stats.count("chunks", len(ranges))
+        documents = self.chunk_documents is True and isinstance(self.docx_name_out, str)
+        if caption is not None and documents is True:
+            # the captions numbered in the first document, the caption of the table included
+            number = count_seq_fields(self.document.element.body, caption[2])
+
+        table = self.write_layout(self.document, layout.sub_layout(*ranges[0]), self.styles)
+        for first_row, end_row in ranges[1:]:
+            document, styles = self.document, self.styles
+            if documents is True:
+                with self.stats.phase("load template"):
+                    document = open_template(self.docx_name_in, self.template_cache_dir)
+                styles = StyleRegistry(document, self.required_styles())
+            if caption is not None:
+                label, title, instruction, style_name = caption
+                if documents is True:
+                    number += 1
+                    instruction = reset_instruction(instruction, number)
+                document.element.body._insert_p(fragments.caption(label, title, instruction,
+                                                                  styles.style_id(style_name)))
+            elif documents is False:
+                document.element.body._insert_p(fragments.paragraph(None))
+            self.write_layout(document, layout.sub_layout(first_row, end_row), styles)
+            if documents is True:
+                # numbered over all the tables of the document
+                self.chunk_names.append(self.chunk_name(len(self.chunk_names) + 2))
+                with self.stats.phase("save"):
+                    self.save(document, self.chunk_names[-1])
+                print ("document saved..", self.chunk_names[-1])
+        return table
+
+    def chunk_name(self, index):
+        """
+        the word file of a chunk written to its own document, the first chunk is in word_out
+        :param index: number of the document, 2 for the first chunk in a document of its own
+        :return: file name, <word_out>-<index>.docx
+        """
+        base_name, extension = os.path.splitext(self.docx_name_out)
+        return "%s-%d%s" % (base_name, index, extension)
+
+    def remove_stale_chunks(self, previous_outputs):
+        """
+        remove the documents of chunks written by an earlier conversion that are not written again,
+        e.g. when the table got shorter or the chunks bigger
+        :param previous_outputs: the outputs recorded by the earlier conversion
+        """
+        base_name, extension = os.path.splitext(os.path.abspath(self.docx_name_out))
+        written = set(os.path.abspath(name) for name in self.chunk_names)
+        stale = [name for name in previous_outputs
+                 if name.startswith(base_name + "-") and name.endswith(extension) and
+                 name[len(base_name) + 1:len(name) - len(extension)].isdigit() and name not in written]
+        if self.chunk_documents is True:
+            # without a record: the chunks are numbered without gaps
+            index = len(self.chunk_names) + 2
+            while os.path.isfile(self.chunk_name(index)):
+                stale.append(self.chunk_name(index))
+                index += 1
+        for name in stale:
+            if os.path.isfile(name):
+                os.remove(name)
+                print ("stale document removed..", name)
+
+    def generate(self):
+        """
+        generate the content of the document (self.document)
+        """
+        raise NotImplementedError
+
+    def save(self, document=None, docx_name_out=None):
+        """
+        save the document to docx_name_out
+        with save_level the parts shared with the template are copied from the template file (see docxsave),
+        otherwise python-docx saves the document.
+        :param document: python-docx document, None is self.document
+        :param docx_name_out: word file out, None is self.docx_name_out
+        """
+        document = self.document if document is None else document
+        docx_name_out = self.docx_name_out if docx_name_out is None else docx_name_out
+        if self.save_level is not None:
+            from ocfdoc.docxsave import save_document
+            from ocfdoc.templatecache import template_cache
+
+            source, template = template_cache.source(self.docx_name_in)
+            save_document(document, docx_name_out, self.save_level, source, template, self.stats)
+            return
+        document.save(docx_name_out)
+        if isinstance(docx_name_out, str):
+            self.stats.count("bytes written", os.path.getsize(docx_name_out))
+
+    def update_document(self):
+        """
+        update the tables of the existing word file out to the collected layouts (self.layouts)
+        :return: True when updated, False when a table was not found in the word file out
+        """
+        from docx import Document
+        from ocfdoc.update import find_table, update_table
+
+        document = Document(self.docx_name_out)
+        tables = [find_table(document, layout) for layout in self.layouts]
+        if None in tables:
+            return False
+        for tbl, layout in zip(tables, self.layouts):
+            update_table(document, tbl, layout, self.styles, self.stats)
+        self.document = document
+        return True
+
+    def prepare(self):
+        """
+        the steps before the tables are built: the incremental check, loading the template and its styles
+        sets self.skipped when the document is up to date.
+        :return: True when the tables can be built (or skipped), False when the template could not be loaded
+        """
+        # the template cache needs zipfile and python-docx, only loaded for a conversion
+        from ocfdoc.templatecache import open_template
+
+        self.record = None
+        self.chunk_names = []
+        if self.incremental is True and isinstance(self.docx_name_out, str):
+            with self.stats.phase("incremental check"):
+                try:
+                    self.record = build_record(self.input_filename, self.docx_name_in, self.build_options())
+                except OSError:
+                    # missing files are reported by the conversion
+                    self.record = None
+                up_to_date = self.record is not None and self.force is not True and \
+                    is_up_to_date(self.docx_name_out, self.record) and \
+                    all(os.path.isfile(name) for name in self.output_files())
+            if up_to_date:
+                self.skipped = True
+                print ("document up to date..", self.docx_name_out)
+                return True
+
+        try:
+            with self.stats.phase("load template"):
+                self.document = open_template(self.docx_name_in, self.template_cache_dir)
+        except:
+            print ("could not load file: ", self.docx_name_in)
+            print ("make sure that docx file exist..")
+            return False
+        try:
+            self.resolve_styles()
+        except StyleError as e:
+            print ("could not use file: ", self.docx_name_in)
+            print (e)
+            return False
+        return True
+
+    def build(self):
+        """
+        build the tables in the loaded template, or update them in the existing word file out (self.update)
+        """
+        from ocfdoc.templatecache import open_template
+
+        self.chunk_names = []
+        if self.update is True and self.chunked() is False and isinstance(self.docx_name_out, str) and \
+                os.path.exists(self.docx_name_out):
+            self.layouts = []
+        with self.stats.phase("build tables"):
+            self.generate()
+        if self.layouts is not None:
+            with self.stats.phase("update"):
+                updated = self.update_document()
+            self.layouts = None
+            if not updated:
+                print ("table not found, generating the document again..", self.docx_name_out)
+                with self.stats.phase("load template"):
+                    self.document = open_template(self.docx_name_in, self.template_cache_dir)
+                self.resolve_styles()
+                with self.stats.phase("build tables"):
+                    self.generate()
+
+    def finish(self):
+        """
+        save the built document to the word file out, with the build record of an incremental build
+        """
+        if self.docx_name_out is not None:
+            with self.stats.phase("save"):
+                self.save()
+                if isinstance(self.docx_name_out, str):
+                    previous_outputs = recorded_outputs(read_record(self.docx_name_out))
+                    if self.record is not None:
+                        write_record(self.docx_name_out, self.record, self.output_files())
+                    self.remove_stale_chunks(previous_outputs)
+            if isinstance(self.docx_name_out, str):
+                print ("document saved..", self.docx_name_out)
+            else:
+                print ("document saved..")
+
+    def convert(self):
+        """
+        conversion of the json data into the word document
+        the steps (prepare, build, finish) can also be run separately
+
+        :return: True when the conversion is done, False when the template could not be loaded
+        """
+        if self.prepare() is not True:
+            return False
+        if self.skipped is True:
+            return True
+        self.build()
+        self.finish()
+        return True
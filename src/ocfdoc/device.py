@@ -0,0 +1,551 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+device2doc: word tables of the device list and the lbnl device list
+"""
+
+import argparse
+import functools
+import os
+import traceback
+
+from ocfdoc.core import CreateWordDocBase, add_chunk_arguments, add_resident_arguments, add_save_arguments, \
+    add_stats_arguments, check_docx, document_output, report_stats, run_resident, start_stats
+from ocfdoc.fragments import fragments
+from ocfdoc.jsonstream import iter_devices, iter_lbnl_records
+from ocfdoc.model import Device, ModelBuilder, lbnl_records
+from ocfdoc.rtindex import ResourceIndex
+from ocfdoc.stats import ConversionStats
+from ocfdoc.styles import TABLE
+from ocfdoc.tablelayout import TableLayout, parse_width
+
+
+class CreateWordDoc(CreateWordDocBase):
+    def __init__(self, device=None, lbnldevice=None, docx_name_in=None, docx_name_out=None, resource_name=None,
+                 backend="docx", stream=False, stats=None, vmerge=False, jobs=1):
+        """
+        initialize the class
+        :param backend: table writer, "docx" (python-docx elements) or "xml" (serialised w:tbl)
+        :param stream: read the device file record by record during the conversion,
+                       instead of parsing the whole file here
+        :param stats: ConversionStats that records the phases, None creates one
+        :param vmerge: merge the device cells vertically over the rows of the resources,
+                       and the category rows over the full width
+        :param jobs: number of worker processes rendering the categories of the lbnl table, 1 is no workers
+
+
+        """
+        self.vmerge = vmerge
+        self.jobs = jobs
+        # ResourceCatalog (schemacache) to fill in missing resource titles / types, None is no filling
+        self.catalog = None
+        # the input is read into the compact model (ocfdoc.model)
+        self.model = ModelBuilder()
+        # reverse index resource type -> devices (see rtindex): as an extra table and/or a json file, None is none
+        self.rt_table = False
+        self.rt_json = None
+        self.rt_index = None
+
+        # initialise the variable
+        self.device = device
+        self.device_filename = device
+        self.lbnldevice = lbnldevice
+        if lbnldevice is not None:
+            self.device_filename = lbnldevice
+        CreateWordDocBase.__init__(self, self.device_filename, docx_name_in=docx_name_in,
+                                   docx_name_out=docx_name_out, stream=stream, stats=stats, backend=backend)
+
+    def read_records(self, input_file):
+        """
+        the records of the device file as model objects, used when streaming
+        :param input_file: file object opened in text mode
+        :return: generator of Device, or of lbnl records (see model.lbnl_records)
+        """
+        if self.lbnldevice is None:
+            return (self.model.device(device_data) for device_data in iter_devices(input_file))
+        return self.model.records(iter_lbnl_records(input_file))
+
+    def load_input(self, text):
+        """
+        decode the device file into the model
+        :param text: content of the device file
+        :return: list of Device, or list of Category
+        """
+        return self.model.loads(text)
+
+    def build_options(self):
+        """
+        the options that change the generated document, recorded for incremental builds
+        the backend is not included, both backends generate the same document.
+        :return: dict
+        """
+        options = {"kind": "device" if self.lbnldevice is None else "lbnldevice", "vmerge": self.vmerge}
+        if self.catalog is not None:
+            options["schemas"] = self.catalog.digest()
+        if self.col_widths is not None:
+            options["col_widths"] = self.col_widths
+        if self.chunked():
+            options["chunks"] = [self.chunk_rows, self.chunk_bytes, self.chunk_documents]
+        if self.rt_table is True:
+            options["rt_table"] = True
+        if self.rt_json is not None:
+            options["rt_json"] = os.path.abspath(self.rt_json)
+        return options
+
+    def output_files(self):
+        """
+        the documents of the chunks and the json sidecar of the resource type index (rt_json)
+        :return: list of file names
+        """
+        files = CreateWordDocBase.output_files(self)
+        if self.rt_json is not None:
+            files.append(self.rt_json)
+        return files
+
+    def fill_resource(self, resource, count=True):
+        """
+        fill in the missing resourcetypetitle / resourcetypeid of a resource from the schema catalog
+        :param resource: Resource
+        :param count: count the filled resource in the stats
+        :return: Resource, a new one when something was missing
+        """
+        if self.catalog is None or (resource.title and resource.rt):
+            return resource
+        if count is True:
+            self.stats.count("filled resources")
+        return self.model.resource(self.catalog.fill(resource.as_dict()))
+
+    def required_styles(self):
+        """
+        the styles used by the device tables
+        :return: dict style name -> kind
+        """
+        return {'TABLE-A': TABLE}
+
+    def resources_per_device(self, parse_tree):
+        """
+        list all properties (attributes) in an table.
+        create the table and fill it up
+        the rows are first laid out (including the merges) and then written in one go.
+        :param parse_tree: the devices of the device list (model.Device)
+        """
+        layout = TableLayout(4, style='TABLE-A')
+        layout.add_row('Device Name\n (informative)',
+                       'Device Type ("rt")\n (Normative)',
+                       'Required Resource Name',
+                       'Required Resoure Type')
+        layout.header_rows = 1
+
+        for device_data in parse_tree:
+            device_row = row = layout.add_row(device_data.name, device_data.type)
+            layout.start_group(device_row)
+            first = True
+            for resource in device_data.resources:
+                resource = self.fill_resource(resource)
+                if first is True:
+                    first = False
+                else:
+                    # next resources are on their own row, with the device columns merged
+                    row = layout.add_row()
+                    if self.vmerge is False:
+                        layout.merge(row, 0, 1)
+                layout.set_text(row, 2, resource.title)
+                layout.set_text(row, 3, resource.rt)
+            if self.vmerge is True and row > device_row:
+                layout.merge_down(0, device_row, row)
+                layout.merge_down(1, device_row, row)
+
+        self.tableAttribute = self.write_table(layout)
+
+    def lbnl_resources_per_device(self, parse_tree):
+        """
+        list all properties (attributes) in an table.
+        create the table and fill it up
+        the rows are first laid out (including the merges) and then written in one go.
+        with jobs > 1 the rows of the categories are rendered in worker processes (see write_lbnl_parallel).
+        :param parse_tree: the categories of the lbnl device list (model.Category), or the records of read_records
+        """
+        if isinstance(parse_tree, list):
+            parse_tree = lbnl_records(parse_tree)
+        
+        text = "Table was prepared at Lawrence Berkeley National Laboratory under Contract No. DEAC02-05CH11231 with the U.S. Department of Energy."
+        self.add_fragment(fragments.paragraph(text))
+        
+        layout = TableLayout(6, style='TABLE-A')
+        layout.add_row('Category and Device)',
+                       'Comment',
+                       # previous
+                       'Device Name\n (informative)',
+                       'Device Type ("rt")\n (Normative)',
+                       'Required Resource Name',
+                       'Required Resoure Type')
+        layout.header_rows = 1
+
+        if self.jobs > 1 and self.layouts is None and self.chunked() is False:
+            self.tableAttribute = self.write_lbnl_parallel(layout, parse_tree)
+            return
+
+        add_lbnl_records(layout, parse_tree, self.vmerge, self.fill_resource, self.start_category)
+        self.stats.split()
+
+        self.tableAttribute = self.write_table(layout)
+
+    def start_category(self, name):
+        """
+        report the start of a category of the lbnl table
+        :param name: category name
+        """
+        print ("category:", name )
+        self.stats.split("category " + name)
+
+    def write_lbnl_parallel(self, layout, records):
+        """
+        render the rows of each category in a pool of worker processes, as serialised w:tr elements,
+        and write the table with the rows of the categories in input order.
+        the table is the same as the sequential conversion writes (with both backends).
+        :param layout: TableLayout with the header row of the lbnl table
+        :param records: lbnl records (see model.lbnl_records)
+        :return: the created table
+        """
+        # the process pool is only needed with -jobs
+        import concurrent.futures
+
+        from ocfdoc.ooxmlwriter import column_twips, write_table_xml
+        from ocfdoc.tablelayout import block_width, style_ids
+
+        self.apply_col_widths(layout)
+        col_widths = column_twips(layout, block_width(self.document))
+        paragraph_ids = style_ids(self.document, layout, self.styles)[1]
+
+        with self.stats.phase("render categories"):
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                futures = []
+                for name, group in category_groups(records):
+                    if name is not None:
+                        print ("category:", name )
+                    if self.catalog is not None:
+                        # the catalog stays in this process
+                        group = [(kind, Device(record.name, record.type,
+                                               tuple(self.fill_resource(resource) for resource in record.resources))
+                                  if kind == "device" else record) for kind, record in group]
+                    futures.append(executor.submit(render_lbnl_rows, group, self.vmerge, col_widths, paragraph_ids))
+                results = [future.result() for future in futures]
+
+        self.stats.count_layout(layout)
+        for _, counters in results:
+            for name, value in counters.items():
+                self.stats.count(name, value)
+        with self.stats.phase("write table"):
+            return write_table_xml(self.document, layout, self.styles, (row for rows, _ in results for row in rows))
+
+    def resource_type_table(self):
+        """
+        the reverse index (self.rt_index) as table: per resource type the devices requiring it
+        the rows of a resource type are kept together in chunks, with vmerge its cells are merged down.
+        """
+        lbnl = self.lbnldevice is not None
+        layout = TableLayout(5 if lbnl else 4, style='TABLE-A')
+        header = ['Resource Type ("rt")', 'Resource Name', 'Device Name', 'Device Type ("rt")']
+        if lbnl:
+            header.append('Category')
+        layout.add_row(*header)
+        layout.header_rows = 1
+
+        for rt in self.rt_index.resource_types():
+            usage = self.rt_index.usages[rt]
+            rt_row = row = layout.add_row(rt, usage.title)
+            layout.start_group(rt_row)
+            first = True
+            for name, type, category, lbnl_device in usage.devices:
+                if first is True:
+                    first = False
+                else:
+                    # next devices are on their own row, with the resource columns merged
+                    row = layout.add_row()
+                    if self.vmerge is False:
+                        layout.merge(row, 0, 1)
+                layout.set_text(row, 2, name)
+                layout.set_text(row, 3, type)
+                if lbnl:
+                    layout.set_text(row, 4, category)
+            if self.vmerge is True and row > rt_row:
+                layout.merge_down(0, rt_row, row)
+                layout.merge_down(1, rt_row, row)
+        self.stats.count("resource types", len(self.rt_index.usages))
+
+        # an empty paragraph keeps Word from joining the table with the device table
+        self.add_fragment(fragments.paragraph(None))
+        self.write_table(layout, col_widths=False)
+
+    def generate(self):
+        """
+        generate the tables of the device file
+        with rt_table or rt_json the reverse index is built while the device table reads the input.
+        """
+        records = self.input_records()
+        if self.rt_table is True or self.rt_json is not None:
+            if isinstance(records, list) and self.lbnldevice is not None:
+                records = lbnl_records(records)
+            self.rt_index = ResourceIndex(functools.partial(self.fill_resource, count=False))
+            records = self.rt_index.collect(records)
+        if self.device is not None:
+            with self.stats.phase("device table"):
+                self.resources_per_device(records)
+        if self.lbnldevice is not None:
+            with self.stats.phase("lbnl device table"):
+                self.lbnl_resources_per_device(records)
+        if self.rt_index is not None:
+            if self.rt_table is True:
+                with self.stats.phase("resource type table"):
+                    self.resource_type_table()
+            if self.rt_json is not None:
+                with self.stats.phase("resource type json"):
+                    self.rt_index.write_json(self.rt_json)
+                print ("resource type index saved..", self.rt_json)
+        ### add here more conversions going forward..
+
+
+def add_lbnl_records(layout, records, vmerge=False, fill_resource=None, start_category=None):
+    """
+    lay out the rows of the lbnl table
+    the rows of a category do not depend on the rows of the other categories.
+    :param layout: TableLayout with the 6 columns of the lbnl table
+    :param records: iterable of lbnl records (see model.lbnl_records)
+    :param vmerge: merge the device cells vertically, and the category rows over the full width
+    :param fill_resource: function filling in the missing texts of a Resource, None is no filling
+    :param start_category: function called with the name of each category, before its rows
+    """
+    # with vmerge: the lbnl device cells are merged down over the rows of its existing devices
+    lnbl_row = None
+
+    def end_lbnl_device():
+        if vmerge is True and lnbl_row is not None and layout.row_count - 1 > lnbl_row:
+            layout.merge_down(0, lnbl_row, layout.row_count - 1)
+            layout.merge_down(1, lnbl_row, layout.row_count - 1)
+
+    for kind, record in records:
+        if kind == "category":
+            end_lbnl_device()
+            lnbl_row = None
+            if start_category is not None:
+                start_category(record.name)
+            cat_row = layout.add_row()
+            layout.start_group(cat_row)
+            layout.set_text(cat_row, 0, record.name, bold=True)
+            layout.merge(cat_row, 0, layout.cols - 1 if vmerge is True else 1)
+        elif kind == "lbnldevice":
+            end_lbnl_device()
+            lnbl_row = layout.add_row(record.name, record.comment)
+            layout.start_group(lnbl_row)
+            layout.set_text(lnbl_row, 3, record.rt)
+        else:
+            device_row = row = layout.add_row()
+            if vmerge is False or lnbl_row is None:
+                # with vmerge the device stays in the group of its lbnl device
+                layout.start_group(device_row)
+                layout.merge(row, 0, 1)
+            layout.set_text(row, 2, record.name)
+            layout.set_text(row, 3, record.type)
+            first = True
+            for resource in record.resources:
+                if fill_resource is not None:
+                    resource = fill_resource(resource)
+                if first is True:
+                    first = False
+                else:
+                    row = layout.add_row()
+                    if vmerge is False:
+                        layout.merge(row, 2, 3)
+                layout.set_text(row, 4, resource.title)
+                layout.set_text(row, 5, resource.rt)
+            if vmerge is True and row > device_row:
+                layout.merge_down(2, device_row, row)
+                layout.merge_down(3, device_row, row)
+    end_lbnl_device()
+
+
+def category_groups(records):
+    """
+    the lbnl records grouped per category
+    :param records: iterable of lbnl records (see model.lbnl_records)
+    :return: generator of (category name, list of records starting with the category record),
+             records before the first category are a group with name None
+    """
+    name = None
+    group = []
+    for kind, record in records:
+        if kind == "category":
+            if group:
+                yield name, group
+            name = record.name
+            group = []
+        group.append((kind, record))
+    if group:
+        yield name, group
+
+
+def render_lbnl_rows(records, vmerge, col_widths, paragraph_ids):
+    """
+    the rows of lbnl records as xml, runs in a worker process
+    :param records: list of lbnl records
+    :param vmerge: merge the device cells vertically, and the category rows over the full width
+    :param col_widths: column widths in twips (see ooxmlwriter.column_twips)
+    :param paragraph_ids: dict paragraph style name -> style id
+    :return: (list of w:tr xml strings, dict of the row, cell and merge counts)
+    """
+    from ocfdoc.ooxmlwriter import rows_xml_parts
+
+    layout = TableLayout(6)
+    add_lbnl_records(layout, records, vmerge)
+    stats = ConversionStats()
+    stats.count_layout(layout)
+    del stats.counters["tables"]
+    return list(rows_xml_parts(layout, col_widths, paragraph_ids)), stats.counters
+
+
+#
+#   main of script
+#
+def main():
+    """
+    command line interface
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument( "-ver"        , "--verbose"    , help="Execute in verbose mode", action='store_true')
+
+    parser.add_argument( "-device"    , "--device"    , default=None,
+                         help="device file name (json)",  nargs='?', const="", required=False)
+    parser.add_argument( "-lbnldevice"    , "--lbnldevice"    , default=None,
+                         help="lbln device file name (json)",  nargs='?', const="", required=False)
+    parser.add_argument( "-docx"       , "--docx"       , default=None,
+                         help="word file in",  nargs='?', const="", required=False)
+    parser.add_argument( "-word_out"   , "--word_out"   , default=None,
+                         help="word file out",  nargs='?', const="", required=False)
+    parser.add_argument( "-backend"    , "--backend"    , default="docx", choices=["docx", "xml"],
+                         help="table writer: docx (python-docx elements) or xml (serialised tables)", required=False)
+    parser.add_argument( "-col_widths" , "--col_widths" , default=None, nargs='+', type=parse_width,
+                         help="column widths of the device table (4) or the lbnl device table (6): "
+                              "length (30mm, 2cm, 1in, 72pt), percentage (25%%) or * (rest)",
+                         required=False)
+    parser.add_argument( "-template_cache", "--template_cache", default=None,
+                         help="directory to keep the (uncompressed) template for next runs", required=False)
+    parser.add_argument( "-stream"     , "--stream"     , help="read the device file record by record (large files)",
+                         action='store_true')
+    parser.add_argument( "-vmerge"     , "--vmerge"     ,
+                         help="merge device cells vertically over their resource rows, category rows over the full width",
+                         action='store_true')
+    parser.add_argument( "-jobs"       , "--jobs"       , default=1, type=int,
+                         help="worker processes rendering the categories of the lbnl table (same document)",
+                         required=False)
+    parser.add_argument( "-schemas"    , "--schemas"    , default=None,
+                         help="directory of the OCF resource type schemas, fills in missing resource titles/types",
+                         required=False)
+    parser.add_argument( "-schema_cache", "--schema_cache", default=None,
+                         help="directory to keep the resolved schemas for next runs (with -schemas)", required=False)
+    parser.add_argument( "-incremental", "--incremental", help="skip the conversion when nothing changed since the last run",
+                         action='store_true')
+    parser.add_argument( "-force"      , "--force"      , help="convert also when nothing changed (with -incremental)",
+                         action='store_true')
+    parser.add_argument( "-update"     , "--update"     , help="update the table rows of the existing word file out, "
+                                                               "keeping the other content", action='store_true')
+    parser.add_argument( "-rt_table"   , "--rt_table"   , help="add a table with per resource type the devices "
+                                                               "requiring it", action='store_true')
+    parser.add_argument( "-rt_json"    , "--rt_json"    , default=None,
+                         help="write the resource type -> devices index to this json file", required=False)
+    add_save_arguments(parser)
+    add_chunk_arguments(parser)
+    add_resident_arguments(parser)
+    add_stats_arguments(parser)
+
+    args = parser.parse_args()
+    # with -word_out - the document is written to stdout, all messages go to stderr
+    word_out = document_output(args.word_out)
+
+    print ("************************")
+    print ("*** device2doc (v1) ***")
+    print ("************************")
+
+
+    print("device file     : " + str(args.device))
+    print("lbnldevice file : " + str(args.lbnldevice))
+    print("docx            : " + str(args.docx))
+    print("word_out        : " + str(args.word_out))
+    print("backend         : " + str(args.backend))
+    print("schemas         : " + str(args.schemas))
+    print("")
+
+    if args.col_widths is not None and args.device is not None and args.lbnldevice is not None:
+        parser.error("-col_widths can not be used with both -device and -lbnldevice, the tables have "
+                     "4 and 6 columns")
+    if check_docx() is False:
+        return
+
+    stats = start_stats(args)
+    # the schema catalog, loaded before the first conversion
+    catalog = None
+
+    def convert(kind, input_name, stats=None):
+        worddoc = CreateWordDoc(backend=args.backend, stream=args.stream, stats=stats, vmerge=args.vmerge,
+                                jobs=args.jobs, **{kind: input_name})
+        worddoc.docx_name_in = args.docx
+        worddoc.docx_name_out = word_out
+        worddoc.template_cache_dir = args.template_cache
+        worddoc.incremental = args.incremental
+        worddoc.force = args.force
+        worddoc.update = args.update
+        worddoc.save_level = args.save_level
+        worddoc.catalog = catalog
+        worddoc.col_widths = args.col_widths
+        worddoc.chunk_rows = args.chunk_rows
+        worddoc.chunk_bytes = args.chunk_bytes
+        worddoc.chunk_documents = args.chunk_documents
+        worddoc.rt_table = args.rt_table
+        worddoc.rt_json = args.rt_json
+        return worddoc.convert()
+
+    # every requested input is watched, also when its first conversion fails
+    conversions = [(kind, input_name) for kind, input_name in (("device", args.device), ("lbnldevice", args.lbnldevice))
+                   if input_name is not None]
+    try:
+        if args.schemas is not None:
+            from ocfdoc.schemacache import ResourceCatalog
+            with stats.phase("load schemas"):
+                catalog = ResourceCatalog(args.schemas, args.schema_cache)
+
+        for kind, input_name in conversions:
+            convert(kind, input_name, stats)
+
+    except:
+        #print ("error in ", args.json)
+        traceback.print_exc()
+        pass
+    report_stats(stats, args)
+    if args.watch is True or args.serve is not None:
+        run_resident(args, [(input_name, functools.partial(convert, kind, input_name))
+                            for kind, input_name in conversions])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+semantic comparison of generated word documents
+
+a byte comparison of two docx files is useless: the zip entries have the time of the save.
+compare_docx compares the content of word/document.xml instead:
+- when the entries have the same crc and size (stored in the zip directory) the documents are the same,
+  without reading them,
+- otherwise document.xml is read from both packages (without extracting them) and canonicalised with an xslt
+  transformation (CANONICAL_XSLT, runs in libxslt): one record per paragraph, table and table row of the body,
+  with the styles, table layout and grid, and per cell the column span, vertical merge, paragraph styles, text
+  and bold. attributes that Word adds on save (revision ids, paragraph ids), run boundaries, proofing marks
+  and bookmarks are not part of the canonical form.
+- the records are compared in order, the first difference is reported with the paragraph or table, row and cell.
+"""
+
+import argparse
+import os
+import sys
+import zipfile
+
+from lxml import etree
+
+DOCUMENT = "word/document.xml"
+# separators of the canonical form, characters of the private use area that do not occur in generated documents
+RECORD = "\ue001"
+CELL = "\ue002"
+FIELD = "\ue003"
+PARAGRAPH = "\ue004"
+# names of the fields of a canonical cell (see cell_key)
+CELL_FIELDS = ("column span", "vertical merge", "paragraph styles", "text", "bold")
+
+CANONICAL_XSLT = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
+    xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <xsl:output method="text" encoding="utf-8"/>
+  <xsl:template match="/">
+    <xsl:for-each select="w:document/w:body/w:p | w:document/w:body/w:tbl">
+      <xsl:text>&#xE001;</xsl:text>
+      <xsl:choose>
+        <xsl:when test="self::w:p">
+          <xsl:text>paragraph&#xE003;</xsl:text>
+          <xsl:apply-templates select="." mode="paragraph"/>
+        </xsl:when>
+        <xsl:otherwise>
+          <xsl:text>table&#xE003;</xsl:text>
+          <xsl:value-of select="w:tblPr/w:tblStyle/@w:val"/>
+          <xsl:text>&#xE003;</xsl:text>
+          <xsl:value-of select="w:tblPr/w:tblLayout/@w:type"/>
+          <xsl:text>&#xE003;</xsl:text>
+          <xsl:for-each select="w:tblGrid/w:gridCol">
+            <xsl:value-of select="@w:w"/>
+            <xsl:text> </xsl:text>
+          </xsl:for-each>
+          <xsl:for-each select="w:tr">
+            <xsl:text>&#xE001;row</xsl:text>
+            <xsl:for-each select="w:tc">
+              <xsl:text>&#xE002;</xsl:text>
+              <xsl:value-of select="w:tcPr/w:gridSpan/@w:val"/>
+              <xsl:text>&#xE003;</xsl:text>
+              <xsl:if test="w:tcPr/w:vMerge">
+                <xsl:value-of select="w:tcPr/w:vMerge/@w:val"/>
+                <xsl:if test="not(w:tcPr/w:vMerge/@w:val)">continue</xsl:if>
+              </xsl:if>
+              <xsl:for-each select="w:p">
+                <xsl:text>&#xE003;</xsl:text>
+                <xsl:apply-templates select="." mode="paragraph"/>
+              </xsl:for-each>
+            </xsl:for-each>
+          </xsl:for-each>
+        </xsl:otherwise>
+      </xsl:choose>
+    </xsl:for-each>
+  </xsl:template>
+  <xsl:template match="w:p" mode="paragraph">
+    <xsl:value-of select="w:pPr/w:pStyle/@w:val"/>
+    <xsl:text>&#xE004;</xsl:text>
+    <xsl:if test="w:r[w:t != ''][w:rPr/w:b[not(@w:val = '0' or @w:val = 'false')]]">bold</xsl:if>
+    <xsl:text>&#xE004;</xsl:text>
+    <xsl:for-each select="w:r/w:t | w:r/w:tab | w:r/w:br | w:r/w:cr">
+      <xsl:choose>
+        <xsl:when test="self::w:t"><xsl:value-of select="."/></xsl:when>
+        <xsl:when test="self::w:tab"><xsl:text>&#9;</xsl:text></xsl:when>
+        <xsl:otherwise><xsl:text>&#10;</xsl:text></xsl:otherwise>
+      </xsl:choose>
+    </xsl:for-each>
+  </xsl:template>
+</xsl:stylesheet>
+"""
+# compiled CANONICAL_XSLT, see canonical_records
+_transform = None
+
+
+def canonical_records(docx_file):
+    """
+    the canonical form of the body of a document
+    :param docx_file: file name or binary file object of the docx
+    :return: list of records (text), one per paragraph, table and table row
+    """
+    global _transform
+    if _transform is None:
+        _transform = etree.XSLT(etree.XML(CANONICAL_XSLT.encode("utf-8")))
+    with zipfile.ZipFile(docx_file) as package:
+        with package.open(DOCUMENT) as xml:
+            document = etree.parse(xml)
+    return str(_transform(document)).split(RECORD)[1:]
+
+
+def paragraph_key(text):
+    """
+    :param text: canonical paragraph (style, bold, text)
+    :return: (style, text, bold), style None when not set
+    """
+    style, bold, text = text.split(PARAGRAPH, 2)
+    return style or None, text, bold == "bold"
+
+
+def cell_key(text):
+    """
+    :param text: canonical cell (span, vertical merge, paragraphs)
+    :return: tuple of the CELL_FIELDS
+    """
+    fields = text.split(FIELD)
+    paragraphs = [paragraph_key(paragraph) for paragraph in fields[2:]]
+    return (int(fields[0] or 1), fields[1] or None, tuple(style for style, _, _ in paragraphs),
+            "\n".join(text for _, text, _ in paragraphs), any(bold for _, _, bold in paragraphs))
+
+
+def record_key(record):
+    """
+    the canonical record as values, records with the same values are the same
+    :param record: canonical record
+    :return: ("paragraph", paragraph_key), ("table", (style, layout, grid)) or ("row", tuple of cell_key)
+    """
+    if record.startswith("row"):
+        return "row", tuple(cell_key(cell) for cell in record.split(CELL)[1:])
+    kind, fields = record.split(FIELD, 1)
+    if kind == "paragraph":
+        return kind, paragraph_key(fields)
+    style, layout, grid = fields.split(FIELD)
+    return kind, (style or None, layout or None, tuple(grid.split()))
+
+
+def same_entry(first, second):
+    """
+    :param first: file name or binary file object of a docx
+    :param second: file name or binary file object of a docx
+    :return: True when both document.xml entries have the same crc and size
+    """
+    infos = []
+    for docx_file in (first, second):
+        with zipfile.ZipFile(docx_file) as package:
+            infos.append(package.getinfo(DOCUMENT))
+        if hasattr(docx_file, "seek"):
+            docx_file.seek(0)
+    return infos[0].CRC == infos[1].CRC and infos[0].file_size == infos[1].file_size
+
+
+def location(records, index):
+    """
+    :param records: canonical records
+    :param index: index of a record
+    :return: name of the record in the report (paragraph 3, table 2, table 2, row 5)
+    """
+    counts = {"paragraph": 0, "table": 0}
+    row = 0
+    for record in records[:index + 1]:
+        if record.startswith("row"):
+            row += 1
+        else:
+            kind = record.split(FIELD, 1)[0]
+            counts[kind] += 1
+            row = 0
+    if row > 0:
+        return "table %d, row %d" % (counts["table"], row)
+    kind = records[index].split(FIELD, 1)[0]
+    return "%s %d" % (kind, counts[kind])
+
+
+def difference(name, first, second):
+    """
+    the first difference of two canonical records of the same kind
+    :param name: name of the record in the report
+    :param first: record_key
+    :param second: record_key
+    :return: text
+    """
+    kind = first[0]
+    if kind == "row":
+        for col, (first_cell, second_cell) in enumerate(zip(first[1], second[1]), 1):
+            for field, first_value, second_value in zip(CELL_FIELDS, first_cell, second_cell):
+                if first_value != second_value:
+                    return "%s, cell %d: %s %r != %r" % (name, col, field, first_value, second_value)
+        return "%s: %d cells != %d cells" % (name, len(first[1]), len(second[1]))
+    fields = ("style", "text", "bold") if kind == "paragraph" else ("style", "layout", "grid")
+    for field, first_value, second_value in zip(fields, first[1], second[1]):
+        if first_value != second_value:
+            return "%s: %s %r != %r" % (name, field, first_value, second_value)
+    return "%s: differs" % name
+
+
+def compare_docx(first, second):
+    """
+    compare the content of two documents
+    :param first: file name or binary file object of a docx
+    :param second: file name or binary file object of a docx
+    :return: text describing the first difference, None when the documents are the same
+    """
+    if same_entry(first, second):
+        return None
+    first_records = canonical_records(first)
+    second_records = canonical_records(second)
+    for index, (first_record, second_record) in enumerate(zip(first_records, second_records)):
+        if first_record == second_record:
+            continue
+        first_key = record_key(first_record)
+        second_key = record_key(second_record)
+        if first_key == second_key:
+            continue
+        name = location(first_records, index)
+        if first_key[0] != second_key[0]:
+            return "%s: %s != %s" % (name, first_key[0], second_key[0])
+        return difference(name, first_key, second_key)
+    if len(first_records) != len(second_records):
+        index = min(len(first_records), len(second_records))
+        if index < len(first_records):
+            return "%s: missing in the second document" % location(first_records, index)
+        return "%s: missing in the first document" % location(second_records, index)
+    return None
+
+
+def docx_pairs(first, second):
+    """
+    the documents to compare: two files, or the docx files in a directory (recursive) and the same names in the other
+    :param first: docx file or directory
+    :param second: docx file or directory
+    :return: list of (first file, second file)
+    """
+    if not os.path.isdir(first):
+        return [(first, second)]
+    pairs = []
+    for root, dirs, files in os.walk(first):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".docx") and not name.startswith("~$"):
+                relative = os.path.relpath(os.path.join(root, name), first)
+                pairs.append((os.path.join(first, relative), os.path.join(second, relative)))
+    return pairs
+
+
+#
+#   main of script
+#
+def main():
+    """
+    command line interface
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-ref", "--ref", required=True, help="reference docx, or directory with reference docx files")
+    parser.add_argument("-out", "--out", required=True, help="docx to check, or directory with the same file names")
+    args = parser.parse_args()
+
+    differences = 0
+    pairs = docx_pairs(args.ref, args.out)
+    for ref, out in pairs:
+        if not os.path.exists(out):
+            result = "missing"
+        else:
+            result = compare_docx(ref, out)
+        if result is not None:
+            differences += 1
+            print ("%s: %s" % (out, result))
+    print ("documents: %d, different: %d" % (len(pairs), differences))
+    if differences > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+fast save of a generated document
+
+document.save() re-serialises and re-deflates every part of the package, also the parts that are
+unchanged copies of the template (styles, theme, fonts, media, ..).
+save_document() writes the package with a minimal zip writer instead:
+- the parts that the document shares with the template snapshot (see templatecache.clone) are copied
+  as they are (still compressed) from the template zip,
+- the other parts (word/document.xml, its relationships, the content types, ..) are serialised and
+  deflated with the given level, 0 stores them uncompressed (e.g. for intermediate builds).
+the target can be a file name or a binary file object (io.BytesIO, sys.stdout.buffer): the zip is
+written sequentially, the target does not need to be seekable.
+"""
+
+import io
+import struct
+import zipfile
+import zlib
+
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+# 1980-01-01 00:00 in dos date/time, the generated entries do not depend on the time of the build
+DOS_DATE = (1 << 5) | 1
+DOS_TIME = 0
+UTF8_NAMES = 0x800
+
+
+class ZipWriter(object):
+    def __init__(self, stream):
+        """
+        minimal sequential zip writer, without data descriptors and zip64
+        :param stream: binary file object to write to
+        """
+        self.stream = stream
+        self.offset = 0
+        # central directory entries
+        self.entries = []
+
+    def add(self, name, method, crc, compressed, size, date_time=(DOS_DATE, DOS_TIME)):
+        """
+        write an entry
+        :param name: member name
+        :param method: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+        :param crc: crc32 of the uncompressed data
+        :param compressed: the (compressed) data as stored in the zip
+        :param size: size of the uncompressed data
+        :param date_time: (dos date, dos time)
+        """
+        if self.offset + len(compressed) > 0xFFFFFFFF or size > 0xFFFFFFFF or len(self.entries) >= 0xFFFF:
+            raise ValueError("document too large for the fast save, use document.save()")
+        encoded_name = name.encode("utf-8")
+        flags = 0 if encoded_name == name.encode("ascii", "replace") else UTF8_NAMES
+        dos_date, dos_time = date_time
+        header = LOCAL_HEADER.pack(b"PK\x03\x04", 20, flags, method, dos_time, dos_date,
+                                   crc, len(compressed), size, len(encoded_name), 0)
+        self.entries.append(CENTRAL_HEADER.pack(b"PK\x01\x02", 20, 20, flags, method, dos_time, dos_date,
+                                                crc, len(compressed), size, len(encoded_name), 0, 0, 0, 0,
+                                                0, self.offset) + encoded_name)
+        self.stream.write(header)
+        self.stream.write(encoded_name)
+        self.stream.write(compressed)
+        self.offset += len(header) + len(encoded_name) + len(compressed)
+
+    def write(self, name, data, level):
+        """
+        compress and write an entry
+        :param name: member name
+        :param data: uncompressed data (bytes)
+        :param level: deflate level 1-9, 0 stores the data
+        """
+        if level == 0:
+            self.add(name, zipfile.ZIP_STORED, zlib.crc32(data), data, len(data))
+            return
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        self.add(name, zipfile.ZIP_DEFLATED, zlib.crc32(data), compressed, len(data))
+
+    def close(self):
+        """
+        write the central directory
+        :return: number of bytes written
+        """
+        directory = b"".join(self.entries)
+        self.stream.write(directory)
+        self.stream.write(END_RECORD.pack(b"PK\x05\x06", 0, 0, len(self.entries), len(self.entries),
+                                          len(directory), self.offset, 0))
+        return self.offset + len(directory) + END_RECORD.size
+
+
+class SourceZip(object):
+    def __init__(self, data):
+        """
+        the entries of a zip in memory, to copy them without inflating
+        :param data: content of the zip file (bytes)
+        """
+        self.data = data
+        with zipfile.ZipFile(io.BytesIO(data)) as source:
+            self.infos = dict((info.filename, info) for info in source.infolist())
+
+    def raw(self, name):
+        """
+        the stored (compressed) data of an entry
+        :param name: member name
+        :return: (zip info, compressed bytes), None when the entry is missing or can not be copied
+        """
+        info = self.infos.get(name)
+        if info is None or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or \
+                info.flag_bits & 0x1:
+            return None
+        header = LOCAL_HEADER.unpack_from(self.data, info.header_offset)
+        start = info.header_offset + LOCAL_HEADER.size + header[9] + header[10]
+        return info, self.data[start:start + info.compress_size]
+
+    def copy(self, writer, name):
+        """
+        copy an entry to the writer, as it is stored
+        :param writer: ZipWriter
+        :param name: member name
+        :return: True when copied, False when the entry is not available
+        """
+        raw = self.raw(name)
+        if raw is None:
+            return False
+        info, compressed = raw
+        year, month, day, hour, minute, second = info.date_time
+        dos_date = max(year - 1980, 0) << 9 | month << 5 | day
+        dos_time = hour << 11 | minute << 5 | second // 2
+        writer.add(name, info.compress_type, info.CRC, compressed, info.file_size, (dos_date, dos_time))
+        return True
+
+
+def save_document(document, target, level=6, source=None, template=None, stats=None):
+    """
+    save the document, with the same parts in the same order as document.save()
+    :param document: python-docx document
+    :param target: file name or binary file object
+    :param level: deflate level of the written parts 1-9, 0 stores them uncompressed
+    :param source: SourceZip of the template, None writes all parts
+    :param template: the template snapshot document, its parts that the document shares are copied from source
+    :param stats: ConversionStats, counts the bytes written and the copied and written parts
+    :return: number of bytes written
+    """
+    from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from docx.opc.pkgwriter import _ContentTypesItem
+
+    package = document.part.package
+    parts = list(package.iter_parts())
+    shared = set()
+    if source is not None and template is not None:
+        template_parts = set(id(part) for part in template.part.package.iter_parts())
+        shared = set(id(part) for part in parts if id(part) in template_parts and part is not document.part)
+
+    if isinstance(target, str):
+        with open(target, "wb") as stream:
+            return save_document(document, stream, level, source, template, stats)
+
+    copied = 0
+    writer = ZipWriter(target)
+    writer.write(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob, level)
+    writer.write(PACKAGE_URI.rels_uri.membername, package.rels.xml, level)
+    for part in parts:
+        names = [part.partname.membername]
+        if len(part.rels):
+            names.append(part.partname.rels_uri.membername)
+        if id(part) in shared and all(source.raw(name) is not None for name in names):
+            for name in names:
+                source.copy(writer, name)
+            copied += len(names)
+            continue
+        writer.write(names[0], part.blob, level)
+        if len(part.rels):
+            writer.write(names[1], part.rels.xml, level)
+    written = writer.close()
+    if stats is not None:
+        stats.count("bytes written", written)
+        stats.count("copied parts", copied)
+        stats.count("written parts", len(writer.entries) - copied)
+    return written
@@ -0,0 +1,224 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+enum2doc: word table of the standardized enumerations
+"""
+
+import argparse
+import traceback
+
+from ocfdoc.core import CreateWordDocBase, add_chunk_arguments, add_resident_arguments, add_save_arguments, \
+    add_stats_arguments, check_docx, document_output, report_stats, run_resident, start_stats
+from ocfdoc.fragments import SEQ_TABLE, SEQ_TABLE_ANNEX, fragments
+from ocfdoc.jsonstream import iter_enumerations
+from ocfdoc.styles import PARAGRAPH, TABLE
+from ocfdoc.tablelayout import TableLayout, WIDTH_UNITS, parse_width
+
+
+class CreateWordDoc(CreateWordDocBase):
+    input_encoding = 'UTF8'
+
+    def __init__(self, enum=None, docx_name_in=None, docx_name_out=None, stream=False, stats=None, backend="docx"):
+        """
+        initialize the class
+        :param stream: read the enumeration file record by record during the conversion,
+                       instead of parsing the whole file here
+        :param stats: ConversionStats that records the phases, None creates one
+        :param backend: table writer, "docx" (python-docx elements) or "xml" (serialised w:tbl)
+
+        """
+        # initialise the variable
+        self.enum = enum
+        self.enum_filename = enum
+        self.annex_switch = False
+        CreateWordDocBase.__init__(self, enum, docx_name_in=docx_name_in, docx_name_out=docx_name_out,
+                                   stream=stream, stats=stats, backend=backend)
+
+    def read_records(self, input_file):
+        """
+        the enumerations of the file, used when streaming
+        :param input_file: file object opened in text mode
+        :return: the enumeration objects (see jsonstream)
+        """
+        return iter_enumerations(input_file)
+
+    def build_options(self):
+        """
+        the options that change the generated document, recorded for incremental builds
+        :return: dict
+        """
+        options = {"kind": "enum", "annex": self.annex_switch}
+        if self.col_widths is not None:
+            options["col_widths"] = self.col_widths
+        if self.chunked():
+            options["chunks"] = [self.chunk_rows, self.chunk_bytes, self.chunk_documents]
+        return options
+
+    def required_styles(self):
+        """
+        the styles used by the enumeration section
+        :return: dict style name -> kind
+        """
+        styles = {'PARAGRAPH': PARAGRAPH, 'TABLE-title': PARAGRAPH,
+                  'TABLE-A': TABLE, 'TABLE-col-heading': PARAGRAPH, 'TABLE-cell': PARAGRAPH}
+        if self.annex_switch is True:
+            styles['ANNEX-heading2'] = PARAGRAPH
+        else:
+            styles['Heading 2'] = PARAGRAPH
+        return styles
+
+    def enumerationdescriptions(self, parse_tree):
+        """
+        list all enumerations as a dashed list.
+        :param parse_tree: json parse_tree of the enumeration set, or the records of jsonstream.iter_enumerations
+        """
+        # Add L2 Heading and lead in paragraphs, stamped from the fragment library
+        styles = self.styles
+        heading_style = 'ANNEX-heading2' if self.annex_switch is True else 'Heading 2'
+        self.add_fragment(fragments.paragraph('Alphabetical list of standardized enumeration types',
+                                              styles.style_id(heading_style)))
+        self.add_fragment(fragments.paragraph('<Table Reference Here> lists the standardized enumeration types that may be present within Resource Properties where the Property is defined as containing values from this clause. The enumerations also apply to Semantic Tags where the tag is defined as containing values from this clause.',
+                                              styles.style_id('PARAGRAPH')))
+
+        # create the caption: 'Table ', the table number (SEQ field) and the title, repeated for each chunk
+        instruction = SEQ_TABLE_ANNEX if self.annex_switch is True else SEQ_TABLE
+        caption = ('Table ', ' – The defined set of standardized enumerations', instruction, 'TABLE-title')
+        self.add_fragment(fragments.caption(caption[0], caption[1], instruction, styles.style_id(caption[3])))
+
+        # the first column is 30 mm wide, written once in the table grid
+        layout = TableLayout(2, style='TABLE-A')
+        layout.set_widths([30 * WIDTH_UNITS["mm"], None], autofit=True)
+        layout.cell_style = 'TABLE-cell'
+        header_row = layout.add_row('Enumeration', 'Description')
+        layout.set_row_style(header_row, 'TABLE-col-heading')
+        layout.header_rows = 1
+
+        if isinstance(parse_tree, dict):
+            enumerationlist = parse_tree["supportedenumerations"]
+        else:
+            enumerationlist = parse_tree
+
+        # Add the enumerations plus descriptions to the created Table
+        for enumerationobject in enumerationlist:
+            for enumname,enumdesc in enumerationobject.items():
+                layout.add_row(enumname, enumdesc)
+
+        self.tableAttribute = self.write_table(layout, caption)
+
+    def generate(self):
+        """
+        generate the enumeration table
+        """
+        if self.enum is not None:
+            with self.stats.phase("enumeration table"):
+                self.enumerationdescriptions(self.input_records())
+        ### add here more conversions going forward..
+
+
+#
+#   main of script
+#
+def main():
+    """
+    command line interface
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument( "-ver", "--verbose", help="Execute in verbose mode", action='store_true')
+
+    parser.add_argument( "-enum", "--enum", default=None, help="enumeration file name (json)",  nargs='?', const="", required=False)
+    parser.add_argument( "-docx", "--docx", default=None, help="word file in",  nargs='?', const="", required=False)
+    parser.add_argument( "-word_out", "--word_out", default=None, help="word file out",  nargs='?', const="", required=False)
+    parser.add_argument("-annex", "--annex", default=None, help="uses a annex heading instead of normal heading (--annex true)")
+    parser.add_argument("-backend", "--backend", default="docx", choices=["docx", "xml"], help="table writer: docx (python-docx elements) or xml (serialised tables)")
+    parser.add_argument("-col_widths", "--col_widths", default=None, nargs='+', type=parse_width, help="column widths of the table: length (30mm, 2cm, 1in, 72pt), percentage (25%%) or * (rest), default 30mm *")
+    parser.add_argument("-template_cache", "--template_cache", default=None, help="directory to keep the (uncompressed) template for next runs")
+    parser.add_argument("-stream", "--stream", help="read the enumeration file record by record (large files)", action='store_true')
+    parser.add_argument("-incremental", "--incremental", help="skip the conversion when nothing changed since the last run", action='store_true')
+    parser.add_argument("-force", "--force", help="convert also when nothing changed (with -incremental)", action='store_true')
+    parser.add_argument("-update", "--update", help="update the table rows of the existing word file out, keeping the other content", action='store_true')
+    add_save_arguments(parser)
+    add_chunk_arguments(parser)
+    add_resident_arguments(parser)
+    add_stats_arguments(parser)
+
+    args = parser.parse_args()
+    # with -word_out - the document is written to stdout, all messages go to stderr
+    word_out = document_output(args.word_out)
+
+    print ("************************")
+    print ("*** enum2doc (v1) ****")
+    print ("************************")
+
+
+    print("enum file     : " + str(args.enum))
+    print("docx            : " + str(args.docx))
+    print("word_out        : " + str(args.word_out))
+    print("annex       : " + str(args.annex))
+
+    print("")
+
+    if check_docx() is False:
+        return
+
+    stats = start_stats(args)
+
+    def convert(stats=None):
+        worddoc = CreateWordDoc(enum=args.enum, stream=args.stream, stats=stats, backend=args.backend)
+        worddoc.docx_name_in = args.docx
+        worddoc.docx_name_out = word_out
+        worddoc.template_cache_dir = args.template_cache
+        worddoc.incremental = args.incremental
+        worddoc.force = args.force
+        worddoc.update = args.update
+        worddoc.save_level = args.save_level
+        worddoc.col_widths = args.col_widths
+        worddoc.chunk_rows = args.chunk_rows
+        worddoc.chunk_bytes = args.chunk_bytes
+        worddoc.chunk_documents = args.chunk_documents
+
+        annex_switch = args.annex
+        if annex_switch is None:
+            annex_switch = False
+        else:
+            annex_switch = True
+
+        worddoc.annex_switch = annex_switch
+
+        return worddoc.convert()
+
+    try:
+        if args.enum is not None:
+            convert(stats)
+    except:
+        #print ("error in ", args.json)
+        traceback.print_exc()
+        pass
+    report_stats(stats, args)
+    if args.watch is True or args.serve is not None:
+        run_resident(args, [(args.enum, convert)] if args.enum is not None else [])
+
+
+if __name__ == '__main__':
+    main()
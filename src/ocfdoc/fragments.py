@@ -0,0 +1,177 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+library of the recurring xml fragments of the generated documents
+
+every document (and every table of a document) gets the same structures: the table captions with their
+SEQ field, the header rows of the tables, fixed paragraphs such as the headings and the LBNL attribution.
+building them with python-docx (add_paragraph, add_run, an OxmlElement per w:fldChar, cell by cell) repeats
+the same python work for every instance.
+FragmentLibrary serialises and parses each distinct fragment once per process and stamps in copies
+(deepcopy of the parsed element, copied by libxml2). a fragment is keyed on all of its content (texts,
+style ids, column widths), so fragments of other templates or options are separate entries.
+the stamped xml is the same as python-docx writes (the serialisation of ooxmlwriter).
+the xml backend writes its tables as strings, its header rows are not stamped.
+"""
+
+from copy import deepcopy
+from itertools import islice
+
+# field instructions of the table captions
+SEQ_TABLE = ' SEQ Table \\* ARABIC'
+SEQ_TABLE_ANNEX = ' SEQ Table-Annex \\* ARABIC  \\s 9 '
+# the run of a field, the number is calculated by Word
+FIELD_XML = ('<w:r><w:fldChar w:fldCharType="begin"/><w:instrText>%s</w:instrText>'
+             '<w:fldChar w:fldCharType="end"/></w:r>')
+
+
+class FragmentLibrary(object):
+    def __init__(self):
+        """
+        initialize the library, the fragments are parsed on first use
+        """
+        # key -> parsed fragment
+        self.elements = {}
+
+    def stamp(self, key, build):
+        """
+        a copy of a fragment
+        :param key: hashable key with all the content of the fragment
+        :param build: function returning the xml string of the fragment, called once per key
+        :return: copy of the parsed fragment (python-docx element classes)
+        """
+        element = self.elements.get(key)
+        if element is None:
+            from docx.oxml import parse_xml
+
+            element = self.elements[key] = parse_xml(build())
+        return deepcopy(element)
+
+    def paragraph(self, text, style_id=None):
+        """
+        a paragraph with a text, the same as document.add_paragraph(text) with the style applied
+        :param text: text of the paragraph, None for an empty paragraph
+        :param style_id: paragraph style id, None for no style
+        :return: w:p element
+        """
+        from ocfdoc.ooxmlwriter import paragraph_xml, ppr_xml
+
+        return self.stamp(("paragraph", text, style_id), lambda: with_namespace(
+            paragraph_xml(text, False, ppr_xml(style_id))))
+
+    def caption(self, label, title, instruction=SEQ_TABLE, style_id=None):
+        """
+        a caption paragraph: the label, the SEQ field and the title
+        :param label: text before the number (e.g. 'Table ')
+        :param title: text after the number (e.g. ' – The defined set of ..')
+        :param instruction: field instruction of the number (SEQ_TABLE, SEQ_TABLE_ANNEX)
+        :param style_id: paragraph style id, None for no style
+        :return: w:p element
+        """
+        # xml.sax.saxutils imports urllib, loaded only when a document is generated (see bench_startup)
+        from xml.sax.saxutils import escape
+
+        from ocfdoc.ooxmlwriter import ppr_xml, text_xml
+
+        return self.stamp(("caption", label, title, instruction, style_id), lambda: with_namespace(
+            '<w:p>%s<w:r>%s</w:r>%s<w:r>%s</w:r></w:p>' % (
+                ppr_xml(style_id), text_xml(label), FIELD_XML % escape(instruction), text_xml(title))))
+
+    def header_rows(self, layout, col_widths, paragraph_ids):
+        """
+        the header rows of a table layout (the first layout.header_rows rows)
+        :param layout: TableLayout
+        :param col_widths: column widths in twips (see ooxmlwriter.column_twips)
+        :param paragraph_ids: dict paragraph style name -> style id of the paragraph styles of the layout
+        :return: list of w:tr elements
+        """
+        from docx.oxml.ns import nsdecls
+        from ocfdoc.ooxmlwriter import rows_xml_parts
+
+        rows = range(layout.header_rows)
+        key = ("header rows", tuple(tuple(layout.rows[row]) for row in rows),
+               tuple(sorted(cell for cell in layout.bold if cell[0] in rows)),
+               tuple(tuple(layout.merges.get(row, ())) for row in rows),
+               tuple(sorted(cell for cell in layout.vmerges.items() if cell[0][0] in rows)),
+               tuple(paragraph_ids.get(layout.paragraph_style(row)) for row in rows), tuple(col_widths))
+        tbl = self.stamp(key, lambda: '<w:tbl %s>%s</w:tbl>' % (
+            nsdecls('w'), "".join(islice(rows_xml_parts(layout, col_widths, paragraph_ids), layout.header_rows))))
+        return list(tbl)
+
+
+def seq_identifier(instruction):
+    """
+    :param instruction: field instruction (e.g. SEQ_TABLE)
+    :return: the identifier of a SEQ field (e.g. 'Table'), None for other fields
+    """
+    words = instruction.split()
+    if len(words) > 1 and words[0].upper() == "SEQ":
+        return words[1]
+    return None
+
+
+def count_seq_fields(element, instruction):
+    """
+    the number of SEQ fields with the identifier of an instruction, e.g. the captions numbered before a table
+    :param element: element to search (e.g. the document body)
+    :param instruction: field instruction (e.g. SEQ_TABLE)
+    :return: number of fields
+    """
+    from docx.oxml.ns import qn
+
+    identifier = seq_identifier(instruction)
+    count = 0
+    for field in element.iter(qn("w:instrText"), qn("w:fldSimple")):
+        text = field.text if field.tag == qn("w:instrText") else field.get(qn("w:instr"))
+        if text is not None and seq_identifier(text) == identifier:
+            count += 1
+    return count
+
+
+def reset_instruction(instruction, number):
+    """
+    a SEQ field instruction that numbers the field with number (switch \\r),
+    e.g. a caption continuing the numbering of a previous document
+    :param instruction: field instruction (e.g. SEQ_TABLE)
+    :param number: number of the field
+    :return: field instruction
+    """
+    return '%s \\r %d ' % (instruction.rstrip(), number)
+
+
+def with_namespace(xml):
+    """
+    :param xml: xml string of an element with the w: prefix, without namespace declaration
+    :return: the xml with the namespace declaration on the element
+    """
+    from docx.oxml.ns import nsdecls
+
+    tag, _, rest = xml.partition('>')
+    if tag.endswith('/'):
+        return '%s %s/>%s' % (tag[:-1], nsdecls('w'), rest)
+    return '%s %s>%s' % (tag, nsdecls('w'), rest)
+
+
+# the fragments of this process
+fragments = FragmentLibrary()
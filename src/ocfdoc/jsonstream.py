@@ -0,0 +1,258 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+streaming reader for device, lbnl device and enumeration files
+
+the input is read in chunks and the records are yielded one at a time, so that the complete
+json tree is never in memory. the structure (arrays, objects, keys) is scanned here,
+each record (e.g. a device with its resources) is decoded at once with json raw_decode.
+
+records of a device file (test/in/test_1/device.json):
+    iter_devices(fp) yields the device dicts
+records of an lbnl device file (test/in/test_2/device.json):
+    iter_lbnl_records(fp) yields ("category", category), ("lbnldevice", lbnl device), ("device", device)
+    in document order, the category and lbnl device dicts without their "devices"/"exising" lists.
+records of an enumeration file:
+    iter_enumerations(fp) yields the objects of "supportedenumerations"
+"""
+
+import json
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonStream(object):
+    def __init__(self, fp, chunk_size=1 << 16):
+        """
+        initialize the stream
+        :param fp: file object opened in text mode
+        :param chunk_size: number of characters read at once
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size=None):
+        """
+        read the next chunk, consumed characters are dropped from the buffer
+        :param size: number of characters to read, default the chunk size
+        :return: False at the end of the file
+        """
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        the next character that is not whitespace, without consuming it
+        :return: character, "" at the end of the file
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def next_char(self):
+        """
+        consume the next character that is not whitespace
+        :return: character, "" at the end of the file
+        """
+        char = self.peek()
+        self.pos += len(char)
+        return char
+
+    def expect(self, expected):
+        """
+        consume the next character, that must be the expected one
+        :param expected: character
+        """
+        char = self.next_char()
+        if char != expected:
+            raise ValueError("json stream: expected %r, found %r" % (expected, char or "end of file"))
+
+    def read_value(self):
+        """
+        decode the next json value (object, array, string, ..)
+        when the value is not complete in the buffer, more is read and it is decoded again.
+        the read size grows with the buffer, so large values are still read in linear time.
+        :return: python value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number or literal at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def array_items(self):
+        """
+        iterate over the items of the next array
+        the stream is positioned at each item, the caller must consume the item before the next iteration.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.next_char()
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("json stream: expected ',' or ']', found %r" % (char or "end of file"))
+
+    def object_items(self):
+        """
+        iterate over the keys of the next object
+        the stream is positioned at the value of each key, the caller must consume the value before the next iteration.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            char = self.next_char()
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError("json stream: expected ',' or '}', found %r" % (char or "end of file"))
+
+
+def iter_devices(fp):
+    """
+    the devices of a device file, one at a time
+    :param fp: file object opened in text mode
+    """
+    stream = JsonStream(fp)
+    for _ in stream.array_items():
+        yield stream.read_value()
+
+
+def lbnl_device_records(stream):
+    """
+    records of one lbnl device, the devices in "exising" are streamed when the
+    name, rt and comment are before "exising" in the file, otherwise the list is read at once.
+    :param stream: JsonStream positioned at the lbnl device object
+    """
+    lbnldevice = {}
+    existing = None
+    for key in stream.object_items():
+        if key == "exising" and {"name", "rt", "comment"} <= set(lbnldevice):
+            yield ("lbnldevice", lbnldevice)
+            lbnldevice = None
+            for _ in stream.array_items():
+                yield ("device", stream.read_value())
+        elif key == "exising":
+            existing = stream.read_value()
+        else:
+            value = stream.read_value()
+            if lbnldevice is not None:
+                lbnldevice[key] = value
+    if lbnldevice is not None:
+        yield ("lbnldevice", lbnldevice)
+        for device_data in existing or []:
+            yield ("device", device_data)
+
+
+def lbnl_category_records(stream):
+    """
+    records of one category, the lbnl devices are streamed when "category" is before "devices"
+    :param stream: JsonStream positioned at the category object
+    """
+    category = {}
+    devices = None
+    for key in stream.object_items():
+        if key == "devices" and "category" in category:
+            yield ("category", category)
+            category = None
+            for _ in stream.array_items():
+                for record in lbnl_device_records(stream):
+                    yield record
+        elif key == "devices":
+            devices = stream.read_value()
+        else:
+            value = stream.read_value()
+            if category is not None:
+                category[key] = value
+    if category is not None:
+        for record in lbnl_records([dict(category, devices=devices or [])]):
+            yield record
+
+
+def iter_lbnl_records(fp):
+    """
+    the records of an lbnl device file, one at a time
+    :param fp: file object opened in text mode
+    """
+    stream = JsonStream(fp)
+    for _ in stream.array_items():
+        for record in lbnl_category_records(stream):
+            yield record
+
+
+def lbnl_records(parse_tree):
+    """
+    the records of an lbnl device file that is already parsed, the same records as iter_lbnl_records()
+    :param parse_tree: json parse_tree of the lbnl device file
+    """
+    for category in parse_tree:
+        yield ("category", dict((key, value) for key, value in category.items() if key != "devices"))
+        for lnbldevice in category["devices"]:
+            yield ("lbnldevice", dict((key, value) for key, value in lnbldevice.items() if key != "exising"))
+            for device_data in lnbldevice["exising"]:
+                yield ("device", device_data)
+
+
+def iter_enumerations(fp):
+    """
+    the enumeration objects of "supportedenumerations" of an enumeration file, one at a time
+    :param fp: file object opened in text mode
+    """
+    stream = JsonStream(fp)
+    for key in stream.object_items():
+        if key == "supportedenumerations":
+            for _ in stream.array_items():
+                yield stream.read_value()
+        else:
+            stream.read_value()
@@ -0,0 +1,223 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+compact record model of the device files
+
+json.loads gives a dict per device and per resource, and a separate string object for every
+occurrence of a resource type id or title, although the same few resources are listed by thousands of devices.
+ModelBuilder builds the model while the json is decoded (object_hook), so the dicts are never all alive at once:
+- Category, LbnlDevice, Device and Resource are __slots__ classes,
+- all texts are interned (one string object per distinct text),
+- a resource is created once per (title, resource type id) and shared by all devices listing it.
+the model is read only: resources are shared, a changed resource is a new Resource (see ModelBuilder.resource).
+"""
+
+import json
+
+
+class Resource(object):
+    __slots__ = ("title", "rt")
+
+    def __init__(self, title, rt):
+        """
+        a resource of a device
+        :param title: resourcetypetitle, None when missing
+        :param rt: resourcetypeid, None when missing
+        """
+        self.title = title
+        self.rt = rt
+
+    def as_dict(self):
+        """
+        :return: resource dict as in the device file
+        """
+        data = {}
+        if self.title is not None:
+            data["resourcetypetitle"] = self.title
+        if self.rt is not None:
+            data["resourcetypeid"] = self.rt
+        return data
+
+
+class Device(object):
+    __slots__ = ("name", "type", "resources")
+
+    def __init__(self, name, type, resources):
+        """
+        a device (-device input, "exising" devices of the lbnl input)
+        :param name: devicename
+        :param type: devicetype
+        :param resources: tuple of Resource
+        """
+        self.name = name
+        self.type = type
+        self.resources = resources
+
+
+class LbnlDevice(object):
+    __slots__ = ("name", "comment", "rt", "devices")
+
+    def __init__(self, name, comment, rt, devices):
+        """
+        a device of the lbnl input
+        :param name: name
+        :param comment: comment
+        :param rt: rt
+        :param devices: tuple of the existing Device ("exising")
+        """
+        self.name = name
+        self.comment = comment
+        self.rt = rt
+        self.devices = devices
+
+
+class Category(object):
+    __slots__ = ("name", "devices")
+
+    def __init__(self, name, devices):
+        """
+        a category of the lbnl input
+        :param name: category
+        :param devices: tuple of LbnlDevice
+        """
+        self.name = name
+        self.devices = devices
+
+
+class ModelBuilder(object):
+    def __init__(self):
+        """
+        initialize the builder, the interned texts and shared resources are kept per builder
+        """
+        self.texts = {}
+        # (title, rt) -> Resource
+        self.resources = {}
+
+    def text(self, value):
+        """
+        :param value: json value
+        :return: the interned text, other values as they are
+        """
+        if isinstance(value, str):
+            return self.texts.setdefault(value, value)
+        return value
+
+    def resource(self, data):
+        """
+        :param data: resource dict (resourcetypetitle, resourcetypeid)
+        :return: the shared Resource
+        """
+        key = (data.get("resourcetypetitle"), data.get("resourcetypeid"))
+        resource = self.resources.get(key)
+        if resource is None:
+            resource = self.resources[key] = Resource(self.text(key[0]), self.text(key[1]))
+        return resource
+
+    def device(self, data):
+        """
+        :param data: device dict (devicename, devicetype, resources)
+        :return: Device
+        """
+        resources = tuple(self.resource(resource) if isinstance(resource, dict) else resource
+                          for resource in data.get("resources", ()))
+        return Device(self.text(data["devicename"]), self.text(data["devicetype"]), resources)
+
+    def lbnl_device(self, data):
+        """
+        :param data: lbnl device dict (name, comment, rt, exising), exising is missing in streamed records
+        :return: LbnlDevice
+        """
+        devices = tuple(self.device(device) if isinstance(device, dict) else device
+                        for device in data.get("exising", ()))
+        return LbnlDevice(self.text(str(data["name"])), self.text(str(data["comment"])), self.text(str(data["rt"])),
+                          devices)
+
+    def category(self, data):
+        """
+        :param data: category dict (category, devices), devices is missing in streamed records
+        :return: Category
+        """
+        devices = tuple(self.lbnl_device(device) if isinstance(device, dict) else device
+                        for device in data.get("devices", ()))
+        return Category(self.text(data["category"]), devices)
+
+    def object_hook(self, data):
+        """
+        json object_hook: the objects of the device files as model objects, other objects as dicts
+        :param data: decoded json object
+        :return: model object or dict
+        """
+        if "resourcetypeid" in data or "resourcetypetitle" in data:
+            return self.resource(data)
+        if "devicename" in data:
+            return self.device(data)
+        if "exising" in data:
+            return self.lbnl_device(data)
+        if "category" in data:
+            return self.category(data)
+        return data
+
+    def loads(self, text):
+        """
+        decode a device or lbnl device file into the model
+        :param text: json text
+        :return: list of Device or list of Category
+        """
+        return json.loads(text, object_hook=self.object_hook)
+
+    def record(self, kind, data):
+        """
+        a streamed record (see jsonstream.iter_lbnl_records) as model object
+        :param kind: "category", "lbnldevice" or "device"
+        :param data: record dict
+        :return: Category (without devices), LbnlDevice (without devices) or Device
+        """
+        if kind == "category":
+            return self.category(data)
+        if kind == "lbnldevice":
+            return self.lbnl_device(data)
+        return self.device(data)
+
+    def records(self, records):
+        """
+        the streamed records as model objects
+        :param records: iterable of (kind, record dict)
+        :return: generator of (kind, model object)
+        """
+        for kind, data in records:
+            yield kind, self.record(kind, data)
+
+
+def lbnl_records(categories):
+    """
+    the records of the model of an lbnl device file, in the order of jsonstream.lbnl_records
+    :param categories: list of Category
+    :return: generator of ("category", Category), ("lbnldevice", LbnlDevice), ("device", Device)
+    """
+    for category in categories:
+        yield ("category", category)
+        for lbnl_device in category.devices:
+            yield ("lbnldevice", lbnl_device)
+            for device in lbnl_device.devices:
+                yield ("device", device)
@@ -0,0 +1,240 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+direct OOXML table writer
+
+serialises a complete w:tbl element from a TableLayout, parses it (incrementally, row by row)
+and inserts it in the document body at once.
+no python-docx table, row, cell or run objects are created.
+the produced xml is the same as the python-docx based write_table() produces.
+"""
+
+import re
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from docx.oxml.ns import nsdecls
+from docx.shared import Emu
+from docx.table import Table
+try:
+    from docx.oxml.parser import element_class_lookup
+except ImportError:
+    # python-docx < 1.0
+    from docx.oxml import element_class_lookup
+
+from ocfdoc.tablelayout import block_width, style_ids
+
+TBL_PR = ('<w:tblPr>%s<w:tblW w:type="auto" w:w="0"/>%s'
+          '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+          ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>')
+SPECIAL_CHARS = re.compile(r'([\t\r\n])')
+
+
+def t_xml(value):
+    """
+    w:t for a text without line breaks and tabs, preserving leading and trailing spaces
+    :param value: text
+    :return: xml string (w:t)
+    """
+    if len(value.strip()) < len(value):
+        return '<w:t xml:space="preserve">%s</w:t>' % escape(value)
+    return '<w:t>%s</w:t>' % escape(value)
+
+
+def text_xml(text):
+    """
+    the run content for a text, line breaks and tabs as w:br and w:tab like python-docx does
+    :param text: cell text
+    :return: xml string (content of w:r)
+    """
+    if SPECIAL_CHARS.search(text) is None:
+        return t_xml(text) if text else ''
+    parts = []
+    for value in SPECIAL_CHARS.split(text):
+        if value == "\t":
+            parts.append('<w:tab/>')
+        elif value in ("\r", "\n"):
+            parts.append('<w:br/>')
+        elif value:
+            parts.append(t_xml(value))
+    return "".join(parts)
+
+
+def paragraph_xml(text, bold=False, ppr=''):
+    """
+    the paragraph of a cell
+    :param text: cell text, None gives an empty paragraph
+    :param bold: text is a bold run
+    :param ppr: paragraph properties (w:pPr), see ppr_xml
+    :return: xml string (w:p)
+    """
+    if text is None:
+        return '<w:p>%s</w:p>' % ppr if ppr else '<w:p/>'
+    rpr = '<w:rPr><w:b/></w:rPr>' if bold is True else ''
+    content = text_xml(text)
+    if rpr == '' and content == '':
+        return '<w:p>%s<w:r/></w:p>' % ppr
+    return '<w:p>%s<w:r>%s%s</w:r></w:p>' % (ppr, rpr, content)
+
+
+def ppr_xml(style_id):
+    """
+    the paragraph properties for a paragraph style
+    :param style_id: style id, None for no style
+    :return: xml string (w:pPr), empty without style
+    """
+    if style_id is None:
+        return ''
+    return '<w:pPr><w:pStyle w:val="%s"/></w:pPr>' % escape(style_id, {'"': "&quot;"})
+
+
+def column_twips(layout, width):
+    """
+    the column widths of the layout in twips (the unit of w:gridCol and w:tcW)
+    :param layout: TableLayout
+    :param width: table width in EMU, distributed over the columns (see TableLayout.column_widths)
+    :return: list of twips, one per column
+    """
+    return [Emu(col_width).twips for col_width in layout.column_widths(width)]
+
+
+def table_start_xml(layout, col_widths, style_id=None):
+    """
+    the start of w:tbl: the table properties and the grid
+    :param layout: TableLayout
+    :param col_widths: column widths in twips (see column_twips)
+    :param style_id: style id of the table style, None for no style
+    :return: xml string
+    """
+    style = '' if style_id is None else '<w:tblStyle w:val="%s"/>' % escape(style_id, {'"': "&quot;"})
+    tbl_layout = ''
+    if layout.autofit is not None:
+        tbl_layout = '<w:tblLayout w:type="%s"/>' % ("autofit" if layout.autofit is True else "fixed")
+    return '<w:tbl %s>%s<w:tblGrid>%s</w:tblGrid>' % (nsdecls('w'), TBL_PR % (style, tbl_layout),
+                                                      "".join('<w:gridCol w:w="%d"/>' % col_width
+                                                              for col_width in col_widths))
+
+
+def table_xml_parts(layout, width, style_id=None, paragraph_ids=None, row_parts=()):
+    """
+    serialise the layout as w:tbl, piece by piece
+    :param layout: TableLayout
+    :param width: table width in EMU, distributed over the columns (see TableLayout.column_widths)
+    :param style_id: style id of the table style, None for no style
+    :param paragraph_ids: dict paragraph style name -> style id of the paragraph styles of the layout
+    :param row_parts: xml strings of more rows (see rows_xml_parts), after the rows of the layout
+    :return: generator of xml strings, one per row after the table properties
+    """
+    col_widths = column_twips(layout, width)
+    yield table_start_xml(layout, col_widths, style_id)
+    for part in rows_xml_parts(layout, col_widths, paragraph_ids):
+        yield part
+    for part in row_parts:
+        yield part
+    yield '</w:tbl>'
+
+
+def rows_xml_parts(layout, col_widths, paragraph_ids=None, rows=None):
+    """
+    serialise the rows of the layout, the rows do not depend on the other rows of the table:
+    a table can be assembled from the rows of several layouts (e.g. rendered in other processes)
+    :param layout: TableLayout
+    :param col_widths: column widths in twips (see column_twips)
+    :param paragraph_ids: dict paragraph style name -> style id of the paragraph styles of the layout
+    :param rows: the row indices to serialise, None for all the rows
+    :return: generator of xml strings (w:tr), one per row
+    """
+    paragraph_ids = paragraph_ids or {}
+
+    # the tcPr of each (merged) cell is the same for every row
+    tc_prs = {}
+    bold = layout.bold
+    vmerges = layout.vmerges
+    for row_index in range(len(layout.rows)) if rows is None else rows:
+        texts = layout.rows[row_index]
+        xml = ['<w:tr>']
+        ppr = ppr_xml(paragraph_ids.get(layout.paragraph_style(row_index)))
+        for first_col, last_col in layout.row_spans(row_index):
+            vmerge = vmerges.get((row_index, first_col))
+            tc_pr = tc_prs.get((first_col, last_col, vmerge))
+            if tc_pr is None:
+                span = last_col - first_col + 1
+                grid_span = '<w:gridSpan w:val="%d"/>' % span if span > 1 else ''
+                # "continue" is the default value of w:val, python-docx leaves it out
+                v_merge = {"restart": '<w:vMerge w:val="restart"/>', "continue": '<w:vMerge/>'}.get(vmerge, '')
+                tc_pr = '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%d"/>%s%s</w:tcPr>' % (
+                    sum(col_widths[first_col:last_col + 1]), grid_span, v_merge)
+                tc_prs[(first_col, last_col, vmerge)] = tc_pr
+            xml.append(tc_pr)
+            xml.append(paragraph_xml(texts[first_col], (row_index, first_col) in bold, ppr))
+            xml.append('</w:tc>')
+        xml.append('</w:tr>')
+        yield "".join(xml)
+
+
+def table_xml(layout, width, style_id=None, paragraph_ids=None):
+    """
+    serialise the layout as w:tbl
+    :param layout: TableLayout
+    :param width: table width in EMU, distributed over the columns (see TableLayout.column_widths)
+    :param style_id: style id of the table style, None for no style
+    :param paragraph_ids: dict paragraph style name -> style id of the paragraph styles of the layout
+    :return: xml string (w:tbl)
+    """
+    return "".join(table_xml_parts(layout, width, style_id, paragraph_ids))
+
+
+def parse_xml_parts(parts, batch_size=1000):
+    """
+    parse xml given in pieces with an incremental (feed) parser, the complete xml string is never built
+    the elements get the python-docx element classes, the same as parse_xml() gives.
+    :param parts: iterable of xml strings
+    :param batch_size: number of pieces fed at once
+    :return: root element
+    """
+    parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+    parser.set_element_class_lookup(element_class_lookup)
+    batch = []
+    for part in parts:
+        batch.append(part)
+        if len(batch) >= batch_size:
+            parser.feed("".join(batch))
+            batch = []
+    parser.feed("".join(batch))
+    return parser.close()
+
+
+def write_table_xml(document, layout, styles=None, row_parts=()):
+    """
+    write the layout as a new table at the end of the document, with one insert in the body
+    :param document: python-docx document
+    :param layout: TableLayout
+    :param styles: StyleRegistry with the table and paragraph styles, other styles are looked up by name
+    :param row_parts: xml strings of more rows (see rows_xml_parts), after the rows of the layout
+    :return: the created python-docx table
+    """
+    style_id, paragraph_ids = style_ids(document, layout, styles)
+    tbl = parse_xml_parts(table_xml_parts(layout, block_width(document), style_id, paragraph_ids, row_parts))
+    document.element.body._insert_tbl(tbl)
+    return Table(tbl, document._body)
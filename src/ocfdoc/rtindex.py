@@ -0,0 +1,143 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+reverse index of the device files: resource type id -> the devices (and categories) requiring it
+
+the device files list the resources per device, ResourceIndex inverts that while the records pass on
+to the table builder (collect), so the input is read once and every resource occurrence costs one dict lookup.
+the index is written as an extra table (device2doc -rt_table) or as json (-rt_json):
+    {
+      "oic.r.switch.binary": {
+        "title": "Binary Switch",
+        "categories": ["Lighting"],
+        "devices": [{"name": "Light", "type": "oic.d.light", "category": "Lighting", "lbnldevice": "..."}]
+      }
+    }
+category and lbnldevice are only given for the devices of the lbnl device files.
+"""
+
+import json
+
+
+class ResourceUsage(object):
+    __slots__ = ("title", "devices", "categories")
+
+    def __init__(self, title):
+        """
+        the devices requiring a resource type
+        :param title: resourcetypetitle of the first device listing the resource type
+        """
+        self.title = title
+        # (device name, device type, category name, lbnl device name), in input order
+        self.devices = []
+        # category names, in input order (dict as ordered set)
+        self.categories = {}
+
+
+class ResourceIndex(object):
+    def __init__(self, fill_resource=None):
+        """
+        initialize an empty index
+        :param fill_resource: function filling in the missing texts of a Resource, None is no filling
+        """
+        self.fill_resource = fill_resource
+        # resource type id -> ResourceUsage
+        self.usages = {}
+
+    def add_device(self, device, category=None, lbnl_device=None):
+        """
+        add the resources of a device
+        :param device: model.Device
+        :param category: name of the category of the device (lbnl), None for the device files
+        :param lbnl_device: name of the lbnl device of the device, None for the device files
+        """
+        entry = (device.name, device.type, category, lbnl_device)
+        for resource in device.resources:
+            if self.fill_resource is not None:
+                resource = self.fill_resource(resource)
+            if resource.rt is None:
+                continue
+            usage = self.usages.get(resource.rt)
+            if usage is None:
+                usage = self.usages[resource.rt] = ResourceUsage(resource.title)
+            if usage.devices and usage.devices[-1] is entry:
+                # the resource type listed twice by the device
+                continue
+            usage.devices.append(entry)
+            if category is not None:
+                usage.categories[category] = True
+
+    def collect(self, records):
+        """
+        index the records while passing them on, e.g. to the table builder
+        :param records: iterable of model.Device (device file) or of lbnl records (see model.lbnl_records)
+        :return: generator of the records
+        """
+        category = None
+        lbnl_device = None
+        for record in records:
+            if isinstance(record, tuple):
+                kind, item = record
+                if kind == "category":
+                    category = item.name
+                    lbnl_device = None
+                elif kind == "lbnldevice":
+                    lbnl_device = item.name
+                else:
+                    self.add_device(item, category, lbnl_device)
+            else:
+                self.add_device(record)
+            yield record
+
+    def resource_types(self):
+        """
+        :return: the indexed resource type ids, sorted
+        """
+        return sorted(self.usages)
+
+    def as_dict(self):
+        """
+        :return: dict resource type id -> dict of title, categories and devices (see module doc)
+        """
+        data = {}
+        for rt in self.resource_types():
+            usage = self.usages[rt]
+            devices = []
+            for name, type, category, lbnl_device in usage.devices:
+                device = {"name": name, "type": type}
+                if category is not None:
+                    device["category"] = category
+                if lbnl_device is not None:
+                    device["lbnldevice"] = lbnl_device
+                devices.append(device)
+            data[rt] = {"title": usage.title, "categories": list(usage.categories), "devices": devices}
+        return data
+
+    def write_json(self, filename):
+        """
+        write the index as json
+        :param filename: json file name
+        """
+        with open(filename, 'w', encoding='UTF8') as json_file:
+            json.dump(self.as_dict(), json_file, indent=2, ensure_ascii=False)
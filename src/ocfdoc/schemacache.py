@@ -0,0 +1,341 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+cache of jsonref resolved OCF resource type schemas
+
+SchemaCache resolves the $refs of the schema files in a directory with jsonref and keeps the resolved
+schemas in memory (LRU) and optionally on disk, as plain json named after the content hash of the file.
+an entry records the content hashes of all files that were loaded to resolve it, so it is only used
+when the file and all schemas it refers to are unchanged. the resolving is done once, later runs
+read the resolved json from the cache directory. an entry also records the resource types in the file
+of the schema itself (before resolving), so a cached schema file is not parsed again.
+
+ResourceCatalog maps the resource types ("rt") of the schemas to their titles, used to fill in
+the resourcetypetitle / resourcetypeid of the device files.
+"""
+
+import collections
+import hashlib
+import json
+import os
+from urllib.parse import unquote, urlparse
+from urllib.request import pathname2url
+
+from ocfdoc.buildmanifest import file_hash
+from ocfdoc.core import get_dir_list
+from ocfdoc.schemaindex import SchemaIndex, ref_subject
+
+
+def plain_json(node, missing, active=None):
+    """
+    copy of a jsonref resolved tree without proxies, that can be written as json
+    a reference back into its own ancestors (recursive schema) or a reference that can not be
+    resolved is kept as the {"$ref": ..} object.
+    :param node: resolved (jsonref) node
+    :param missing: list, the references that could not be resolved are appended
+    :param active: ids of the containers on the current path
+    :return: plain json value
+    """
+    import jsonref
+
+    if active is None:
+        active = set()
+    try:
+        subject = ref_subject(node)
+    except jsonref.JsonRefError:
+        missing.append(node.__reference__.get("$ref"))
+        return dict(node.__reference__)
+    if not isinstance(subject, (dict, list)):
+        return subject
+    if id(subject) in active:
+        return dict(getattr(node, "__reference__", {"$ref": "#"}))
+    active.add(id(subject))
+    if isinstance(subject, dict):
+        result = dict((key, plain_json(value, missing, active)) for key, value in subject.items())
+    else:
+        result = [plain_json(value, missing, active) for value in subject]
+    active.discard(id(subject))
+    return result
+
+
+class SchemaCache(object):
+    def __init__(self, schema_dir, cache_dir=None, lru_size=1024):
+        """
+        initialize the cache
+        :param schema_dir: directory with the resource type schemas (*.json)
+        :param cache_dir: directory for the resolved schemas, None for the in memory cache only
+        :param lru_size: number of resolved schemas kept in memory
+        """
+        self.schema_dir = os.path.abspath(schema_dir)
+        self.cache_dir = cache_dir
+        self.lru_size = lru_size
+        # path -> (content hash, dependencies, resolved schema, own resource types), least recently used first
+        self.memory = collections.OrderedDict()
+        # path -> (mtime, size, content hash)
+        self.hashes = {}
+        # path -> (content hash, parsed json), the unresolved documents loaded while resolving
+        self.documents = {}
+        self.counts = {"memory": 0, "disk": 0, "resolved": 0}
+
+    def schema_files(self):
+        """
+        :return: the schema file names in the schema directory (sorted)
+        """
+        return sorted(get_dir_list(self.schema_dir, ".json"))
+
+    def file_hash(self, path):
+        """
+        content hash of a file, hashed again only when the modification time or size changed
+        :param path: absolute file name
+        :return: sha256 hex digest
+        """
+        stat = os.stat(path)
+        known = self.hashes.get(path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        digest = file_hash(path)
+        self.hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def is_valid(self, dependencies):
+        """
+        check that the files a resolved schema was made of are unchanged
+        :param dependencies: dict path -> content hash
+        :return: True when all files still have the same content
+        """
+        try:
+            return all(self.file_hash(path) == digest for path, digest in dependencies.items())
+        except OSError:
+            return False
+
+    def local_path(self, uri):
+        """
+        the schema file of a reference uri, http(s) ids are mapped on the files in the schema directory
+        :param uri: uri without fragment
+        :return: absolute file name
+        """
+        parsed = urlparse(uri)
+        path = unquote(parsed.path)
+        if parsed.scheme in ("", "file") and os.path.isfile(path):
+            return os.path.abspath(path)
+        return os.path.join(self.schema_dir, os.path.basename(path))
+
+    def document(self, path):
+        """
+        the parsed (unresolved) json of a schema file, parsed once per content
+        :param path: absolute file name
+        :return: json tree, should not be modified
+        """
+        digest = self.file_hash(path)
+        known = self.documents.get(path)
+        if known is not None and known[0] == digest:
+            return known[1]
+        with open(path, 'r', encoding='UTF8') as json_file:
+            tree = json.load(json_file)
+        self.documents[path] = (digest, tree)
+        return tree
+
+    def resolve(self, path):
+        """
+        resolve all $refs of a schema file
+        :param path: absolute file name
+        :return: (dependencies as dict path -> content hash, resolved schema as plain json,
+                  resource types in the file itself)
+        """
+        import jsonref
+
+        dependencies = {path: self.file_hash(path)}
+
+        def loader(uri):
+            local = self.local_path(uri)
+            tree = self.document(local)
+            dependencies[local] = self.file_hash(local)
+            return tree
+
+        resolved = jsonref.replace_refs(self.document(path), base_uri="file:" + pathname2url(path),
+                                        loader=loader)
+        missing = []
+        schema = plain_json(resolved, missing)
+        if missing:
+            print ("schema", os.path.basename(path), "unresolved references:", ", ".join(sorted(set(missing))))
+        return dependencies, schema, resource_types(self.document(path))
+
+    def entry_name(self, digest):
+        """
+        name of the resolved schema in the cache directory
+        :param digest: content hash of the schema file
+        :return: file name
+        """
+        return os.path.join(self.cache_dir, digest + ".json")
+
+    def read_entry(self, path, digest):
+        """
+        the resolved schema from the cache directory
+        :return: (dependencies, schema, own resource types) or None when there is no valid entry
+        """
+        try:
+            with open(self.entry_name(digest), 'r', encoding='UTF8') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("file") != path or "own" not in entry or not self.is_valid(entry["dependencies"]):
+            return None
+        return entry["dependencies"], entry["schema"], entry["own"]
+
+    def write_entry(self, path, digest, dependencies, schema, own):
+        """
+        write the resolved schema to the cache directory
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        name = self.entry_name(digest)
+        temp_name = "%s.%d.tmp" % (name, os.getpid())
+        with open(temp_name, 'w', encoding='UTF8') as entry_file:
+            json.dump({"file": path, "dependencies": dependencies, "schema": schema, "own": own}, entry_file)
+        os.replace(temp_name, name)
+
+    def entry(self, filename):
+        """
+        the cache entry of a file: from memory, from the cache directory or resolved now
+        :param filename: schema file name (relative to the schema directory, or absolute)
+        :return: (content hash, dependencies, resolved schema, own resource types)
+        """
+        path = os.path.join(self.schema_dir, filename)
+        digest = self.file_hash(path)
+        entry = self.memory.get(path)
+        if entry is not None and entry[0] == digest and self.is_valid(entry[1]):
+            self.memory.move_to_end(path)
+            self.counts["memory"] += 1
+            return entry
+
+        stored = self.read_entry(path, digest) if self.cache_dir is not None else None
+        if stored is not None:
+            self.counts["disk"] += 1
+            dependencies, schema, own = stored
+        else:
+            self.counts["resolved"] += 1
+            dependencies, schema, own = self.resolve(path)
+            if self.cache_dir is not None:
+                self.write_entry(path, digest, dependencies, schema, own)
+
+        entry = (digest, dependencies, schema, own)
+        self.memory[path] = entry
+        self.memory.move_to_end(path)
+        while len(self.memory) > self.lru_size:
+            self.memory.popitem(last=False)
+        return entry
+
+    def resolved(self, filename):
+        """
+        the resolved schema of a file, the returned schema is shared, it should not be modified.
+        :param filename: schema file name (relative to the schema directory, or absolute)
+        :return: resolved schema as plain json
+        """
+        return self.entry(filename)[2]
+
+
+def resource_types(schema):
+    """
+    the resource types of a schema: the default and enum values of the "rt" properties
+    in a resolved schema these include the resource types of the schemas it refers to.
+    :param schema: schema, resolved or as in its file
+    :return: list of rt strings, in document order
+    """
+    found = []
+    for value in SchemaIndex(schema).values("rt"):
+        if not isinstance(value, dict):
+            continue
+        candidates = list(value.get("default") or [])
+        items = value.get("items")
+        if isinstance(items, dict):
+            candidates.extend(items.get("enum") or [])
+        for rt in candidates:
+            if isinstance(rt, str) and rt not in found:
+                found.append(rt)
+    return found
+
+
+class ResourceCatalog(object):
+    def __init__(self, schema_dir, cache_dir=None, lru_size=1024):
+        """
+        read the titles and resource types of all schemas in the directory
+        :param schema_dir: directory with the resource type schemas (*.json)
+        :param cache_dir: directory for the resolved schemas (see SchemaCache)
+        :param lru_size: number of resolved schemas kept in memory
+        """
+        self.cache = SchemaCache(schema_dir, cache_dir, lru_size)
+        # rt -> title and title -> rt, the schema defining the rt wins, then the first schema
+        self.titles = {}
+        self.rts = {}
+        self.load()
+
+    def load(self):
+        """
+        (re)read the catalog from the schemas, unchanged schemas come from the cache
+        the resource types in the file of a schema (its own) are credited to it first,
+        the resource types found only after resolving (e.g. behind a $ref to another file) after that:
+        an rt of a schema included with $ref keeps the title of the schema that defines it.
+        """
+        self.titles = {}
+        self.rts = {}
+        included = []
+        for filename in self.cache.schema_files():
+            schema, own = self.cache.entry(filename)[2:]
+            title = schema.get("title") if isinstance(schema, dict) else None
+            if not isinstance(title, str):
+                continue
+            for rt in own:
+                self.titles.setdefault(rt, title)
+                self.rts.setdefault(title, rt)
+            included.append((title, [rt for rt in resource_types(schema) if rt not in own]))
+        for title, rts in included:
+            for rt in rts:
+                self.titles.setdefault(rt, title)
+                self.rts.setdefault(title, rt)
+
+    def digest(self):
+        """
+        hash of the content of all schema files, changes when any schema changes
+        :return: sha256 hex digest
+        """
+        digest = hashlib.sha256()
+        for filename in self.cache.schema_files():
+            digest.update(filename.encode("UTF8"))
+            digest.update(self.cache.file_hash(os.path.join(self.cache.schema_dir, filename)).encode("UTF8"))
+        return digest.hexdigest()
+
+    def fill(self, resource):
+        """
+        fill in the missing (or empty) resourcetypetitle / resourcetypeid of a resource of the device file
+        :param resource: resource dict of the device file
+        :return: the resource, a filled in copy when something was missing
+        """
+        title = resource.get("resourcetypetitle")
+        rt = resource.get("resourcetypeid")
+        if title and rt:
+            return resource
+        filled = dict(resource)
+        if rt and not title and rt in self.titles:
+            filled["resourcetypetitle"] = self.titles[rt]
+        elif title and not rt and title in self.rts:
+            filled["resourcetypeid"] = self.rts[title]
+        return filled
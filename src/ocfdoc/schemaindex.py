@@ -0,0 +1,158 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+index of the keys of a json (schema) tree
+
+find_key and find_key_link walk the whole tree for every lookup and return only one hit.
+SchemaIndex walks the tree once and maps every key to all places where it appears,
+as (path, value) in document order, so that a lookup is a dict access.
+
+the tree may be resolved with jsonref: a $ref is indexed at every place where it is used,
+a reference back into its own ancestors (recursive schema) is not followed again.
+"""
+
+
+def ref_subject(node):
+    """
+    the object behind a jsonref proxy
+    :param node: json node, a jsonref.JsonRef proxy or a plain json value
+    :return: the resolved object (the node itself when it is not a proxy)
+    """
+    return getattr(node, "__subject__", node)
+
+
+class SchemaIndex(object):
+    def __init__(self, tree):
+        """
+        index the tree
+        :param tree: json tree (dicts and lists), e.g. a jsonref resolved schema
+        """
+        self.tree = tree
+        # key -> list of (path, value), path is the tuple of keys and list indices of the dict holding the key
+        self.entries = {}
+        self.node_count = 0
+        self.build()
+
+    def build(self):
+        """
+        walk the tree depth first (iterative, no recursion limit) and fill the index.
+        the keys of a dict are indexed before the dicts below it, the same order as find_key.
+        """
+        entries = self.entries
+        # ids of the dicts and lists on the current path, to break reference cycles
+        active = set()
+        # stack of (node, path), node None is the marker that leaves the node with id path
+        stack = [(self.tree, ())]
+        while stack:
+            node, path = stack.pop()
+            if node is None:
+                active.discard(path)
+                continue
+            subject = ref_subject(node)
+            if isinstance(subject, dict):
+                children = subject.items()
+            elif isinstance(subject, list):
+                children = enumerate(subject)
+            else:
+                continue
+            if id(subject) in active:
+                continue
+            active.add(id(subject))
+            stack.append((None, id(subject)))
+            self.node_count += 1
+            child_items = []
+            for key, value in children:
+                if isinstance(subject, dict):
+                    entries.setdefault(key, []).append((path, value))
+                child_items.append((value, path + (key,)))
+            stack.extend(reversed(child_items))
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        """
+        :return: all indexed keys
+        """
+        return self.entries.keys()
+
+    def find(self, key, under=None):
+        """
+        all places of the key
+        :param key: key to look up
+        :param under: only the places below a dict key or list index on the path (e.g. "oneOf", "properties")
+        :return: list of (path, value) in document order, empty when the key does not exist
+        """
+        found = self.entries.get(key, [])
+        if under is None:
+            return list(found)
+        return [(path, value) for path, value in found if under in path]
+
+    def values(self, key, under=None):
+        """
+        all values of the key
+        :param key: key to look up
+        :param under: see find
+        :return: list of values in document order
+        """
+        return [value for path, value in self.find(key, under)]
+
+    def paths(self, key, under=None):
+        """
+        all paths of the dicts holding the key
+        :param key: key to look up
+        :param under: see find
+        :return: list of paths (tuples of keys and list indices)
+        """
+        return [path for path, value in self.find(key, under)]
+
+    def first(self, key, default=None):
+        """
+        the first value of the key in document order
+        unlike find_key this also finds keys in lists (oneOf, allOf, items arrays, ..)
+        :param key: key to look up
+        :param default: returned when the key does not exist
+        :return: value
+        """
+        found = self.entries.get(key)
+        if not found:
+            return default
+        return found[0][1]
+
+    def get(self, path, default=None):
+        """
+        the value at a path of the tree
+        :param path: tuple of keys and list indices, e.g. a path returned by find (+ the key)
+        :param default: returned when the path does not exist
+        :return: value
+        """
+        node = self.tree
+        for step in path:
+            try:
+                node = node[step]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return node
@@ -0,0 +1,209 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+instrumentation of a conversion
+
+ConversionStats times the phases of a conversion (parse input, load template, build tables, save),
+counts the generated tables, rows, cells and merges, and reports them as text or json.
+optionally the conversion is profiled with cProfile (pstats file) and the python memory is
+traced with tracemalloc (memory at the end of each phase, peak and the top allocation sites).
+"""
+
+import contextlib
+import json
+import time
+
+
+class ConversionStats(object):
+    def __init__(self):
+        """
+        initialize the statistics, nothing is traced until start_tracing is called
+        """
+        # per phase [name, depth, seconds, traced memory at the end (None when not traced)]
+        self.phases = []
+        self.depth = 0
+        self.counters = {"tables": 0, "rows": 0, "cells": 0, "merges": 0}
+        self.profiler = None
+        self.profile_name = None
+        self.trace_memory = False
+        self.memory_peak = None
+        self.memory_top = []
+        # open phase of split()
+        self.split_phase = None
+
+    def start_tracing(self, profile_name=None, trace_memory=False):
+        """
+        start the cProfile profiler and/or tracemalloc
+        :param profile_name: pstats file written by stop_tracing, None is no profiling
+        :param trace_memory: trace the python allocations with tracemalloc
+        """
+        if profile_name is not None:
+            import cProfile
+            self.profile_name = profile_name
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if trace_memory is True:
+            import tracemalloc
+            self.trace_memory = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def stop_tracing(self, top=10):
+        """
+        stop tracemalloc (records the peak and top allocations) and the profiler (writes the pstats file)
+        :param top: number of allocation sites to keep
+        """
+        if self.trace_memory is True:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                self.memory_peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                self.memory_top = [(str(stat.traceback), stat.size, stat.count)
+                                   for stat in snapshot.statistics("lineno")[:top]]
+                tracemalloc.stop()
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_name)
+            self.profiler = None
+
+    def traced_memory(self):
+        """
+        :return: the currently traced memory in bytes, None when not tracing
+        """
+        if self.trace_memory is not True:
+            return None
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[0]
+
+    def start_phase(self, name):
+        """
+        start a phase, phases started before the end of this phase are nested in it
+        :param name: name of the phase
+        :return: the phase entry, to be passed to end_phase
+        """
+        entry = [name, self.depth, time.perf_counter(), None]
+        self.phases.append(entry)
+        self.depth += 1
+        return entry
+
+    def end_phase(self, entry):
+        """
+        end a phase
+        :param entry: phase entry of start_phase
+        """
+        entry[2] = time.perf_counter() - entry[2]
+        entry[3] = self.traced_memory()
+        self.depth -= 1
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        time the with block as phase
+        :param name: name of the phase
+        """
+        entry = self.start_phase(name)
+        try:
+            yield entry
+        finally:
+            self.end_phase(entry)
+
+    def split(self, name=None):
+        """
+        end the previous split phase and start the next one, e.g. a phase per category in a loop
+        :param name: name of the next phase, None only ends the previous one
+        """
+        if self.split_phase is not None:
+            self.end_phase(self.split_phase)
+            self.split_phase = None
+        if name is not None:
+            self.split_phase = self.start_phase(name)
+
+    def count(self, name, amount=1):
+        """
+        add to a counter
+        :param name: counter name
+        :param amount: amount to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_layout(self, layout):
+        """
+        count the table, rows, cells and (vertical) merges of a table layout
+        :param layout: TableLayout
+        """
+        self.count("tables")
+        self.count("rows", layout.row_count)
+        self.count("cells", sum(len(layout.row_spans(row)) for row in range(layout.row_count)))
+        self.count("merges", sum(len(merges) for merges in layout.merges.values()))
+        self.count("vertical merges", sum(1 for vmerge in layout.vmerges.values() if vmerge == "restart"))
+
+    def total_seconds(self):
+        """
+        :return: the time of the top level phases
+        """
+        return sum(entry[2] for entry in self.phases if entry[1] == 0)
+
+    def as_dict(self):
+        """
+        :return: the statistics as json compatible dict
+        """
+        phases = []
+        for name, depth, seconds, memory in self.phases:
+            phase = {"name": name, "depth": depth, "seconds": round(seconds, 6)}
+            if memory is not None:
+                phase["memory_bytes"] = memory
+            phases.append(phase)
+        result = {"phases": phases, "counters": dict(self.counters), "total_seconds": round(self.total_seconds(), 6)}
+        if self.memory_peak is not None:
+            result["memory_peak_bytes"] = self.memory_peak
+            result["memory_top"] = [{"location": location, "bytes": size, "count": count}
+                                    for location, size, count in self.memory_top]
+        if self.profile_name is not None:
+            result["profile"] = self.profile_name
+        return result
+
+    def json(self):
+        """
+        :return: the statistics as json text
+        """
+        return json.dumps(self.as_dict(), indent=1)
+
+    def text(self):
+        """
+        :return: the statistics as human readable text
+        """
+        lines = ["phase                                              time [s]   memory [kB]"]
+        for name, depth, seconds, memory in self.phases:
+            label = ("  " * depth + name)[:48]
+            memory_text = "" if memory is None else "%13.1f" % (memory / 1024.0)
+            lines.append("%-48s %10.3f %s" % (label, seconds, memory_text))
+        lines.append("%-48s %10.3f" % ("total", self.total_seconds()))
+        lines.append("")
+        lines.append(", ".join("%s: %d" % (name, value) for name, value in sorted(self.counters.items())))
+        if self.memory_peak is not None:
+            lines.append("memory peak: %.1f kB" % (self.memory_peak / 1024.0))
+            for location, size, count in self.memory_top:
+                lines.append("  %10.1f kB %8d blocks  %s" % (size / 1024.0, count, location))
+        if self.profile_name is not None:
+            lines.append("profile written to: %s (python3 -m pstats %s)" % (self.profile_name, self.profile_name))
+        return "\n".join(lines)
@@ -0,0 +1,76 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+style registry of a document
+
+assigning a style by name (paragraph.style = 'TABLE-cell', add_table(style='TABLE-A')) makes python-docx
+search styles.xml for the name at every assignment. StyleRegistry looks up all styles a generator uses
+once, right after the template is loaded, checks that they exist (one error listing every missing style)
+and gives the resolved style ids (style_id) to the fragments and the table writers.
+"""
+
+PARAGRAPH = "paragraph"
+TABLE = "table"
+
+
+class StyleError(Exception):
+    """
+    the template does not have (all) the styles the generator needs
+    """
+    pass
+
+
+class StyleRegistry(object):
+    def __init__(self, document, styles):
+        """
+        resolve and validate the styles
+        :param document: python-docx document (the loaded template)
+        :param styles: dict style name -> PARAGRAPH or TABLE
+        :raises StyleError: when styles are missing or of the wrong type
+        """
+        from docx.enum.style import WD_STYLE_TYPE
+
+        style_types = {PARAGRAPH: WD_STYLE_TYPE.PARAGRAPH, TABLE: WD_STYLE_TYPE.TABLE}
+        self.document = document
+        # style name -> style id, None for the default style of its type (no style reference needed)
+        self.ids = {}
+        problems = []
+        for name, kind in sorted(styles.items()):
+            try:
+                style = document.styles[name]
+            except KeyError:
+                problems.append("'%s' (missing)" % name)
+                continue
+            if style.type != style_types[kind]:
+                problems.append("'%s' (not a %s style)" % (name, kind))
+                continue
+            self.ids[name] = document.part.get_style_id(style, style.type)
+        if problems:
+            raise StyleError("the template is missing styles: " + ", ".join(problems))
+
+    def style_id(self, name):
+        """
+        :param name: style name, registered in the constructor
+        :return: style id, None for the default style
+        """
+        return self.ids[name]
@@ -0,0 +1,395 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+table layout engine
+
+the generators first lay out all rows, texts and merges of a table as plain python data,
+then the complete layout is written into the document in one pass.
+the merges are part of the layout: horizontal spans of any width (w:gridSpan) and
+vertical merges (w:vMerge), so the writers never relocate cell content.
+column widths and the table layout (autofit/fixed) are written once in w:tblGrid / w:tblLayout,
+the cell widths (w:tcW) are part of the cell prototypes.
+python-docx proxies (add_row, .cells, merge) are not used in the row loop: every .cells access
+and every merge walks the whole table, which makes large tables quadratic.
+"""
+
+from copy import deepcopy
+
+# units of the column widths, in EMU
+WIDTH_UNITS = {"mm": 36000, "cm": 360000, "in": 914400, "pt": 12700}
+
+
+def parse_width(text):
+    """
+    parse a column width
+    :param text: width with unit (30mm, 2.5cm, 1.5in, 72pt), percentage of the table width (25%)
+                 or * for an equal share of the remaining width
+    :return: EMU (int), fraction of the table width (float) or None (remaining width)
+    """
+    text = text.strip().lower()
+    if text == "*":
+        return None
+    if text.endswith("%"):
+        return float(text[:-1]) / 100.0
+    for unit, emu in WIDTH_UNITS.items():
+        if text.endswith(unit):
+            return int(round(float(text[:-len(unit)]) * emu))
+    raise ValueError("column width should be a length (mm, cm, in, pt), a percentage or *: %s" % text)
+
+
+def block_width(document):
+    """
+    the width available for a table, the same width python-docx uses in add_table
+    :param document: python-docx document
+    :return: width in EMU
+    """
+    section = document.sections[-1]
+    return section.page_width - section.left_margin - section.right_margin
+
+
+def style_ids(document, layout, styles=None):
+    """
+    the style ids of the table style and the paragraph styles of a layout
+    :param document: python-docx document
+    :param layout: TableLayout
+    :param styles: StyleRegistry, styles that are not registered are looked up by name
+    :return: (table style id, dict paragraph style name -> style id)
+    """
+    from docx.enum.style import WD_STYLE_TYPE
+
+    def style_id(name, style_type):
+        if name is None:
+            return None
+        if styles is not None and name in styles.ids:
+            return styles.style_id(name)
+        return document.part.get_style_id(name, style_type)
+
+    paragraph_ids = dict((name, style_id(name, WD_STYLE_TYPE.PARAGRAPH)) for name in layout.paragraph_styles())
+    return style_id(layout.style, WD_STYLE_TYPE.TABLE), paragraph_ids
+
+
+class TableLayout(object):
+    def __init__(self, cols, style=None):
+        """
+        initialize the layout
+        :param cols: number of grid columns of the table
+        :param style: table style name (e.g. 'TABLE-A')
+        """
+        self.cols = cols
+        self.style = style
+        # per row a list of texts, None means the cell is left untouched (empty paragraph)
+        self.rows = []
+        # (row, col) of the cells that have a bold run
+        self.bold = set()
+        # per row the horizontal merges as list of (first_col, last_col)
+        self.merges = {}
+        # (row, first_col) -> "restart" or "continue" of the vertically merged cells
+        self.vmerges = {}
+        # column widths (see set_widths), None is an equal share of the table width for every column
+        self.widths = None
+        # w:tblLayout: True autofit, False fixed, None not written (Word default)
+        self.autofit = None
+        # paragraph style of the cells, per row (row_styles) or for all rows (cell_style), None is no style
+        self.cell_style = None
+        self.row_styles = {}
+        # number of rows at the start that are the header of the table, stamped from the fragment library
+        self.header_rows = 0
+        # rows starting a group of rows that stays in one chunk (see chunk_ranges), empty is every row on its own
+        self.group_starts = []
+
+    def add_row(self, *texts):
+        """
+        add a row to the layout
+        :param texts: texts of the first cells of the row, None leaves a cell untouched
+        :return: index of the added row
+        """
+        row = list(texts) + [None] * (self.cols - len(texts))
+        self.rows.append(row)
+        return len(self.rows) - 1
+
+    def set_text(self, row, col, text, bold=False):
+        """
+        set the text of a cell
+        :param row: row index
+        :param col: column index
+        :param text: text of the cell
+        :param bold: text is written as a single bold run
+        """
+        self.rows[row][col] = text
+        if bold is True:
+            self.bold.add((row, col))
+
+    def set_row_style(self, row, style):
+        """
+        set the paragraph style of the cells of a row
+        :param row: row index
+        :param style: paragraph style name (e.g. 'TABLE-col-heading')
+        """
+        self.row_styles[row] = style
+
+    def paragraph_style(self, row):
+        """
+        :param row: row index
+        :return: paragraph style name of the cells of the row, None is no style
+        """
+        return self.row_styles.get(row, self.cell_style)
+
+    def paragraph_styles(self):
+        """
+        :return: set of the paragraph style names used in the table
+        """
+        names = set(self.row_styles.values())
+        if self.cell_style is not None and len(self.row_styles) < len(self.rows):
+            names.add(self.cell_style)
+        names.discard(None)
+        return names
+
+    def set_widths(self, widths, autofit=None):
+        """
+        set the column widths, written once in the table grid
+        :param widths: per column EMU (int), fraction of the table width (float) or None (equal share of the rest),
+                       see parse_width. missing columns get an equal share of the rest.
+        :param autofit: True autofit, False fixed layout (Word keeps the widths), None leaves it to Word
+        """
+        self.widths = list(widths)[:self.cols] + [None] * (self.cols - len(widths))
+        self.autofit = autofit
+
+    def column_widths(self, table_width):
+        """
+        the column widths in EMU
+        :param table_width: width of the table in EMU
+        :return: list of EMU widths, one per column
+        """
+        if self.widths is None:
+            return [table_width // self.cols] * self.cols
+        widths = [int(table_width * width) if isinstance(width, float) else width for width in self.widths]
+        rest = [col for col, width in enumerate(widths) if width is None]
+        if rest:
+            share = max(table_width - sum(width for width in widths if width is not None), 0) // len(rest)
+            for col in rest:
+                widths[col] = share
+        return widths
+
+    def merge(self, row, first_col, last_col):
+        """
+        merge the cells first_col..last_col (inclusive) of a row into one cell
+        :param row: row index
+        :param first_col: first column of the merge
+        :param last_col: last column of the merge
+        """
+        self.merges.setdefault(row, []).append((first_col, last_col))
+
+    def merge_block(self, first_row, last_row, first_col, last_col):
+        """
+        merge the cells of a block of rows and columns (inclusive) into one cell
+        the columns are merged in every row and the rows are merged vertically,
+        the text of the block is the text of the top left cell, the other cells should stay empty.
+        :param first_row: first row of the merge
+        :param last_row: last row of the merge
+        :param first_col: first column of the merge
+        :param last_col: last column of the merge
+        """
+        for row in range(first_row, last_row + 1):
+            if last_col > first_col:
+                self.merge(row, first_col, last_col)
+            if last_row > first_row:
+                self.vmerges[(row, first_col)] = "restart" if row == first_row else "continue"
+
+    def merge_down(self, col, first_row, last_row):
+        """
+        merge the cells of a column vertically, e.g. a device name over the rows of its resources
+        :param col: column index
+        :param first_row: first row of the merge, the row with the text
+        :param last_row: last row of the merge
+        """
+        self.merge_block(first_row, last_row, col, col)
+
+    def row_spans(self, row):
+        """
+        the cells of a row, as (first_col, last_col) grid ranges
+        :param row: row index
+        :return: list of (first_col, last_col)
+        """
+        merges = self.merges.get(row)
+        if merges is None:
+            return [(col, col) for col in range(self.cols)]
+        starts = {}
+        for first_col, last_col in merges:
+            starts[first_col] = last_col
+        spans = []
+        col = 0
+        while col < self.cols:
+            last_col = starts.get(col, col)
+            spans.append((col, last_col))
+            col = last_col + 1
+        return spans
+
+    def start_group(self, row):
+        """
+        mark a row as the start of a group of rows that is not split over chunks, e.g. a device and its resources
+        :param row: row index
+        """
+        self.group_starts.append(row)
+
+    def chunk_ranges(self, max_rows=None, max_bytes=None, row_bytes=None):
+        """
+        split the rows after the header rows into chunks of whole groups (see start_group)
+        a chunk ends before the group that would exceed max_rows or max_bytes (the header rows included),
+        a group larger than the budget is a chunk on its own.
+        :param max_rows: maximum number of rows of a chunk, None is no limit
+        :param max_bytes: maximum size of a chunk, None is no limit
+        :param row_bytes: function row index -> size of the row, used with max_bytes
+        :return: list of (first_row, end_row) of the chunks, at least one
+        """
+        first = self.header_rows
+        if self.group_starts:
+            bounds = sorted(set(row for row in self.group_starts if row > first))
+        else:
+            bounds = list(range(first + 1, self.row_count))
+        header_bytes = sum(row_bytes(row) for row in range(first)) if max_bytes is not None else 0
+        ranges = []
+        chunk_start = first
+        rows = first
+        size = header_bytes
+        for start, end in zip([first] + bounds, bounds + [self.row_count]):
+            group_bytes = sum(row_bytes(row) for row in range(start, end)) if max_bytes is not None else 0
+            if start > chunk_start and ((max_rows is not None and rows + end - start > max_rows) or
+                                        (max_bytes is not None and size + group_bytes > max_bytes)):
+                ranges.append((chunk_start, start))
+                chunk_start = start
+                rows = first
+                size = header_bytes
+            rows += end - start
+            size += group_bytes
+        ranges.append((chunk_start, max(chunk_start, self.row_count)))
+        return ranges
+
+    def sub_layout(self, first_row, end_row):
+        """
+        a layout with the header rows and the rows first_row..end_row - 1, e.g. a chunk of a large table
+        the texts of the rows are shared with this layout.
+        :param first_row: first row after the header rows
+        :param end_row: row after the last row
+        :return: TableLayout
+        """
+        layout = TableLayout(self.cols, self.style)
+        layout.widths = self.widths
+        layout.autofit = self.autofit
+        layout.cell_style = self.cell_style
+        layout.header_rows = self.header_rows
+        for row in list(range(self.header_rows)) + list(range(first_row, end_row)):
+            new_row = layout.add_row()
+            layout.rows[new_row] = self.rows[row]
+            if row in self.merges:
+                layout.merges[new_row] = self.merges[row]
+            if row in self.row_styles:
+                layout.row_styles[new_row] = self.row_styles[row]
+            for col in range(self.cols):
+                if (row, col) in self.bold:
+                    layout.bold.add((new_row, col))
+                vmerge = self.vmerges.get((row, col))
+                if vmerge is not None:
+                    layout.vmerges[(new_row, col)] = vmerge
+        return layout
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+
+def write_table(document, layout, styles=None):
+    """
+    write the layout as a new table at the end of the document
+    the table is created empty and all rows are appended directly as w:tr/w:tc elements.
+    merged cells are written with their w:gridSpan and w:vMerge, the same xml as python-docx merge() creates.
+    the empty w:tc of each (merged) cell is created once and copied for every row,
+    the header rows (layout.header_rows) are stamped from the fragment library.
+    :param document: python-docx document
+    :param layout: TableLayout
+    :param styles: StyleRegistry with the table and paragraph styles, other styles are looked up by name
+    :return: the created python-docx table
+    """
+    from docx.shared import Emu
+    from docx.table import _Cell
+
+    table_style_id, paragraph_ids = style_ids(document, layout, styles)
+    table = document.add_table(rows=0, cols=layout.cols)
+    table._tbl.tblStyle_val = table_style_id
+    if layout.autofit is not None:
+        table.autofit = layout.autofit
+
+    tbl = table._tbl
+    if layout.widths is not None:
+        for gridCol, width in zip(tbl.tblGrid.gridCol_lst, layout.column_widths(block_width(document))):
+            gridCol.w = Emu(width)
+    widths = [gridCol.w for gridCol in tbl.tblGrid.gridCol_lst]
+    prototypes = {}
+
+    def new_tc(tr, first_col, last_col, vmerge, style_id):
+        prototype = prototypes.get((first_col, last_col, vmerge, style_id))
+        if prototype is None:
+            prototype = tr.add_tc()
+            if widths[first_col] is not None:
+                prototype.width = sum(widths[first_col:last_col + 1])
+            if last_col > first_col:
+                prototype.grid_span = last_col - first_col + 1
+            if vmerge is not None:
+                prototype.vMerge = vmerge
+            if style_id is not None:
+                prototype.p_lst[0].style = style_id
+            prototypes[(first_col, last_col, vmerge, style_id)] = deepcopy(prototype)
+            return prototype
+        tc = deepcopy(prototype)
+        tr.append(tc)
+        return tc
+
+    first_row = 0
+    if layout.header_rows > 0:
+        # the header rows are the same for every table with the same header (see fragments)
+        from ocfdoc.fragments import fragments
+        from ocfdoc.ooxmlwriter import column_twips
+
+        for tr in fragments.header_rows(layout, column_twips(layout, block_width(document)), paragraph_ids):
+            tbl.append(tr)
+        first_row = layout.header_rows
+
+    bold = layout.bold
+    vmerges = layout.vmerges
+    for row_index in range(first_row, layout.row_count):
+        texts = layout.rows[row_index]
+        tr = tbl.add_tr()
+        style_id = paragraph_ids.get(layout.paragraph_style(row_index))
+        for first_col, last_col in layout.row_spans(row_index):
+            tc = new_tc(tr, first_col, last_col, vmerges.get((row_index, first_col)), style_id)
+            text = texts[first_col]
+            if text is None:
+                continue
+            cell = _Cell(tc, table)
+            if (row_index, first_col) in bold:
+                cell.paragraphs[0].add_run(text).bold = True
+            elif style_id is not None:
+                # keep the styled paragraph of the prototype, the same xml as cell.text + paragraph.style
+                tc.p_lst[0].add_r().text = text
+            else:
+                cell.text = text
+    return table
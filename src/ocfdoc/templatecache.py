@@ -0,0 +1,171 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+cache of parsed word templates (e.g. input/ResourceTemplate.docx)
+
+the template is parsed once per process and kept as a snapshot, keyed on path, mtime and content hash.
+each conversion gets a clone of the snapshot: only the main document part (word/document.xml), which
+the generators write to, is copied. all other parts (styles, numbering, theme, media, ..) are shared
+read-only between the clones.
+
+optionally the template is also stored in a cache directory as an uncompressed (stored) docx,
+named after the content hash, so that later runs read it without inflating the zip.
+the content of the template file is kept with the snapshot, docxsave copies the unchanged parts from it.
+"""
+
+import copy
+import hashlib
+import io
+import os
+import zipfile
+
+
+class TemplateCache(object):
+    def __init__(self, cache_dir=None):
+        """
+        initialize the cache
+        :param cache_dir: directory for the stored templates, None for the in memory cache only
+        """
+        self.cache_dir = cache_dir
+        # path -> (mtime, content hash, parsed document, content of the template file)
+        self.snapshots = {}
+        # path -> (content hash, docxsave.SourceZip)
+        self.sources = {}
+
+    def key(self, docx_name):
+        """
+        the cache key of a template
+        :param docx_name: template file name
+        :return: (path, mtime, content hash), content of the file
+        """
+        path = os.path.abspath(docx_name)
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, 'rb') as docx_file:
+            data = docx_file.read()
+        return (path, mtime, hashlib.sha256(data).hexdigest()), data
+
+    def stored_name(self, digest):
+        """
+        name of the stored template in the cache directory
+        :param digest: content hash of the template
+        :return: file name
+        """
+        return os.path.join(self.cache_dir, digest + ".docx")
+
+    def store(self, docx_name, digest):
+        """
+        write the template uncompressed to the cache directory
+        :param docx_name: template file name
+        :param digest: content hash of the template
+        :return: file name of the stored template
+        """
+        stored_name = self.stored_name(digest)
+        if os.path.isfile(stored_name):
+            return stored_name
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_name = "%s.%d.tmp" % (stored_name, os.getpid())
+        with zipfile.ZipFile(docx_name) as zip_in, \
+                zipfile.ZipFile(temp_name, 'w', compression=zipfile.ZIP_STORED) as zip_out:
+            for info in zip_in.infolist():
+                zip_out.writestr(info.filename, zip_in.read(info.filename))
+        os.replace(temp_name, stored_name)
+        return stored_name
+
+    def load(self, docx_name):
+        """
+        the parsed snapshot of the template, parsed only when the file changed
+        the snapshot itself should not be modified, use document() to get a copy to work on.
+        :param docx_name: template file name
+        :return: python-docx document
+        """
+        (path, mtime, digest), data = self.key(docx_name)
+        snapshot = self.snapshots.get(path)
+        if snapshot is not None and snapshot[:2] == (mtime, digest):
+            return snapshot[2]
+        from docx import Document
+
+        if self.cache_dir is not None:
+            document = Document(docx=self.store(path, digest))
+        else:
+            document = Document(docx=io.BytesIO(data))
+        self.snapshots[path] = (mtime, digest, document, data)
+        return document
+
+    def document(self, docx_name):
+        """
+        a copy of the template to generate a document in
+        :param docx_name: template file name
+        :return: python-docx document
+        """
+        return clone(self.load(docx_name))
+
+    def source(self, docx_name):
+        """
+        the template zip and the snapshot of a loaded template, for docxsave.save_document
+        :param docx_name: template file name
+        :return: (docxsave.SourceZip, snapshot document), (None, None) when the template is not loaded
+        """
+        from ocfdoc.docxsave import SourceZip
+
+        path = os.path.abspath(docx_name)
+        snapshot = self.snapshots.get(path)
+        if snapshot is None:
+            return None, None
+        _, digest, document, data = snapshot
+        source = self.sources.get(path)
+        if source is None or source[0] != digest:
+            source = (digest, SourceZip(data))
+            self.sources[path] = source
+        return source[1], document
+
+
+def clone(document):
+    """
+    copy on write clone of a document
+    the main document part is copied, all other parts are shared with the original document.
+    generators that change other parts (e.g. add styles) need a full copy.deepcopy() instead.
+    :param document: python-docx document
+    :return: python-docx document
+    """
+    main_part = document.part
+    memo = {}
+    for part in main_part.package.iter_parts():
+        if part is not main_part:
+            memo[id(part)] = part
+    return copy.deepcopy(document, memo)
+
+
+# process wide cache, used by the generators
+template_cache = TemplateCache()
+
+
+def open_template(docx_name, cache_dir=None):
+    """
+    a copy of the template from the process wide cache
+    :param docx_name: template file name
+    :param cache_dir: directory for the stored templates, None for the in memory cache only
+    :return: python-docx document
+    """
+    if cache_dir is not None:
+        template_cache.cache_dir = cache_dir
+    return template_cache.document(docx_name)
@@ -0,0 +1,274 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+update of a previously generated document
+
+instead of generating the document again from the template, the tables in the existing word file out are
+patched in place, so edits elsewhere in the document are kept:
+- the table of a layout is found by its header row (the first row of the layout),
+- the rows of the table are compared with the rows of the new layout by their content: cell ranges, merges,
+  texts and bold texts (tr_signature, layout_signature) and the paragraph style. the equal rows at the start
+  and the end are skipped, the rows in between are diffed (difflib), so the device type, resource and
+  enumeration texts act as the keys,
+- only the rows that differ are removed or inserted, only the inserted rows are serialised, as the xml backend
+  writes them (ooxmlwriter), the kept rows are not touched,
+- when the column widths changed (e.g. -col_widths), the grid and the cell widths of the kept rows are set
+  to the new widths, and the table layout (autofit or fixed) to the layout of the new table.
+"""
+
+import difflib
+
+from docx.oxml.ns import nsdecls, qn
+from lxml import etree
+
+from ocfdoc.ooxmlwriter import column_twips, parse_xml_parts, rows_xml_parts
+from ocfdoc.tablelayout import block_width, style_ids
+
+
+W_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+TBL = qn("w:tbl")
+TR = qn("w:tr")
+TC = qn("w:tc")
+P = qn("w:p")
+TAB = qn("w:tab")
+BOLD = qn("w:b")
+GRID_SPAN = qn("w:gridSpan")
+V_MERGE = qn("w:vMerge")
+VAL = qn("w:val")
+W = qn("w:w")
+TYPE = qn("w:type")
+TBL_PR = qn("w:tblPr")
+TBL_GRID = qn("w:tblGrid")
+GRID_COL = qn("w:gridCol")
+TC_PR = qn("w:tcPr")
+TC_W = qn("w:tcW")
+# the content of a row in document order, one (compiled) query per row
+ROW_CONTENT = etree.XPath("w:tc | w:tc/w:tcPr/w:gridSpan | w:tc/w:tcPr/w:vMerge | w:tc/w:p | w:tc/w:p/w:r/w:rPr/w:b | "
+                          "w:tc/w:p/w:r/w:t/text() | w:tc/w:p/w:r/w:tab | w:tc/w:p/w:r/w:br | w:tc/w:p/w:r/w:cr",
+                          namespaces=W_NS)
+# the paragraph style of a row, the generated rows have the same style in all their paragraphs
+ROW_STYLE = etree.XPath("string(w:tc/w:p/w:pPr/w:pStyle/@w:val)", namespaces=W_NS)
+
+
+def tr_signature(tr):
+    """
+    the content of a table row in the document,
+    tabs and line breaks as \\t and \\n and the paragraphs separated by \\n (as python-docx cell.text)
+    :param tr: w:tr element
+    :return: tuple of (first_col, last_col, vmerge, text, bold) per cell
+    """
+    cells = []
+    col = 0
+    cell = None
+    for item in ROW_CONTENT(tr):
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        tag = item.tag
+        if tag == TC:
+            if cell is not None:
+                cells.append(cell_signature(col, span, vmerge, parts, bold))
+                col += span
+            cell = item
+            span = 1
+            vmerge = None
+            bold = False
+            paragraphs = 0
+            parts = []
+        elif tag == P:
+            if paragraphs:
+                parts.append("\n")
+            paragraphs += 1
+        elif tag == BOLD:
+            bold = True
+        elif tag == TAB:
+            parts.append("\t")
+        elif tag == GRID_SPAN:
+            span = int(item.get(VAL))
+        elif tag == V_MERGE:
+            vmerge = item.get(VAL, "continue")
+        else:
+            parts.append("\n")
+    if cell is not None:
+        cells.append(cell_signature(col, span, vmerge, parts, bold))
+    return tuple(cells)
+
+
+def cell_signature(col, span, vmerge, parts, bold):
+    """
+    :return: (first_col, last_col, vmerge, text, bold) of a cell
+    """
+    text = "".join(parts)
+    return col, col + span - 1, vmerge, text, bold and bool(text)
+
+
+def layout_signature(layout, row):
+    """
+    the content of a row of a layout, comparable with tr_signature
+    :param layout: TableLayout
+    :param row: row index
+    :return: tuple of (first_col, last_col, vmerge, text, bold) per cell
+    """
+    texts = layout.rows[row]
+    cells = []
+    for first_col, last_col in layout.row_spans(row):
+        text = texts[first_col] or ""
+        cells.append((first_col, last_col, layout.vmerges.get((row, first_col)), text,
+                      (row, first_col) in layout.bold and bool(text)))
+    return tuple(cells)
+
+
+def find_table(document, layout):
+    """
+    the table of the document with the header row of the layout
+    :param document: python-docx document
+    :param layout: TableLayout, the first row is the header row
+    :return: w:tbl element, None when not found
+    """
+    header = layout_signature(layout, 0)
+    for tbl in document.element.body.iterchildren(TBL):
+        tr = tbl.find(TR)
+        if tr is not None and tr_signature(tr) == header:
+            return tbl
+    return None
+
+
+def update_widths(tbl, col_widths):
+    """
+    set the grid and the cell widths of a table to the column widths, when they differ
+    :param tbl: w:tbl element
+    :param col_widths: column widths in twips (see ooxmlwriter.column_twips)
+    :return: True when the widths were changed
+    """
+    grid = tbl.find(TBL_GRID)
+    grid_cols = [] if grid is None else list(grid.iterchildren(GRID_COL))
+    if [grid_col.get(W) for grid_col in grid_cols] == [str(col_width) for col_width in col_widths]:
+        return False
+    if grid is None:
+        grid = etree.Element(TBL_GRID)
+        tbl.insert(1 if tbl.find(TBL_PR) is not None else 0, grid)
+    for grid_col in grid_cols:
+        grid.remove(grid_col)
+    for col_width in col_widths:
+        etree.SubElement(grid, GRID_COL).set(W, str(col_width))
+    for tr in tbl.iterchildren(TR):
+        col = 0
+        for tc in tr.iterchildren(TC):
+            tc_pr = tc.find(TC_PR)
+            if tc_pr is None:
+                tc_pr = etree.Element(TC_PR)
+                tc.insert(0, tc_pr)
+            span_element = tc_pr.find(GRID_SPAN)
+            span = 1 if span_element is None else int(span_element.get(VAL))
+            tc_w = tc_pr.find(TC_W)
+            if tc_w is None:
+                tc_w = etree.Element(TC_W)
+                tc_pr.insert(0, tc_w)
+            tc_w.set(TYPE, "dxa")
+            tc_w.set(W, str(sum(col_widths[col:col + span])))
+            col += span
+    return True
+
+
+def diff_rows(old_count, new_count, same, old_signature, new_signature):
+    """
+    the differences of the rows in the document and the rows of the layout
+    the equal rows at the start and the end are skipped with same, the other rows are diffed by their signatures.
+    :param old_count: number of rows in the document
+    :param new_count: number of rows of the layout
+    :param same: function (old index, new index) -> True when the rows are equal
+    :param old_signature: function old index -> signature (see tr_signature)
+    :param new_signature: function new index -> signature (see layout_signature)
+    :return: list of (old_start, old_end, new_start, new_end) of the changed ranges
+    """
+    start = 0
+    while start < old_count and start < new_count and same(start, start):
+        start += 1
+    end_old = old_count
+    end_new = new_count
+    while end_old > start and end_new > start and same(end_old - 1, end_new - 1):
+        end_old -= 1
+        end_new -= 1
+    old = [old_signature(row) for row in range(start, end_old)]
+    new = [new_signature(row) for row in range(start, end_new)]
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    return [(start + i1, start + i2, start + j1, start + j2)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def update_table(document, tbl, layout, styles=None, stats=None):
+    """
+    update the rows of a table of the document to the rows of the layout
+    :param document: python-docx document
+    :param tbl: w:tbl element (see find_table)
+    :param layout: TableLayout
+    :param styles: StyleRegistry with the paragraph styles, other styles are looked up by name
+    :param stats: ConversionStats, counts the kept, inserted and removed rows
+    :return: number of changed rows (removed + inserted)
+    """
+    col_widths = column_twips(layout, block_width(document))
+    paragraph_ids = style_ids(document, layout, styles)[1]
+    old_rows = list(tbl.iterchildren(TR))
+    if update_widths(tbl, col_widths) and stats is not None:
+        stats.count("widths updated")
+    if layout.autofit is not None:
+        tbl.tblPr.autofit = layout.autofit
+
+    # compared by content and paragraph style, the rows are only serialised when inserted
+    def old_key(row):
+        return ROW_STYLE(old_rows[row]), tr_signature(old_rows[row])
+
+    def new_key(row):
+        return paragraph_ids.get(layout.paragraph_style(row)) or "", layout_signature(layout, row)
+
+    changes = diff_rows(len(old_rows), len(layout.rows), lambda old_row, new_row: old_key(old_row) == new_key(new_row),
+                        old_key, new_key)
+    removed = 0
+    inserted = 0
+    # from the end, so the rows before a change are still the rows of the document
+    for old_start, old_end, new_start, new_end in reversed(changes):
+        previous = old_rows[old_start - 1] if old_start > 0 else None
+        next_row = old_rows[old_end] if old_end < len(old_rows) else None
+        for tr in old_rows[old_start:old_end]:
+            tbl.remove(tr)
+        removed += old_end - old_start
+        if new_end == new_start:
+            continue
+        parts = ['<w:tbl %s>' % nsdecls('w')] + \
+            list(rows_xml_parts(layout, col_widths, paragraph_ids, range(new_start, new_end))) + ['</w:tbl>']
+        new_rows = list(parse_xml_parts(parts))
+        for tr in new_rows:
+            if previous is not None:
+                previous.addnext(tr)
+            elif next_row is not None:
+                next_row.addprevious(tr)
+            else:
+                tbl.append(tr)
+            previous = tr
+        inserted += len(new_rows)
+    if stats is not None:
+        stats.count("rows kept", len(old_rows) - removed)
+        stats.count("rows inserted", inserted)
+        stats.count("rows removed", removed)
+    return removed + inserted
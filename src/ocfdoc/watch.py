@@ -0,0 +1,278 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+long running mode of device2doc and enum2doc
+
+the process keeps the imports and the parsed templates (templatecache) resident:
+- Watcher polls the input json files and the templates of the conversions and runs the conversions
+  of the changed files again, once the files did not change for the debounce time
+  (an editor saving a file in several writes gives one conversion).
+- make_server creates a local http server that converts posted json into a docx:
+    POST /device, /lbnldevice or /enum with the json as body
+    query options: backend=xml, vmerge=1, annex=1, save_level=N
+  the response is the docx (or the console output of the conversion with status 400/500).
+both run in one thread (run_forever): the conversions are never run concurrently.
+"""
+
+import contextlib
+import io
+import os
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def file_state(path):
+    """
+    :param path: file name
+    :return: (mtime, size) of the file, None when it does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher(object):
+    def __init__(self, interval=0.5, debounce=0.3, report=print):
+        """
+        initialize the watcher
+        :param interval: seconds between the polls
+        :param debounce: seconds a changed file should stay unchanged before its conversions run
+        :param report: function called with a text line per conversion
+        """
+        self.interval = interval
+        self.debounce = debounce
+        self.report = report
+        # (name, watched paths, conversion function)
+        self.targets = []
+        # path -> file_state
+        self.states = {}
+        # changed paths whose conversions did not run yet, and the time of the last change
+        self.pending = set()
+        self.last_change = None
+
+    def add(self, name, paths, function):
+        """
+        add a conversion
+        :param name: name in the report (e.g. the word file out)
+        :param paths: files the conversion reads (input json, template)
+        :param function: runs the conversion, returns True when done
+        """
+        paths = [os.path.abspath(path) for path in paths if path]
+        self.targets.append((name, paths, function))
+        for path in paths:
+            self.states[path] = file_state(path)
+
+    def changes(self):
+        """
+        the watched files that changed since the last call
+        :return: set of paths
+        """
+        changed = set()
+        for path, state in self.states.items():
+            new_state = file_state(path)
+            if new_state != state:
+                self.states[path] = new_state
+                changed.add(path)
+        return changed
+
+    def poll(self, now=None):
+        """
+        check the files once, run the conversions of the files that changed and then stayed unchanged
+        for the debounce time
+        :param now: current time (time.monotonic), None is now
+        :return: names of the conversions that ran
+        """
+        now = time.monotonic() if now is None else now
+        changed = self.changes()
+        if changed:
+            self.pending |= changed
+            self.last_change = now
+            return []
+        if not self.pending or now - self.last_change < self.debounce:
+            return []
+        pending = self.pending
+        self.pending = set()
+        names = []
+        for name, paths, function in self.targets:
+            if pending.isdisjoint(paths):
+                continue
+            if any(self.states[path] is None for path in paths):
+                self.report("missing input, not converted: %s" % name)
+                continue
+            start = time.perf_counter()
+            try:
+                status = "ok" if function() is True else "failed"
+            except Exception:
+                status = "error"
+                traceback.print_exc()
+            self.report("%-7s %8.3fs  %s" % (status, time.perf_counter() - start, name))
+            names.append(name)
+        return names
+
+
+def check_input(kind, tree):
+    """
+    check the shape of posted json before it is converted
+    :param kind: "device", "lbnldevice" or "enum"
+    :param tree: the decoded input (see load_input)
+    :raises ValueError: when the input is not a device list, an lbnl device list or an enumeration object
+    """
+    from ocfdoc.model import Category, Device, LbnlDevice
+
+    if kind == "enum":
+        if not isinstance(tree, dict) or not isinstance(tree.get("supportedenumerations"), list):
+            raise ValueError("expected an object with a supportedenumerations list")
+        if not all(isinstance(value, dict) for value in tree["supportedenumerations"]):
+            raise ValueError("expected objects in supportedenumerations")
+    elif kind == "device":
+        if not isinstance(tree, list) or not all(isinstance(device, Device) for device in tree):
+            raise ValueError("expected a list of devices (devicename, devicetype, resources)")
+    else:
+        if not isinstance(tree, list) or not all(isinstance(category, Category) for category in tree):
+            raise ValueError("expected a list of categories (category, devices)")
+        if not all(isinstance(lbnl_device, LbnlDevice) and all(isinstance(device, Device)
+                                                               for device in lbnl_device.devices)
+                   for category in tree for lbnl_device in category.devices):
+            raise ValueError("expected lbnl devices (name, comment, rt, exising) in the categories")
+
+
+def request_worddoc(kind, text, docx_name, options):
+    """
+    the conversion of posted json, the document is saved in memory
+    :param kind: "device", "lbnldevice" or "enum"
+    :param text: json text
+    :param docx_name: template
+    :param options: dict of the query options (backend, vmerge, annex, save_level)
+    :return: CreateWordDoc of device2doc or enum2doc, docx_name_out is an io.BytesIO
+    :raises ValueError: when the text is not valid json, or not of the shape of the kind (see check_input)
+    :raises KeyError: when an object misses a key (e.g. devicename)
+    :raises TypeError: when a value has the wrong type (e.g. a list instead of an object)
+    """
+    from ocfdoc import device, enumeration
+
+    backend = options.get("backend", "docx")
+    if kind == "enum":
+        worddoc = enumeration.CreateWordDoc(enum="<request>", stream=True, backend=backend)
+        worddoc.annex_switch = options.get("annex", "0") not in ("0", "false", "")
+    else:
+        worddoc = device.CreateWordDoc(stream=True, backend=backend,
+                                       vmerge=options.get("vmerge", "0") not in ("0", "false", ""),
+                                       **{kind: "<request>"})
+    # the input is the posted json instead of the file
+    worddoc.json_parse_tree = worddoc.load_input(text)
+    check_input(kind, worddoc.json_parse_tree)
+    worddoc.docx_name_in = docx_name
+    worddoc.docx_name_out = io.BytesIO()
+    worddoc.save_level = int(options.get("save_level", 1))
+    return worddoc
+
+
+class ConvertHandler(BaseHTTPRequestHandler):
+    # set by make_server
+    docx_name = None
+
+    def reply(self, code, body, content_type="text/plain; charset=utf-8"):
+        """
+        send the response
+        :param code: http status
+        :param body: bytes
+        :param content_type: content type of the body
+        """
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        kind = url.path.strip("/")
+        if kind not in ("device", "lbnldevice", "enum"):
+            self.reply(404, b"use POST /device, /lbnldevice or /enum\n")
+            return
+        options = dict((key, values[-1]) for key, values in parse_qs(url.query).items())
+        log = io.StringIO()
+        try:
+            text = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+            worddoc = request_worddoc(kind, text, self.docx_name, options)
+        except KeyError as e:
+            self.reply(400, ("invalid input: missing key %s\n" % e).encode("utf-8"))
+            return
+        except (TypeError, ValueError) as e:
+            self.reply(400, ("invalid input: %s\n" % e).encode("utf-8"))
+            return
+        try:
+            with contextlib.redirect_stdout(log):
+                done = worddoc.convert()
+        except Exception:
+            log.write(traceback.format_exc())
+            done = False
+        if done is not True:
+            self.reply(500, log.getvalue().encode("utf-8"))
+            return
+        self.reply(200, worddoc.docx_name_out.getvalue(), DOCX_TYPE)
+
+
+def make_server(port, docx_name, host="127.0.0.1"):
+    """
+    the local conversion http server
+    :param port: port to listen on, 0 picks a free port (server.server_port)
+    :param docx_name: template of the conversions
+    :param host: address to listen on, only local by default
+    :return: HTTPServer, serve with run_forever or serve_forever
+    """
+    handler = type("ConvertHandler", (ConvertHandler,), {"docx_name": docx_name})
+    return HTTPServer((host, port), handler)
+
+
+def run_forever(watcher=None, server=None, interval=0.5):
+    """
+    poll the watcher and handle the http requests in this thread, until interrupted (ctrl-c)
+    :param watcher: Watcher, None is no watching
+    :param server: HTTPServer, None is no server
+    :param interval: seconds between the polls without watcher
+    """
+    if watcher is not None:
+        interval = watcher.interval
+    if server is not None:
+        server.timeout = interval
+    try:
+        while True:
+            if server is not None:
+                server.handle_request()
+            else:
+                time.sleep(interval)
+            if watcher is not None:
+                watcher.poll()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.server_close()
@@ -0,0 +1,70 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+tests of the build manifest of the incremental builds
+"""
+
+import os
+
+from ocfdoc.buildmanifest import build_record, is_up_to_date, manifest_name, read_record, write_record
+
+
+def write_file(name, text):
+    with open(name, 'w', encoding='UTF8') as out_file:
+        out_file.write(text)
+
+
+def test_up_to_date(tmp_path):
+    input_name = str(tmp_path / "device.json")
+    docx_name = str(tmp_path / "template.docx")
+    word_out = str(tmp_path / "out.docx")
+    write_file(input_name, "[]")
+    write_file(docx_name, "template")
+    record = build_record(input_name, docx_name, {"vmerge": False})
+    assert is_up_to_date(word_out, record) is False
+
+    write_file(word_out, "document")
+    assert is_up_to_date(word_out, record) is False
+    write_record(word_out, record)
+    assert os.path.isfile(manifest_name(word_out))
+    assert read_record(word_out) == record
+    assert is_up_to_date(word_out, record) is True
+
+    # changed options or input
+    assert is_up_to_date(word_out, build_record(input_name, docx_name, {"vmerge": True})) is False
+    write_file(input_name, "[ ]")
+    assert is_up_to_date(word_out, build_record(input_name, docx_name, {"vmerge": False})) is False
+
+
+def test_missing_output(tmp_path):
+    input_name = str(tmp_path / "device.json")
+    word_out = str(tmp_path / "out.docx")
+    chunk_name = str(tmp_path / "out-2.docx")
+    for name in (input_name, word_out, chunk_name):
+        write_file(name, name)
+    record = build_record(input_name, input_name, {})
+    write_record(word_out, record, [chunk_name])
+    assert read_record(word_out)["outputs"] == [chunk_name]
+    assert is_up_to_date(word_out, record) is True
+    os.remove(chunk_name)
+    assert is_up_to_date(word_out, record) is False
@@ -0,0 +1,120 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the chunked output of large tables
+"""
+
+import json
+import os
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from ocfdoc import device
+from ocfdoc.tablelayout import TableLayout
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCX = os.path.join(TEST_DIR, "..", "input", "ResourceTemplate.docx")
+LBNL = os.path.join(TEST_DIR, "in", "test_2", "device.json")
+
+
+def grouped_layout():
+    layout = TableLayout(2)
+    layout.add_row("Device", "Resource")
+    layout.header_rows = 1
+    for name, resources in (("a", 3), ("b", 1), ("c", 2), ("d", 4)):
+        first = layout.add_row(name, "r0")
+        layout.start_group(first)
+        for index in range(1, resources):
+            layout.add_row(None, "r%d" % index)
+        if resources > 1:
+            layout.merge_down(0, first, first + resources - 1)
+    return layout
+
+
+def test_chunk_ranges_keep_groups():
+    layout = grouped_layout()
+    assert layout.chunk_ranges() == [(1, 11)]
+    # the header row counts in the budget, d is larger than the budget
+    assert layout.chunk_ranges(max_rows=5) == [(1, 5), (5, 7), (7, 11)]
+    assert layout.chunk_ranges(max_bytes=30, row_bytes=lambda row: 10) == [(1, 4), (4, 5), (5, 7), (7, 11)]
+
+
+def test_sub_layout():
+    layout = grouped_layout()
+    chunk = layout.sub_layout(5, 7)
+    assert chunk.rows == [["Device", "Resource"], ["c", "r0"], [None, "r1"]]
+    assert chunk.vmerges == {(1, 0): "restart", (2, 0): "continue"}
+    assert chunk.header_rows == 1
+
+
+def test_lbnl_chunks(tmp_path):
+    word_out = str(tmp_path / "lbnl.docx")
+    worddoc = device.CreateWordDoc(lbnldevice=LBNL, docx_name_in=DOCX, docx_name_out=word_out, vmerge=True)
+    worddoc.chunk_rows = 6
+    worddoc.chunk_documents = True
+    assert worddoc.convert() is True
+    names = [word_out] + worddoc.chunk_names
+    assert len(names) == worddoc.stats.counters["chunks"] > 2
+    rows = 0
+    for name in names:
+        tbl = Document(name).element.body.findall(qn("w:tbl"))[-1]
+        trs = tbl.findall(qn("w:tr"))
+        assert "".join(trs[0].itertext()).startswith("Category and Device)")
+        assert 1 < len(trs) <= 6
+        # a chunk does not start in the middle of a vertical merge
+        assert all(v.get(qn("w:val")) == "restart" for v in trs[1].iter(qn("w:vMerge")))
+        rows += len(trs) - 1
+    assert rows == worddoc.stats.counters["rows"] - 1
+
+
+def chunked_conversion(word_out, chunk_rows):
+    worddoc = device.CreateWordDoc(lbnldevice=LBNL, docx_name_in=DOCX, docx_name_out=word_out, vmerge=True)
+    worddoc.chunk_rows = chunk_rows
+    worddoc.chunk_documents = True
+    worddoc.incremental = True
+    assert worddoc.convert() is True
+    return worddoc
+
+
+def test_chunk_documents_incremental(tmp_path):
+    word_out = str(tmp_path / "lbnl.docx")
+    names = chunked_conversion(word_out, 6).chunk_names
+    assert len(names) > 1
+    with open(word_out + ".build.json", encoding="UTF8") as in_file:
+        assert json.load(in_file)["outputs"] == [os.path.abspath(name) for name in names]
+    assert chunked_conversion(word_out, 6).skipped is True
+
+    # a missing chunk document is built again
+    os.remove(names[-1])
+    worddoc = chunked_conversion(word_out, 6)
+    assert worddoc.skipped is False
+    assert os.path.isfile(names[-1])
+
+    # fewer chunks: the documents of the chunks that are not written again are removed
+    worddoc = chunked_conversion(word_out, 12)
+    assert 0 < len(worddoc.chunk_names) < len(names)
+    assert all(os.path.isfile(name) for name in worddoc.chunk_names)
+    assert not any(os.path.isfile(name) for name in names[len(worddoc.chunk_names):])
@@ -0,0 +1,118 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+golden output tests of device2doc
+
+the tools are run as on the command line (from the test directory, as the former test.sh), the console output is
+compared with test/ref/<testcase>.txt and the generated document with test/ref/<testcase>/<testcase>.docx
+(semantically, see ocfdoc.docxcompare).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from ocfdoc import device
+from ocfdoc.docxcompare import compare_docx
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+REF_DIR = os.path.join(TEST_DIR, "ref")
+TOOL = os.path.join("..", "src", "device2doc.py")
+TEMPLATE = os.path.join("..", "input", "ResourceTemplate.docx")
+
+# testcase -> arguments of device2doc, without -docx and -word_out
+DOCUMENT_CASES = {
+    "testcase_2": ["-device", os.path.join("in", "test_1", "device.json")],
+    "testcase_3": ["-lbnldevice", os.path.join("in", "test_2", "device.json")],
+}
+
+
+def run_tool(*args):
+    """
+    run device2doc in the test directory
+    :param args: command line arguments
+    :return: console output (stdout and stderr)
+    """
+    # fixed width of the argparse help
+    env = dict(os.environ, COLUMNS="80")
+    result = subprocess.run([sys.executable, TOOL] + list(args), cwd=TEST_DIR, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    assert result.returncode == 0, result.stdout
+    # the heading of the options differs between the python versions
+    return result.stdout.replace("optional arguments:", "options:")
+
+
+def check_text(output, ref_name, update_refs):
+    """
+    compare the console output with the reference (or write it as the reference)
+    :param output: console output
+    :param ref_name: reference file name, relative to the ref directory
+    :param update_refs: write the output as the reference
+    """
+    ref_file = os.path.join(REF_DIR, ref_name)
+    if update_refs:
+        with open(ref_file, "w") as ref:
+            ref.write(output)
+        return
+    with open(ref_file) as ref:
+        assert output.split() == ref.read().split()
+
+
+def test_help(update_refs):
+    check_text(run_tool("-h"), "testcase_1.txt", update_refs)
+
+
+@pytest.mark.parametrize("testcase", sorted(DOCUMENT_CASES))
+def test_document(testcase, tmp_path, update_refs):
+    word_out = str(tmp_path / (testcase + ".docx"))
+    output = run_tool("-docx", TEMPLATE, "-word_out", word_out, *DOCUMENT_CASES[testcase])
+    check_text(output.replace(word_out, "<word_out>"), os.path.join(testcase, testcase + ".txt"), update_refs)
+    ref_docx = os.path.join(REF_DIR, testcase, testcase + ".docx")
+    if update_refs:
+        shutil.copyfile(word_out, ref_docx)
+        return
+    assert compare_docx(ref_docx, word_out) is None
+
+
+def test_col_widths(tmp_path):
+    worddoc = device.CreateWordDoc(lbnldevice=os.path.join(TEST_DIR, "in", "test_2", "device.json"),
+                                   docx_name_in=os.path.join(TEST_DIR, TEMPLATE), docx_name_out=str(tmp_path / "w.docx"))
+    worddoc.rt_table = True
+    worddoc.col_widths = [0.3, None, None, None, None, 0.1]
+    assert worddoc.convert() is True
+    lbnl_tbl, rt_tbl = Document(worddoc.docx_name_out).element.body.findall(qn("w:tbl"))[-2:]
+    assert len(lbnl_tbl.find(qn("w:tblGrid"))) == 6
+    # the resource type table keeps its own equal widths
+    grid = rt_tbl.find(qn("w:tblGrid"))
+    assert len(grid) == 5 and len(set(col.get(qn("w:w")) for col in grid)) == 1
+
+    worddoc.col_widths = [0.3, None, None, None]
+    with pytest.raises(ValueError):
+        worddoc.convert()
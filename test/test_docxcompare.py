@@ -0,0 +1,94 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+"""
+tests of the semantic docx comparison
+"""
+
+import os
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from ocfdoc.docxcompare import compare_docx
+
+REF_DOCX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ref", "testcase_3", "testcase_3.docx")
+
+
+def edited(tmp_path, edit):
+    """
+    :param tmp_path: directory for the edited document
+    :param edit: function changing the python-docx document
+    :return: file name of the edited copy of the reference document
+    """
+    document = Document(REF_DOCX)
+    edit(document)
+    name = str(tmp_path / "edited.docx")
+    document.save(name)
+    return name
+
+
+def last_table(document):
+    return document.element.body.findall(qn("w:tbl"))[-1]
+
+
+def test_same_document():
+    assert compare_docx(REF_DOCX, REF_DOCX) is None
+
+
+def test_saved_again(tmp_path):
+    assert compare_docx(REF_DOCX, edited(tmp_path, lambda document: None)) is None
+
+
+def test_word_attributes_and_runs_ignored(tmp_path):
+    def edit(document):
+        for tr in last_table(document).iter(qn("w:tr")):
+            tr.set(qn("w:rsidR"), "00A1B2C3")
+        # the text of a cell split over two runs
+        run = document.tables[-1].cell(1, 0).paragraphs[0].runs[0]
+        text = run.text
+        run.text = text[:3]
+        run._r.addnext(run._r.__class__())
+        document.tables[-1].cell(1, 0).paragraphs[0].add_run(text[3:])
+    assert compare_docx(REF_DOCX, edited(tmp_path, edit)) is None
+
+
+def test_cell_text(tmp_path):
+    def edit(document):
+        document.tables[-1].cell(2, 3).paragraphs[0].runs[0].text = "oic.d.changed"
+    difference = compare_docx(REF_DOCX, edited(tmp_path, edit))
+    assert difference.startswith("table 3, row 3, cell 4: text ")
+    assert difference.endswith("!= 'oic.d.changed'")
+
+
+def test_removed_row(tmp_path):
+    def edit(document):
+        tbl = last_table(document)
+        tbl.remove(tbl.findall(qn("w:tr"))[-1])
+    assert compare_docx(REF_DOCX, edited(tmp_path, edit)) == "table 3, row 17: missing in the second document"
+
+
+def test_added_paragraph(tmp_path):
+    def edit(document):
+        document.add_paragraph("added")
+    assert compare_docx(REF_DOCX, edited(tmp_path, edit)).endswith(": missing in the first document")
@@ -0,0 +1,84 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+tests of the fast save (docxsave) against document.save()
+"""
+
+import io
+import os
+import zipfile
+
+from docx import Document
+from lxml import etree
+
+from ocfdoc.docxsave import save_document
+from ocfdoc.stats import ConversionStats
+from ocfdoc.templatecache import TemplateCache
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCX = os.path.join(TEST_DIR, "..", "input", "ResourceTemplate.docx")
+
+
+def part_content(data, name):
+    # the parts copied from the template keep their own xml declaration
+    if name.endswith((".xml", ".rels")):
+        return etree.tostring(etree.fromstring(data), method="c14n")
+    return data
+
+
+def generated_document(cache):
+    document = cache.document(DOCX)
+    document.add_paragraph("generated")
+    document.add_table(rows=2, cols=2).cell(1, 1).text = "cell"
+    return document
+
+
+def test_fast_save_as_save(tmp_path):
+    cache = TemplateCache()
+    document = generated_document(cache)
+    saved = str(tmp_path / "saved.docx")
+    document.save(saved)
+
+    for level in (0, 6):
+        fast = str(tmp_path / ("fast%d.docx" % level))
+        source, template = cache.source(DOCX)
+        stats = ConversionStats()
+        assert save_document(document, fast, level, source, template, stats) == os.path.getsize(fast)
+        assert stats.counters["copied parts"] > 0
+        with zipfile.ZipFile(saved) as saved_zip, zipfile.ZipFile(fast) as fast_zip:
+            assert fast_zip.testzip() is None
+            # the same parts in the same order, with the same content
+            assert fast_zip.namelist() == saved_zip.namelist()
+            for name in saved_zip.namelist():
+                assert part_content(fast_zip.read(name), name) == part_content(saved_zip.read(name), name), name
+        reopened = Document(fast)
+        assert reopened.paragraphs[-1].text == "generated"
+        assert reopened.tables[-1].cell(1, 1).text == "cell"
+
+
+def test_fast_save_to_stream():
+    cache = TemplateCache()
+    stream = io.BytesIO()
+    # without the template all parts are written
+    save_document(generated_document(cache), stream)
+    assert Document(io.BytesIO(stream.getvalue())).paragraphs[-1].text == "generated"
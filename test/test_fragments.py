@@ -0,0 +1,76 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the xml fragment library
+"""
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from ocfdoc.fragments import SEQ_TABLE_ANNEX, FragmentLibrary
+from ocfdoc.tablelayout import TableLayout, write_table
+
+
+def test_stamps_are_copies():
+    library = FragmentLibrary()
+    first = library.paragraph("text", "PARAGRAPH")
+    second = library.paragraph("text", "PARAGRAPH")
+    assert first is not second
+    first.find(qn("w:r")).find(qn("w:t")).text = "changed"
+    assert second.find(qn("w:r")).find(qn("w:t")).text == "text"
+    assert len(library.elements) == 1
+
+
+def test_caption_as_python_docx():
+    document = Document()
+    paragraph = document.add_paragraph("Table ")
+    run = paragraph.add_run()
+    for name, text in (("w:fldChar", None), ("w:instrText", SEQ_TABLE_ANNEX), ("w:fldChar", None)):
+        element = run._r.makeelement(qn(name), {})
+        if text is None:
+            element.set(qn("w:fldCharType"), "begin" if len(run._r) == 0 else "end")
+        else:
+            element.text = text
+        run._r.append(element)
+    paragraph.add_run(" – title")
+    stamped = Document()
+    stamped.element.body._insert_p(FragmentLibrary().caption("Table ", " – title", SEQ_TABLE_ANNEX))
+    assert stamped.element.body.xml == document.element.body.xml
+
+
+def test_header_rows_as_written():
+    def layout():
+        table = TableLayout(2)
+        table.add_row("Enumeration", "Description")
+        table.merge(table.add_row("value"), 0, 1)
+        return table
+
+    plain = Document()
+    write_table(plain, layout())
+    stamped = Document()
+    stamped_layout = layout()
+    stamped_layout.header_rows = 1
+    write_table(stamped, stamped_layout)
+    assert stamped.element.body.xml == plain.element.body.xml
@@ -0,0 +1,104 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the streaming json reader
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from ocfdoc.jsonstream import JsonStream, iter_devices, iter_enumerations, iter_lbnl_records, \
+    lbnl_category_records, lbnl_records
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+TEXT = ('[ {"devicename": "Light \\"quoted\\" \\\\ \\/ caf\\u00e9 \\ud83d\\ude00", "devicetype": "oic.d.light",\n'
+        '   "resources": [{"resourcetypetitle": "Binary Switch", "resourcetypeid": "oic.r.switch.binary"}],\n'
+        '   "count": 1234567890, "ratio": -12.5e-3, "flags": [true, false, null], "empty": {}, "none": []},\n'
+        ' "café – text", 98765, [], {}, [[1, [2, [3]]], {"a": {"b": {}}}] ]')
+
+
+def read_all(text, chunk_size):
+    """
+    :return: the items of the top level array, read with a JsonStream
+    """
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    items = []
+    for _ in stream.array_items():
+        items.append(stream.read_value())
+    assert stream.peek() == ""
+    return items
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_as_json_load(chunk_size):
+    assert read_all(TEXT, chunk_size) == json.loads(TEXT)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_object_items(chunk_size):
+    text = '{"first": 1, "se\\u0063ond": "two", "third": {"x": [1, 2]}, "last": 12345}'
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    items = {}
+    for key in stream.object_items():
+        items[key] = stream.read_value()
+    assert items == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_lbnl_records(chunk_size):
+    with open(os.path.join(TEST_DIR, "in", "test_2", "device.json"), 'r', encoding='UTF8') as input_file:
+        text = input_file.read()
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    records = []
+    for _ in stream.array_items():
+        records.extend(lbnl_category_records(stream))
+    assert records == list(lbnl_records(json.loads(text)))
+    assert list(iter_lbnl_records(io.StringIO(text))) == records
+
+
+def test_devices_and_enumerations():
+    with open(os.path.join(TEST_DIR, "in", "test_1", "device.json"), 'r', encoding='UTF8') as input_file:
+        text = input_file.read()
+    assert list(iter_devices(io.StringIO(text))) == json.loads(text)
+    enumerations = {"version": 1, "supportedenumerations": [{"a": "x"}, {"b": "y \\u00e9"}], "after": [1]}
+    assert list(iter_enumerations(io.StringIO(json.dumps(enumerations)))) == enumerations["supportedenumerations"]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}, {"b": 2}',      # missing ]
+    '[{"a": 1} {"b": 2}]',      # missing ,
+    '[{"a": 1}, {"b": }]',      # missing value
+    '[{"a": "unterminated}]',   # unterminated string
+    '{"a": 1}',                 # not an array
+])
+def test_malformed(chunk_size, text):
+    with pytest.raises(ValueError):
+        read_all(text, chunk_size)
@@ -0,0 +1,90 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the reverse index resource type -> devices
+"""
+
+import os
+
+from ocfdoc import device
+from ocfdoc.model import ModelBuilder, lbnl_records
+from ocfdoc.rtindex import ResourceIndex
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCX = os.path.join(TEST_DIR, "..", "input", "ResourceTemplate.docx")
+
+
+def load(name):
+    with open(os.path.join(TEST_DIR, "in", name, "device.json"), 'r', encoding='UTF8') as input_file:
+        return ModelBuilder().loads(input_file.read())
+
+
+def test_lbnl_index():
+    records = list(lbnl_records(load("test_2")))
+    index = ResourceIndex()
+    # the records are passed on unchanged
+    assert list(index.collect(records)) == records
+    binary = index.as_dict()["oic.r.switch.binary"]
+    assert binary["title"] == "Binary Switch"
+    assert binary["categories"] == ["Space Conditioning (11)", "Lighing (5)"]
+    assert [device["name"] for device in binary["devices"]] == ["Air Conditioner", "Air Purifier", "Light", "Light",
+                                                                "Light"]
+    assert binary["devices"][0] == {"name": "Air Conditioner", "type": "oic.d.airconditioner",
+                                    "category": "Space Conditioning (11)", "lbnldevice": "Unitary System"}
+
+
+def test_device_index():
+    devices = load("test_1")
+    index = ResourceIndex()
+    list(index.collect(devices))
+    rts = set(resource.rt for device in devices for resource in device.resources if resource.rt is not None)
+    assert index.resource_types() == sorted(rts)
+    for device in devices:
+        for resource in device.resources:
+            assert (device.name, device.type, None, None) in index.usages[resource.rt].devices
+    assert all(usage["categories"] == [] for usage in index.as_dict().values())
+
+
+def test_incremental_rt_json(tmp_path):
+    word_out = str(tmp_path / "lbnl.docx")
+    rt_json = str(tmp_path / "rt.json")
+
+    def convert(rt_json=None):
+        worddoc = device.CreateWordDoc(lbnldevice=os.path.join(TEST_DIR, "in", "test_2", "device.json"),
+                                       docx_name_in=DOCX, docx_name_out=word_out)
+        worddoc.incremental = True
+        worddoc.rt_json = rt_json
+        assert worddoc.convert() is True
+        return worddoc.skipped
+
+    assert convert() is False
+    # a newly requested sidecar is written
+    assert convert(rt_json) is False
+    assert os.path.isfile(rt_json)
+    assert convert(rt_json) is True
+    # a deleted sidecar is written again
+    os.remove(rt_json)
+    assert convert(rt_json) is False
+    assert os.path.isfile(rt_json)
@@ -0,0 +1,70 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the resource catalog of the schema cache
+"""
+
+import json
+
+from ocfdoc.schemacache import ResourceCatalog
+
+
+def write_schemas(schema_dir):
+    # a.json includes the definition of b.json, the rt of b.json stays with the title of b.json
+    schemas = {
+        "a.json": {"title": "Atomic A",
+                   "definitions": {"a": {"properties": {"rt": {"default": ["oic.r.a"],
+                                                               "items": {"enum": ["oic.r.a"]}}}}},
+                   "allOf": [{"$ref": "#/definitions/a"}, {"$ref": "b.json#/definitions/b"}]},
+        "b.json": {"title": "Binary B",
+                   "definitions": {"b": {"properties": {"rt": {"default": ["oic.r.b"]}}}},
+                   "allOf": [{"$ref": "#/definitions/b"}]},
+    }
+    for name, schema in schemas.items():
+        (schema_dir / name).write_text(json.dumps(schema), encoding="UTF8")
+
+
+def test_referenced_rt_keeps_its_title(tmp_path):
+    schema_dir = tmp_path / "schemas"
+    schema_dir.mkdir()
+    write_schemas(schema_dir)
+    for cache_dir in (None, str(tmp_path / "cache"), str(tmp_path / "cache")):
+        catalog = ResourceCatalog(str(schema_dir), cache_dir)
+        assert catalog.titles == {"oic.r.a": "Atomic A", "oic.r.b": "Binary B"}
+        assert catalog.rts == {"Atomic A": "oic.r.a", "Binary B": "oic.r.b"}
+        assert catalog.fill({"resourcetypeid": "oic.r.b"}) == {"resourcetypeid": "oic.r.b",
+                                                               "resourcetypetitle": "Binary B"}
+
+
+def test_cached_catalog_does_not_parse_schemas(tmp_path):
+    schema_dir = tmp_path / "schemas"
+    schema_dir.mkdir()
+    write_schemas(schema_dir)
+    cache_dir = str(tmp_path / "cache")
+    ResourceCatalog(str(schema_dir), cache_dir)
+    catalog = ResourceCatalog(str(schema_dir), cache_dir)
+    assert catalog.cache.counts == {"memory": 0, "disk": 2, "resolved": 0}
+    assert catalog.cache.documents == {}
+    assert catalog.titles == {"oic.r.a": "Atomic A", "oic.r.b": "Binary B"}
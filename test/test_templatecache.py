@@ -0,0 +1,64 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+"""
+tests of the cache of parsed templates
+"""
+
+import os
+import shutil
+
+from docx import Document
+
+from ocfdoc.templatecache import TemplateCache
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCX = os.path.join(TEST_DIR, "..", "input", "ResourceTemplate.docx")
+
+
+def test_template_parsed_once(tmp_path):
+    cache = TemplateCache()
+    snapshot = cache.load(DOCX)
+    assert cache.load(DOCX) is snapshot
+
+    # a copy to work on: the main document part is copied, the other parts are shared with the snapshot
+    document = cache.document(DOCX)
+    assert document.part is not snapshot.part
+    assert document.part._styles_part is snapshot.part._styles_part
+    document.add_paragraph("generated")
+    assert len(cache.load(DOCX).paragraphs) == len(snapshot.paragraphs)
+
+
+def test_changed_template_parsed_again(tmp_path):
+    docx_name = str(tmp_path / "template.docx")
+    shutil.copyfile(DOCX, docx_name)
+    cache = TemplateCache(str(tmp_path / "cache"))
+    snapshot = cache.load(docx_name)
+    assert os.listdir(str(tmp_path / "cache")) == [cache.key(docx_name)[0][2] + ".docx"]
+
+    changed = Document(docx_name)
+    changed.add_paragraph("changed template")
+    changed.save(docx_name)
+    reloaded = cache.load(docx_name)
+    assert reloaded is not snapshot
+    assert reloaded.paragraphs[-1].text == "changed template"
+    assert len(os.listdir(str(tmp_path / "cache"))) == 2
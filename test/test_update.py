@@ -0,0 +1,161 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the update of a generated document (-update): the same tables as a full rebuild
+"""
+
+import copy
+import json
+import os
+
+import pytest
+from docx import Document
+from docx.oxml.ns import qn
+
+from ocfdoc import device, enumeration
+from ocfdoc.docxcompare import compare_docx
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCX = os.path.join(TEST_DIR, "..", "input", "ResourceTemplate.docx")
+
+
+def load(name):
+    with open(os.path.join(TEST_DIR, "in", name, "device.json"), 'r', encoding='UTF8') as input_file:
+        return json.load(input_file)
+
+
+def edit_devices(devices):
+    # a device removed, one inserted, a resource added and a device type changed
+    devices = copy.deepcopy(devices)
+    del devices[3]
+    devices.insert(7, {"devicename": "Inserted", "devicetype": "oic.d.inserted",
+                       "resources": [{"resourcetypetitle": "Binary Switch", "resourcetypeid": "oic.r.switch.binary"},
+                                     {"resourcetypetitle": "Brightness", "resourcetypeid": "oic.r.light.brightness"}]})
+    devices[1]["resources"].append({"resourcetypetitle": "Added", "resourcetypeid": "oic.r.added"})
+    devices[-1]["devicetype"] = "oic.d.changed"
+    return devices
+
+
+def edit_lbnl(categories):
+    categories = copy.deepcopy(categories)
+    del categories[0]["devices"][1]
+    categories[1]["devices"][0]["exising"].append(
+        {"devicename": "Inserted", "devicetype": "oic.d.inserted",
+         "resources": [{"resourcetypetitle": "Binary Switch", "resourcetypeid": "oic.r.switch.binary"}]})
+    return categories
+
+
+def edit_enumerations(enumerations):
+    enumerations = copy.deepcopy(enumerations)
+    values = enumerations["supportedenumerations"]
+    del values[2]
+    values.insert(5, {"inserted": "an inserted enumeration"})
+    values[0] = {"changed": "a changed description"}
+    return enumerations
+
+
+ENUMERATIONS = {"supportedenumerations": [{"value%02d" % index: "description %d" % index} for index in range(20)]}
+
+
+def convert(kind, input_name, word_out, update=False, **options):
+    if kind == "enum":
+        worddoc = enumeration.CreateWordDoc(enum=input_name, backend=options.get("backend", "docx"))
+        worddoc.annex_switch = options.get("annex", False)
+    else:
+        worddoc = device.CreateWordDoc(backend=options.get("backend", "docx"), vmerge=options.get("vmerge", False),
+                                       **{kind: input_name})
+    worddoc.docx_name_in = DOCX
+    worddoc.docx_name_out = word_out
+    worddoc.update = update
+    worddoc.col_widths = options.get("col_widths")
+    assert worddoc.convert() is True
+    return worddoc.stats.counters
+
+
+@pytest.mark.parametrize("kind, data, edit, options", [
+    ("device", load("test_1"), edit_devices, {}),
+    ("device", load("test_1"), edit_devices, {"backend": "xml"}),
+    ("device", load("test_1"), edit_devices, {"vmerge": True}),
+    ("device", load("test_1"), edit_devices, {"vmerge": True, "backend": "xml"}),
+    ("lbnldevice", load("test_2"), edit_lbnl, {}),
+    ("lbnldevice", load("test_2"), edit_lbnl, {"vmerge": True, "backend": "xml"}),
+    ("enum", ENUMERATIONS, edit_enumerations, {}),
+    ("enum", ENUMERATIONS, edit_enumerations, {"annex": True, "backend": "xml"}),
+])
+def test_update_as_rebuild(tmp_path, kind, data, edit, options):
+    old_input = str(tmp_path / "old.json")
+    new_input = str(tmp_path / "new.json")
+    for name, content in ((old_input, data), (new_input, edit(data))):
+        with open(name, 'w', encoding='UTF8') as json_file:
+            json.dump(content, json_file)
+    updated = str(tmp_path / "updated.docx")
+    rebuilt = str(tmp_path / "rebuilt.docx")
+    convert(kind, old_input, updated, **options)
+    convert(kind, new_input, rebuilt, **options)
+
+    counters = convert(kind, new_input, updated, update=True, **options)
+    assert counters["rows inserted"] > 0
+    assert counters["rows removed"] > 0
+    assert counters["rows kept"] > 0
+    assert compare_docx(rebuilt, updated) is None
+    # the rows are the same xml as the rows of the rebuilt document
+    updated_tbl = Document(updated).element.body.findall(qn("w:tbl"))[-1]
+    rebuilt_tbl = Document(rebuilt).element.body.findall(qn("w:tbl"))[-1]
+    assert [tr.xml for tr in updated_tbl.iterchildren(qn("w:tr"))] == \
+        [tr.xml for tr in rebuilt_tbl.iterchildren(qn("w:tr"))]
+
+
+def test_update_widths(tmp_path):
+    input_name = str(tmp_path / "devices.json")
+    with open(input_name, 'w', encoding='UTF8') as json_file:
+        json.dump(load("test_1"), json_file)
+    updated = str(tmp_path / "updated.docx")
+    rebuilt = str(tmp_path / "rebuilt.docx")
+    convert("device", input_name, updated)
+    convert("device", input_name, rebuilt, col_widths=[0.4, 0.2, None, None])
+
+    counters = convert("device", input_name, updated, update=True, col_widths=[0.4, 0.2, None, None])
+    assert counters["widths updated"] == 1
+    assert counters["rows inserted"] == 0
+    updated_tbl = Document(updated).element.body.findall(qn("w:tbl"))[-1]
+    rebuilt_tbl = Document(rebuilt).element.body.findall(qn("w:tbl"))[-1]
+    # the grid, the fixed layout and the cell widths of all the rows as in the rebuilt document
+    assert updated_tbl.xml == rebuilt_tbl.xml
+
+
+def test_update_keeps_edits(tmp_path):
+    input_name = str(tmp_path / "devices.json")
+    with open(input_name, 'w', encoding='UTF8') as json_file:
+        json.dump(load("test_1"), json_file)
+    word_out = str(tmp_path / "devices.docx")
+    convert("device", input_name, word_out)
+    document = Document(word_out)
+    document.add_paragraph("edited in Word")
+    document.save(word_out)
+
+    with open(input_name, 'w', encoding='UTF8') as json_file:
+        json.dump(edit_devices(load("test_1")), json_file)
+    convert("device", input_name, word_out, update=True)
+    assert Document(word_out).paragraphs[-1].text == "edited in Word"
@@ -0,0 +1,89 @@
+#############################
+#
+#    copyright 2016 Open Interconnect Consortium, Inc. All rights reserved.
+#    Redistribution and use in source and binary forms, with or without modification,
+#    are permitted provided that the following conditions are met:
+#    1.  Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#    2.  Redistributions in binary form must reproduce the above copyright notice,
+#        this list of conditions and the following disclaimer in the documentation and/or other materials provided
+#        with the distribution.
+#
+#    THIS SOFTWARE IS PROVIDED BY THE OPEN INTERCONNECT CONSORTIUM, INC. "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+#    INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE OR
+#    WARRANTIES OF NON-INFRINGEMENT, ARE DISCLAIMED. IN NO EVENT SHALL THE OPEN INTERCONNECT CONSORTIUM, INC. OR
+#    CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#    (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+#    OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#    OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+#    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#############################
+
+
+
+"""
+tests of the local conversion http server
+"""
+
+import os
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from ocfdoc.watch import make_server
+
+DOCX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "ResourceTemplate.docx")
+
+
+@pytest.fixture
+def server():
+    server = make_server(0, DOCX)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield "http://127.0.0.1:%d" % server.server_port
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(url, body):
+    try:
+        with urlopen(url, data=body) as response:
+            return response.status, response.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+
+@pytest.mark.parametrize("body, message", [
+    (b'{"bad', b"invalid input: "),
+    # an lbnl device without comment
+    (b'[{"category": "c", "devices": [{"name": "n", "rt": "oic.d.x", "exising": []}]}]',
+     b"invalid input: missing key 'comment'"),
+])
+def test_invalid_input(server, body, message):
+    code, reply = post(server + "/lbnldevice", body)
+    assert code == 400
+    assert reply.startswith(message)
+
+
+@pytest.mark.parametrize("kind, body", [
+    ("enum", b'{}'),
+    ("enum", b'{"supportedenumerations": ["value"]}'),
+    # a dict where a list is expected
+    ("device", b'{"devicename": "d", "devicetype": "oic.d.x", "resources": []}'),
+    ("lbnldevice", b'[{"devicename": "d", "devicetype": "oic.d.x", "resources": []}]'),
+])
+def test_invalid_shape(server, kind, body):
+    code, reply = post(server + "/" + kind, body)
+    assert code == 400
+    assert reply.startswith(b"invalid input: expected ")
+
+
+def test_convert(server):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "in", "test_2", "device.json"), "rb") as input_file:
+        code, reply = post(server + "/lbnldevice?backend=xml", input_file.read())
+    assert code == 200
+    assert reply[:2] == b"PK"